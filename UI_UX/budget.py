@@ -12,9 +12,9 @@ All code is pure Python; no JavaScript.
 """
 
 import logging
-import textwrap
 from typing import Any, Dict, List, Optional, Union
 
+from .cell_width import cell_width, shorten_cells
 from .token_utils import chars_to_tokens, estimate_avg_chars_per_token
 
 logger = logging.getLogger(__name__)
@@ -76,6 +76,8 @@ def progress_bar(chars_used: int, char_budget: int, width: int = 28) -> str:
 def naive_summarize(text: str, char_limit: int) -> str:
     """Naive summarizer: keep useful sentences until char_limit.
 
+    Lengths are display cells (`cell_width`), so wide CJK text gets half as many characters.
+
     This is intentionally simple; for production use a sentence-ranker or transformer-based summarizer.
     """
     if not text:
@@ -88,14 +90,14 @@ def naive_summarize(text: str, char_limit: int) -> str:
     summary = []
     for sentence in sentences:
         candidate = ('. '.join(summary + [sentence]) + '.')
-        if len(candidate) <= max_chars:
+        if cell_width(candidate) <= max_chars:
             summary.append(sentence)
         else:
             break
 
     if not summary:
         # fallback to truncation
-        return (textwrap.shorten(text, width=max_chars, placeholder='...'))
+        return shorten_cells(text, width=max_chars, placeholder='...')
 
     return '. '.join(summary) + '.'
 
@@ -0,0 +1,232 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+budget_solver.py
+
+Inverse of `compute_budget`: the smallest width or height, or the largest font size, whose
+`target_chars` reaches a given length. `target_chars` is monotone in each of these, so width and
+height are solved in closed form (then checked against `compute_budget`) and font size by bisection.
+"""
+
+import math
+from typing import Callable, Optional
+
+from .budget import compute_budget
+
+SOLVABLE_PARAMETERS = ("width", "height", "font")
+
+
+def _target_chars(width_px, height_px, font_size_px, editor_ruler_columns, buffer,
+                  avg_char_width_px=None) -> int:
+    return compute_budget(
+        width_px, height_px, font_size_px=font_size_px, avg_char_width_px=avg_char_width_px,
+        editor_ruler_columns=editor_ruler_columns, buffer=buffer
+    )["target_chars"]
+
+
+def _lowest(fits: Callable[[int], bool], guess: int, floor: int = 1) -> int:
+    """Smallest integer >= floor that fits, starting near `guess` (`fits` must be monotone)."""
+    value = max(floor, guess)
+    while value > floor and fits(value - 1):
+        value -= 1
+    while not fits(value):
+        value += 1
+    return value
+
+
+def _check_target(target_chars: int) -> None:
+    if target_chars < 1:
+        raise ValueError(f"target_chars must be at least 1, got {target_chars}")
+
+
+def min_width_px(
+    target_chars: int,
+    height_px: int,
+    font_size_px: int = 14,
+    editor_ruler_columns: Optional[int] = 80,
+    buffer: float = 0.9,
+    avg_char_width_px: Optional[float] = None
+) -> Optional[int]:
+    """
+    Smallest window width whose budget holds `target_chars` characters.
+
+    Args:
+        target_chars: Characters the screen must hold (e.g. a summary's length)
+        height_px: Window height in px
+        font_size_px: Font size in px
+        editor_ruler_columns: Ruler columns (None for no ruler)
+        buffer: Fraction of the character budget to keep
+        avg_char_width_px: Measured character width (None: `compute_budget`'s heuristic)
+
+    Returns:
+        Width in px, or None if no width is enough (the ruler or height is the limit)
+
+    Raises:
+        ValueError: If target_chars is below 1
+    """
+    _check_target(target_chars)
+
+    def fits(width: int) -> bool:
+        return _target_chars(width, height_px, font_size_px, editor_ruler_columns, buffer,
+                             avg_char_width_px) >= target_chars
+
+    budget = compute_budget(1, height_px, font_size_px=font_size_px,
+                            avg_char_width_px=avg_char_width_px,
+                            editor_ruler_columns=editor_ruler_columns, buffer=buffer)
+    per_column = budget["lines"] * buffer
+    if per_column <= 0:
+        return None
+    if editor_ruler_columns is not None and not fits(
+        math.ceil(editor_ruler_columns * budget["avg_char_width_px"]) + 1
+    ):
+        return None
+    columns = math.ceil(target_chars / per_column)
+    return _lowest(fits, math.ceil(columns * budget["avg_char_width_px"]))
+
+
+def min_height_px(
+    target_chars: int,
+    width_px: int,
+    font_size_px: int = 14,
+    editor_ruler_columns: Optional[int] = 80,
+    buffer: float = 0.9,
+    avg_char_width_px: Optional[float] = None
+) -> Optional[int]:
+    """
+    Smallest window height whose budget holds `target_chars` characters.
+
+    Args:
+        target_chars: Characters the screen must hold
+        width_px: Window width in px
+        font_size_px: Font size in px
+        editor_ruler_columns: Ruler columns (None for no ruler)
+        buffer: Fraction of the character budget to keep
+        avg_char_width_px: Measured character width (None: `compute_budget`'s heuristic)
+
+    Returns:
+        Height in px, or None if no height is enough (a zero ruler or buffer)
+
+    Raises:
+        ValueError: If target_chars is below 1
+    """
+    _check_target(target_chars)
+    budget = compute_budget(width_px, 1, font_size_px=font_size_px,
+                            avg_char_width_px=avg_char_width_px,
+                            editor_ruler_columns=editor_ruler_columns, buffer=buffer)
+    per_line = budget["effective_columns"] * buffer
+    if per_line <= 0:
+        return None
+
+    def fits(height: int) -> bool:
+        return _target_chars(width_px, height, font_size_px, editor_ruler_columns, buffer,
+                             avg_char_width_px) >= target_chars
+
+    lines = math.ceil(target_chars / per_line)
+    return _lowest(fits, math.ceil(lines * budget["line_height_px"]))
+
+
+def max_font_size_px(
+    target_chars: int,
+    width_px: int,
+    height_px: int,
+    editor_ruler_columns: Optional[int] = 80,
+    buffer: float = 0.9,
+    min_font_px: int = 1
+) -> Optional[int]:
+    """
+    Largest font size whose budget still holds `target_chars` characters.
+
+    Smaller fonts always fit more text, so this is the font size to pick for a screen. Fonts
+    beyond the point where one character fills the window are not considered.
+
+    Args:
+        target_chars: Characters the screen must hold
+        width_px: Window width in px
+        height_px: Window height in px
+        editor_ruler_columns: Ruler columns (None for no ruler)
+        buffer: Fraction of the character budget to keep
+        min_font_px: Smallest font size to consider
+
+    Returns:
+        Font size in px, or None if even `min_font_px` is too large
+
+    Raises:
+        ValueError: If target_chars is below 1
+    """
+    _check_target(target_chars)
+
+    def fits(font: int) -> bool:
+        return _target_chars(width_px, height_px, font, editor_ruler_columns, buffer) \
+            >= target_chars
+
+    if not fits(min_font_px):
+        return None
+    # Past this size a single character already overflows both dimensions
+    low = min_font_px
+    high = max(min_font_px, math.ceil(max(width_px / 0.55, height_px / 1.25))) + 1
+    if fits(high):
+        return high
+    # Without a ruler or clamping, target_chars ~ (width / 0.55f) * (height / 1.25f) * buffer;
+    # the ruler only lowers it, so this estimate usually brackets the answer tightly
+    estimate = math.ceil(
+        math.sqrt(width_px * height_px * max(buffer, 0) / (0.6875 * target_chars))
+    ) + 1
+    if low < estimate < high and not fits(estimate):
+        high = estimate
+        if low < estimate // 2 and fits(estimate // 2):
+            low = estimate // 2
+    while high - low > 1:
+        mid = (low + high) // 2
+        if fits(mid):
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def solve_budget(
+    parameter: str,
+    target_chars: int,
+    width_px: Optional[int] = None,
+    height_px: Optional[int] = None,
+    font_size_px: int = 14,
+    editor_ruler_columns: Optional[int] = 80,
+    buffer: float = 0.9,
+    avg_char_width_px: Optional[float] = None
+) -> Optional[int]:
+    """
+    Solve one screen parameter for `target_chars`, keeping the others fixed.
+
+    Args:
+        parameter: "width" (smallest width), "height" (smallest height) or "font"
+            (largest font size)
+        target_chars: Characters the screen must hold
+        width_px: Window width in px (ignored when solving for width)
+        height_px: Window height in px (ignored when solving for height)
+        font_size_px: Font size in px (ignored when solving for font)
+        editor_ruler_columns: Ruler columns (None for no ruler)
+        buffer: Fraction of the character budget to keep
+        avg_char_width_px: Measured character width for width/height solves (a font's width
+            table is only valid at one size, so font solves always use the heuristic)
+
+    Returns:
+        The solved value, or None if no value of the parameter is enough
+
+    Raises:
+        ValueError: If the parameter is unknown or target_chars is below 1
+    """
+    if parameter == "width":
+        return min_width_px(target_chars, height_px, font_size_px, editor_ruler_columns, buffer,
+                            avg_char_width_px)
+    if parameter == "height":
+        return min_height_px(target_chars, width_px, font_size_px, editor_ruler_columns, buffer,
+                             avg_char_width_px)
+    if parameter == "font":
+        return max_font_size_px(target_chars, width_px, height_px, editor_ruler_columns, buffer)
+    raise ValueError(
+        f"Unknown parameter '{parameter}'; expected one of {', '.join(SOLVABLE_PARAMETERS)}"
+    )
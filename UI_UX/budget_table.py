@@ -0,0 +1,224 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+budget_table.py
+
+Vectorized `compute_budget` for many screen configurations at once.
+Uses NumPy if available; otherwise falls back to packed `array` columns computed in pure Python
+with identical results.
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    # Optional; without NumPy the table is computed row by row into stdlib arrays
+    import numpy as np
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore
+    _NUMPY_AVAILABLE = False
+
+# Columns computed by BudgetTable, in compute_budget order
+BUDGET_COLUMNS = (
+    "width_px", "height_px", "columns", "lines", "effective_columns", "char_budget",
+    "target_chars", "font_size_px", "avg_char_width_px", "line_height_px",
+)
+_FLOAT_COLUMNS = ("avg_char_width_px", "line_height_px", "buffer")
+_NO_RULER = -1  # editor_ruler_columns=None, stored in integer columns
+_PROFILE_TABLE_CACHE_SIZE = 256
+
+ArrayLike = Union[int, float, None, Sequence[Any], Any]
+
+
+def _is_sequence(value: Any) -> bool:
+    return not isinstance(value, (str, bytes)) and hasattr(value, "__len__")
+
+
+def _ruler_value(value: Optional[int]) -> int:
+    return _NO_RULER if value is None else int(value)
+
+
+class BudgetTable:
+    """
+    `compute_budget` evaluated over arrays of screen configurations.
+
+    Inputs are scalars or equal-length sequences (NumPy broadcasting rules apply when NumPy
+    is installed). Each output is a column with one entry per configuration: NumPy arrays,
+    or `array.array` columns without NumPy. Row `i` equals
+    ``compute_budget(width_px[i], height_px[i], font_size_px[i], editor_ruler_columns=...,
+    buffer=...)``.
+    """
+
+    def __init__(
+        self,
+        width_px: ArrayLike,
+        height_px: ArrayLike,
+        font_size_px: ArrayLike = 14,
+        editor_ruler_columns: ArrayLike = 80,
+        buffer: ArrayLike = 0.9,
+        avg_char_width_px: ArrayLike = None
+    ):
+        """
+        Compute budgets for every configuration.
+
+        Args:
+            width_px: Window widths in px
+            height_px: Window heights in px
+            font_size_px: Font sizes in px
+            editor_ruler_columns: Ruler columns; None (or None entries) means no ruler
+            buffer: Fractions of the character budget to keep
+            avg_char_width_px: Measured average character widths (e.g. from a font's width
+                table); None (or None entries) uses the ``font_size_px * 0.55`` heuristic
+        """
+        if _NUMPY_AVAILABLE:
+            self._compute_numpy(width_px, height_px, font_size_px, editor_ruler_columns, buffer,
+                                avg_char_width_px)
+        else:
+            self._compute_python(width_px, height_px, font_size_px, editor_ruler_columns, buffer,
+                                 avg_char_width_px)
+
+    def _compute_numpy(self, width_px, height_px, font_size_px, editor_ruler_columns, buffer,
+                       avg_char_width_px=None):
+        if _is_sequence(editor_ruler_columns):
+            ruler = np.array([_ruler_value(v) for v in editor_ruler_columns], dtype=np.int64)
+        else:
+            ruler = np.int64(_ruler_value(editor_ruler_columns))
+        if _is_sequence(avg_char_width_px):
+            measured = np.array([np.nan if v is None else v for v in avg_char_width_px],
+                                dtype=np.float64)
+        else:
+            measured = np.float64(np.nan if avg_char_width_px is None else avg_char_width_px)
+        width, height, font, ruler, keep, measured = np.broadcast_arrays(
+            np.atleast_1d(width_px), np.atleast_1d(height_px), np.atleast_1d(font_size_px),
+            np.atleast_1d(ruler), np.atleast_1d(np.asarray(buffer, dtype=np.float64)),
+            np.atleast_1d(measured)
+        )
+        avg_char_width = np.where(np.isnan(measured), np.maximum(4.0, font * 0.55), measured)
+        line_height = np.maximum(12.0, font * 1.25)
+        columns = np.maximum(1, np.floor_divide(width, avg_char_width)).astype(np.int64)
+        lines = np.maximum(1, np.floor_divide(height, line_height)).astype(np.int64)
+        effective = np.where(ruler == _NO_RULER, columns, np.minimum(columns, ruler))
+        char_budget = effective * lines
+        target = np.trunc(char_budget * keep).astype(np.int64)
+
+        self._set_columns(
+            width_px=width, height_px=height, font_size_px=font, editor_ruler_columns=ruler,
+            buffer=keep, avg_char_width_px=avg_char_width, line_height_px=line_height,
+            columns=columns, lines=lines, effective_columns=effective, char_budget=char_budget,
+            target_chars=target,
+        )
+
+    def _compute_python(self, width_px, height_px, font_size_px, editor_ruler_columns, buffer,
+                        avg_char_width_px=None):
+        inputs = [width_px, height_px, font_size_px, editor_ruler_columns, buffer,
+                  avg_char_width_px]
+        lengths = {len(v) for v in inputs if _is_sequence(v)}
+        if len(lengths) > 1:
+            raise ValueError(f"Input sequences must have equal lengths, got {sorted(lengths)}")
+        size = lengths.pop() if lengths else 1
+        width, height, font, ruler, keep, measured = (
+            list(v) if _is_sequence(v) else [v] * size for v in inputs
+        )
+
+        out: Dict[str, array] = {
+            "width_px": array("d"), "height_px": array("d"), "font_size_px": array("d"),
+            "editor_ruler_columns": array("q"), "buffer": array("d"),
+            "avg_char_width_px": array("d"), "line_height_px": array("d"),
+            "columns": array("q"), "lines": array("q"), "effective_columns": array("q"),
+            "char_budget": array("q"), "target_chars": array("q"),
+        }
+        for w, h, f, r, b, m in zip(width, height, font, ruler, keep, measured):
+            avg_char_width = max(4.0, f * 0.55) if m is None else float(m)
+            line_height = max(12.0, f * 1.25)
+            columns = max(1, int(w // avg_char_width))
+            lines = max(1, int(h // line_height))
+            effective = columns if r is None else min(columns, r)
+            char_budget = effective * lines
+            for name, value in (
+                ("width_px", w), ("height_px", h), ("font_size_px", f),
+                ("editor_ruler_columns", _ruler_value(r)), ("buffer", b),
+                ("avg_char_width_px", avg_char_width), ("line_height_px", line_height),
+                ("columns", columns), ("lines", lines), ("effective_columns", effective),
+                ("char_budget", char_budget), ("target_chars", int(char_budget * b)),
+            ):
+                out[name].append(value)
+        self._set_columns(**out)
+
+    def _set_columns(self, **columns: Any) -> None:
+        for name, values in columns.items():
+            if _NUMPY_AVAILABLE:
+                values = np.ascontiguousarray(values)
+                values.flags.writeable = False
+            setattr(self, name, values)
+
+    @classmethod
+    def for_profiles(cls, profiles: Iterable[Any]) -> "BudgetTable":
+        """
+        Budget table with one row per profile, memoized.
+
+        Profiles are identified by their budget fields (width_px, height_px, font_size_px,
+        editor_ruler_columns, buffer, and a measured avg_char_width_px if they have one), so
+        repeated calls for the same profiles, or for different objects describing the same
+        screens, return the same table (read-only with NumPy; treat it as read-only either way).
+
+        Args:
+            profiles: Objects with the profile budget fields (e.g. `vision_ui` Profiles)
+
+        Returns:
+            BudgetTable for the profiles, in order
+        """
+        key = tuple(profile_budget_key(profile) for profile in profiles)
+        with _profile_tables_lock:
+            table = _profile_tables.get(key)
+            if table is not None:
+                _profile_tables.move_to_end(key)
+                return table
+        if key:
+            width, height, font, ruler, keep, measured = (list(column) for column in zip(*key))
+        else:
+            width = height = font = ruler = keep = measured = []
+        table = cls(width, height, font, ruler, keep, measured)
+        with _profile_tables_lock:
+            _profile_tables[key] = table
+            if len(_profile_tables) > _PROFILE_TABLE_CACHE_SIZE:
+                _profile_tables.popitem(last=False)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.target_chars)
+
+    def budget(self, index: int) -> Dict[str, Union[int, float]]:
+        """Row `index` as a fresh `compute_budget`-style dictionary."""
+        row: Dict[str, Union[int, float]] = {}
+        for name in BUDGET_COLUMNS:
+            value = self.__dict__[name][index]
+            row[name] = float(value) if name in _FLOAT_COLUMNS else _number(value)
+        return row
+
+    def budgets(self) -> List[Dict[str, Union[int, float]]]:
+        """All rows as `compute_budget`-style dictionaries."""
+        return [self.budget(i) for i in range(len(self))]
+
+
+def _number(value: Any) -> Union[int, float]:
+    """Plain Python int for integral values (NumPy scalars included), float otherwise."""
+    value = value.item() if hasattr(value, "item") else value
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def profile_budget_key(profile: Any) -> Tuple[Any, Any, Any, Any, Any, Optional[float]]:
+    """The profile fields that determine its budget (a font-derived char width if any)."""
+    return (profile.width_px, profile.height_px, profile.font_size_px,
+            profile.editor_ruler_columns, profile.buffer,
+            getattr(profile, "avg_char_width_px", None))
+
+
+_profile_tables: "OrderedDict[Tuple, BudgetTable]" = OrderedDict()
+_profile_tables_lock = threading.Lock()
@@ -0,0 +1,205 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+cell_width.py
+
+Display-cell width of text: East Asian wide and fullwidth characters (CJK, most emoji) take two
+cells, combining marks and other zero-width characters take none, everything else takes one.
+Widths come from a two-level table (256-codepoint blocks, identical blocks shared) filled lazily
+from `unicodedata`; pure-ASCII text skips the table and costs a `len()`, and long non-ASCII text
+is looked up in one vectorized pass when NumPy is available.
+"""
+
+import textwrap
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+try:
+    # Optional; without NumPy non-ASCII text is measured character by character
+    import numpy as np
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore
+    _NUMPY_AVAILABLE = False
+
+BLOCK_BITS = 8
+BLOCK_SIZE = 1 << BLOCK_BITS
+BLOCK_MASK = BLOCK_SIZE - 1
+MAX_CODEPOINT = 0x10FFFF
+
+_ZERO_WIDTH_CATEGORIES = frozenset(("Mn", "Me", "Cf", "Cc"))
+# Hangul jamo vowels and finals combine with the preceding initial into one wide syllable
+_ZERO_WIDTH_RANGES = ((0x1160, 0x11FF), (0xD7B0, 0xD7FF))
+
+# Second level: one bytes object of cell widths per 256-codepoint block (None until first use)
+_blocks: List[Optional[bytes]] = [None] * ((MAX_CODEPOINT >> BLOCK_BITS) + 1)
+# Identical blocks (all-narrow Latin, all-wide ideographs, ...) share one object
+_interned: Dict[bytes, bytes] = {}
+# NumPy copy of the table: (offset of each block's row in the flattened unique blocks, -1 if
+# unbuilt; the unique blocks concatenated)
+_numpy_table: Optional[Tuple["np.ndarray", "np.ndarray"]] = None
+# Below this length the per-character loop beats converting the text to an array
+_NUMPY_MIN_LENGTH = 64
+
+
+def _codepoint_width(codepoint: int) -> int:
+    if codepoint < 0x80:
+        return 1  # as `len()`, so ASCII text measures the same with or without the fast path
+    if codepoint == 0x00AD:
+        return 1  # soft hyphen is format (Cf) but rendered as a hyphen
+    if any(low <= codepoint <= high for low, high in _ZERO_WIDTH_RANGES):
+        return 0
+    char = chr(codepoint)
+    if unicodedata.category(char) in _ZERO_WIDTH_CATEGORIES:
+        return 0
+    if unicodedata.east_asian_width(char) in ("W", "F"):
+        return 2
+    return 1
+
+
+def _build_block(index: int) -> bytes:
+    start = index << BLOCK_BITS
+    block = bytes(_codepoint_width(cp) for cp in range(start, start + BLOCK_SIZE))
+    return _interned.setdefault(block, block)
+
+
+def _load_blocks(text: str) -> None:
+    """Fill the table blocks `text` needs."""
+    global _numpy_table
+    for index in {ord(char) >> BLOCK_BITS for char in text}:
+        if _blocks[index] is None:
+            _blocks[index] = _build_block(index)
+            _numpy_table = None
+
+
+def _get_numpy_table() -> Tuple["np.ndarray", "np.ndarray"]:
+    global _numpy_table
+    table = _numpy_table
+    if table is None:
+        rows = list(_interned.values())
+        row_of = {id(block): row for row, block in enumerate(rows)}
+        offsets = np.array([-1 if b is None else row_of[id(b)] << BLOCK_BITS for b in _blocks],
+                           dtype=np.intp)
+        table = _numpy_table = (offsets, np.frombuffer(b"".join(rows), dtype=np.uint8))
+    return table
+
+
+def _cell_width_numpy(text: str) -> Optional[int]:
+    try:
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    except UnicodeEncodeError:  # lone surrogates
+        return None
+    blocks = codes >> BLOCK_BITS
+    offsets, widths = _get_numpy_table()
+    starts = offsets[blocks]
+    if starts.min() < 0:
+        _load_blocks(text)
+        offsets, widths = _get_numpy_table()
+        starts = offsets[blocks]
+    return int(widths[starts | (codes & BLOCK_MASK)].sum(dtype=np.int64))
+
+
+def char_width(char: str) -> int:
+    """Cells one character takes: 0, 1 or 2."""
+    codepoint = ord(char)
+    block = _blocks[codepoint >> BLOCK_BITS]
+    if block is None:
+        _load_blocks(char)
+        block = _blocks[codepoint >> BLOCK_BITS]
+    return block[codepoint & BLOCK_MASK]
+
+
+def cell_width(text: str) -> int:
+    """
+    Cells `text` takes on a terminal or fixed-pitch screen.
+
+    Equal to ``len(text)`` for ASCII. Newlines and other ASCII controls count one cell, like
+    `len()`; emoji sequences are measured per code point (a ZWJ sequence counts each emoji).
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Width in cells
+    """
+    if text.isascii():
+        return len(text)
+    if _NUMPY_AVAILABLE and len(text) >= _NUMPY_MIN_LENGTH:
+        width = _cell_width_numpy(text)
+        if width is not None:
+            return width
+    blocks = _blocks
+    try:
+        return sum(blocks[cp >> BLOCK_BITS][cp & BLOCK_MASK] for cp in map(ord, text))
+    except TypeError:  # a block not built yet
+        _load_blocks(text)
+        return sum(blocks[cp >> BLOCK_BITS][cp & BLOCK_MASK] for cp in map(ord, text))
+
+
+def truncate_cells(text: str, max_cells: int, placeholder: str = "...") -> str:
+    """
+    Cut `text` to at most `max_cells` cells, ending with `placeholder` if anything was cut.
+
+    Wide characters are never split and combining marks stay with their base character. For
+    ASCII this is ``text[:max_cells - len(placeholder)] + placeholder``.
+
+    Args:
+        text: Text to cut
+        max_cells: Width limit in cells
+        placeholder: Marker appended to cut text
+
+    Returns:
+        The text, cut if it was wider than `max_cells`
+    """
+    if cell_width(text) <= max_cells:
+        return text
+    room = max(0, max_cells - cell_width(placeholder))
+    if text.isascii():
+        return text[:room] + placeholder
+    cells = end = 0
+    for i, char in enumerate(text):
+        cells += char_width(char)
+        if cells > room:
+            break
+        end = i + 1
+    return text[:end] + placeholder
+
+
+def shorten_cells(text: str, width: int, placeholder: str = "...") -> str:
+    """
+    `textwrap.shorten` measured in cells.
+
+    Whitespace is collapsed and whole words are kept while they fit with the placeholder. ASCII
+    text goes through `textwrap.shorten` itself. Text whose first word does not fit (CJK prose
+    has no spaces to break at) is cut mid-word with `truncate_cells` instead of being reduced
+    to the bare placeholder.
+
+    Args:
+        text: Text to shorten
+        width: Width limit in cells
+        placeholder: Marker appended to shortened text
+
+    Returns:
+        Shortened text
+    """
+    if text.isascii():
+        return textwrap.shorten(text, width=width, placeholder=placeholder)
+    words = text.split()
+    collapsed = " ".join(words)
+    if cell_width(collapsed) <= width:
+        return collapsed
+    room = width - cell_width(placeholder)
+    kept = 0
+    cells = -1  # no space before the first word
+    for word in words:
+        cells += 1 + cell_width(word)
+        if cells > room:
+            break
+        kept += 1
+    if kept:
+        return " ".join(words[:kept]) + placeholder
+    return truncate_cells(collapsed, width, placeholder)
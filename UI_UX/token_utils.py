@@ -22,19 +22,25 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-def get_tokenizer(model_name: str = "gpt2"):
+def get_tokenizer(model_name: str = "gpt2", trust_remote_code: bool = True,
+                  local_files_only: bool = False):
     """Return a tokenizer instance for `model_name` if transformers available.
 
     This function may download tokenizer data the first time it runs.
     If `transformers` is not installed, returns None.
     Supports modern models like Llama-3, Phi-4, etc.
+    Pass ``trust_remote_code=False`` when the model name comes from untrusted data, so a
+    model repository's custom tokenizer code is never executed, and ``local_files_only=True``
+    to use only tokenizers already downloaded (None if the model's is not).
     """
     if not _HF_AVAILABLE:
         return None
     try:
         # For modern Llama/Phi models, we use AutoTokenizer which handles 
         # LlamaTokenizer or FastTokenizers correctly.
-        return AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+        return AutoTokenizer.from_pretrained(
+            model_name, trust_remote_code=trust_remote_code, local_files_only=local_files_only
+        )
     except Exception as e:
         logger.error(f"Failed to load tokenizer for {model_name}: {e}")
         return None
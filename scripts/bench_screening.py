@@ -0,0 +1,83 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+bench_screening.py
+
+Screening throughput with and without the native Aho-Corasick prefilter.
+Screens a corpus (a text file, or the repository's Markdown and Python sources repeated) for a
+few hundred terms drawn from the corpus's own mid-frequency vocabulary, so terms start with
+all kinds of letters and actually occur, and reports MB/s per backend.
+
+    python scripts/bench_screening.py [--corpus FILE] [--mb 14] [--terms 300]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from vision_ui import screening  # noqa: E402
+from vision_ui.screening import Screener  # noqa: E402
+
+
+def _corpus(path, megabytes):
+    if path:
+        text = Path(path).read_text(encoding="utf-8", errors="replace")
+    else:
+        sources = sorted(ROOT.glob("**/*.md")) + sorted(ROOT.glob("vision_ui/**/*.py"))
+        text = "\n".join(p.read_text(encoding="utf-8", errors="replace") for p in sources)
+    size = int(megabytes * 1_000_000)
+    return (text * (size // max(len(text), 1) + 1))[:size]
+
+
+def _terms(text, count, seed):
+    ranked = [w for w, _ in Counter(re.findall(r"[a-z]{4,}", text.lower())).most_common()]
+    pool = ranked[len(ranked) // 10:] or ranked  # skip the most common words
+    return random.Random(seed).sample(pool, min(count, len(pool)))
+
+
+def _measure(text, terms, whole_words, repeat):
+    screener = Screener({"bench": terms}, whole_words=whole_words)
+    best, matches = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = len(screener.scan(text))
+        best = min(best, time.perf_counter() - start)
+    return len(text.encode("utf-8")) / best / 1e6, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="Text file to screen (default: repository sources)")
+    parser.add_argument("--mb", type=float, default=14.0, help="Corpus size in MB")
+    parser.add_argument("--terms", type=int, default=300, help="Number of terms")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend (best is kept)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    text = _corpus(args.corpus, args.mb)
+    terms = _terms(text, args.terms, args.seed)
+    print(f"corpus: {len(text.encode('utf-8')) / 1e6:.1f} MB, {len(terms)} terms")
+    backends = [False] + ([True] if screening._AHOCORASICK_AVAILABLE else [])
+    for native in backends:
+        screening._AHOCORASICK_AVAILABLE = native
+        name = "ahocorasick-rs" if native else "regex"
+        for whole_words in (True, False):
+            rate, matches = _measure(text, terms, whole_words, args.repeat)
+            print(f"{name:>15} whole_words={whole_words!s:<5} {rate:8.1f} MB/s  {matches} matches")
+    if len(backends) == 1:
+        print("ahocorasick-rs is not installed; pip install 'vision-ui[screen]' to compare")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Tests for the asyncio summarization API.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from vision_ui.async_summarize import (
+    async_multi_profile_summarize,
+    async_screenshot_aware_summarize,
+)
+from vision_ui.deadline import DEADLINE_MARKER, CancellationToken, Deadline
+from vision_ui.ocr import OCRResult
+from vision_ui.profiles import load_profile
+from vision_ui.redaction import Redactor
+from vision_ui.summarize import multi_profile_summarize
+
+TEXT = "The cache warmed in four seconds. Requests then fell back to the origin. " * 30
+PROFILES = ["phone", "laptop", "tweet", "slides"]
+
+
+def _profiles():
+    return [load_profile(name) for name in PROFILES]
+
+
+class TestAsyncMultiProfile:
+    """Test async_multi_profile_summarize."""
+
+    def test_matches_sync_results(self):
+        """Test that the default summarizer gives identical results."""
+        profiles = _profiles()
+        result = asyncio.run(async_multi_profile_summarize(TEXT, profiles, persona="manager"))
+        assert result == multi_profile_summarize(TEXT, profiles, persona="manager")
+
+    def test_async_summarizer_runs_concurrently(self):
+        """Test that latency is bounded by the slowest call, not the sum."""
+        async def slow(text: str, char_limit: int) -> str:
+            await asyncio.sleep(0.05)
+            return text[:char_limit]
+
+        start = time.perf_counter()
+        result = asyncio.run(async_multi_profile_summarize(TEXT, _profiles(), summarizer=slow))
+        elapsed = time.perf_counter() - start
+
+        assert len(result) == len(PROFILES)
+        assert elapsed < 0.05 * len(PROFILES) * 3 / 2  # 12 calls would take 0.6s in sequence
+
+    def test_concurrency_limit(self):
+        """Test that no more than max_concurrency calls are in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def tracked(text: str, char_limit: int) -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return text[:char_limit]
+
+        asyncio.run(async_multi_profile_summarize(
+            TEXT, _profiles(), summarizer=tracked, max_concurrency=2
+        ))
+        assert peak == 2
+
+    def test_sync_summarizer_runs_in_executor(self):
+        """Test that blocking summarizers run off the event loop thread."""
+        threads = set()
+
+        def blocking(text: str, char_limit: int) -> str:
+            threads.add(threading.get_ident())
+            return text[:char_limit]
+
+        async def run():
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                return await async_multi_profile_summarize(
+                    TEXT, _profiles(), ["headline"], summarizer=blocking, executor=executor
+                )
+
+        result = asyncio.run(run())
+        assert threading.get_ident() not in threads
+        assert result == multi_profile_summarize(TEXT, _profiles(), ["headline"], summarizer=blocking)
+
+    def test_preparation_runs_in_executor(self):
+        """Test that redaction and segmentation run off the event loop thread."""
+        threads = []
+        redactor = Redactor()
+        redact = redactor.redact
+
+        def tracking(text):
+            threads.append(threading.get_ident())
+            return redact(text)
+
+        with patch.object(redactor, "redact", side_effect=tracking):
+            result = asyncio.run(async_multi_profile_summarize(TEXT, _profiles(), redactor=redactor))
+        assert threads and threading.get_ident() not in threads
+        assert result == multi_profile_summarize(TEXT, _profiles(), redactor=Redactor())
+
+    def test_deadline_falls_back_to_prefix(self):
+        """Test that calls still running at the deadline fall back to marked prefix summaries."""
+        async def stuck(text: str, char_limit: int) -> str:
+            await asyncio.sleep(5)
+            return text[:char_limit]
+
+        deadline = Deadline(0.05)
+        start = time.perf_counter()
+        result = asyncio.run(async_multi_profile_summarize(
+            TEXT, _profiles(), ["headline"], summarizer=stuck, deadline=deadline
+        ))
+        assert time.perf_counter() - start < 1
+        expected = multi_profile_summarize(TEXT, _profiles(), ["headline"])
+        for name in PROFILES:
+            assert result[name]["headline"] == DEADLINE_MARKER + expected[name]["headline"]
+        assert deadline.fallbacks == len(PROFILES)
+
+    def test_cancel_token_stops_waiting(self):
+        """Test that cancelling the token ends the wait without a time limit."""
+        token = CancellationToken()
+
+        async def stuck(text: str, char_limit: int) -> str:
+            token.cancel()
+            await asyncio.sleep(5)
+            return text[:char_limit]
+
+        result = asyncio.run(async_multi_profile_summarize(
+            TEXT, _profiles(), ["headline"], summarizer=stuck, cancel_token=token
+        ))
+        assert all(r["headline"].startswith(DEADLINE_MARKER) for r in result.values())
+
+    def test_invalid_arguments(self):
+        """Test that bad layers and limits are rejected."""
+        with pytest.raises(ValueError, match="Unknown layer"):
+            asyncio.run(async_multi_profile_summarize(TEXT, _profiles(), ["nope"]))
+        with pytest.raises(ValueError, match="max_concurrency"):
+            asyncio.run(async_multi_profile_summarize(TEXT, _profiles(), max_concurrency=0))
+
+
+class TestAsyncScreenshot:
+    """Test async_screenshot_aware_summarize."""
+
+    @patch('vision_ui.screenshot_handlers.ScreenshotAnalyzer.estimate_text_density', return_value=0.5)
+    @patch('vision_ui.screenshot_handlers.ScreenshotAnalyzer.extract_ui_regions', return_value={})
+    @patch('vision_ui.screenshot_handlers.ScreenshotAnalyzer.analyze_screenshot')
+    def test_ocr_runs_in_executor(self, mock_analyze, mock_regions, mock_density):
+        """Test that OCR runs off the loop and results carry OCR metadata."""
+        ocr_threads = []
+
+        def analyze(image_path):
+            ocr_threads.append(threading.get_ident())
+            return OCRResult(
+                full_text="Signed in as amy@example.com. Dashboard shows three alerts.",
+                regions=[],
+                image_info={'size': (800, 600)},
+                preprocessing_applied=['grayscale']
+            )
+
+        mock_analyze.side_effect = analyze
+        result = asyncio.run(async_screenshot_aware_summarize(
+            "test.png", [load_profile("laptop")], redactor=Redactor()
+        ))
+
+        assert ocr_threads and ocr_threads[0] != threading.get_ident()
+        assert "amy@example.com" not in result["laptop"]["one_screen"]
+        assert result["_ocr_metadata"]["image_size"] == (800, 600)
@@ -0,0 +1,121 @@
+"""
+Tests for the inverse budget solver.
+"""
+
+import io
+import json
+import random
+from unittest.mock import patch
+
+import pytest
+
+from UI_UX.budget import compute_budget
+from UI_UX.budget_solver import max_font_size_px, min_height_px, min_width_px, solve_budget
+from vision_ui.cli import build_parser
+from vision_ui.profiles import fit_profile, load_profile
+
+
+def _target(width, height, font, ruler, buffer):
+    return compute_budget(width, height, font_size_px=font, editor_ruler_columns=ruler,
+                          buffer=buffer)["target_chars"]
+
+
+def _cases(count=400):
+    rng = random.Random(7)
+    for _ in range(count):
+        yield (rng.randint(1, 6000), rng.randint(1, 3840), rng.randint(1, 2160),
+               rng.randint(4, 40), rng.choice([None, 0, 1, 40, 80, 200]),
+               rng.choice([0.0, 0.5, 0.85, 0.9, 1.0]))
+
+
+class TestBudgetSolver:
+    """Test solutions against compute_budget."""
+
+    def test_min_width_is_tight(self):
+        """Test that the width fits and one pixel less does not."""
+        for chars, _, height, font, ruler, buffer in _cases():
+            width = min_width_px(chars, height, font, ruler, buffer)
+            if width is None:
+                assert _target(10 ** 6, height, font, ruler, buffer) < chars
+            else:
+                assert _target(width, height, font, ruler, buffer) >= chars
+                assert width == 1 or _target(width - 1, height, font, ruler, buffer) < chars
+
+    def test_min_height_is_tight(self):
+        """Test that the height fits and one pixel less does not."""
+        for chars, width, _, font, ruler, buffer in _cases():
+            height = min_height_px(chars, width, font, ruler, buffer)
+            if height is None:
+                assert _target(width, 10 ** 6, font, ruler, buffer) < chars
+            else:
+                assert _target(width, height, font, ruler, buffer) >= chars
+                assert height == 1 or _target(width, height - 1, font, ruler, buffer) < chars
+
+    def test_max_font_is_tight(self):
+        """Test that the font fits and one pixel more does not."""
+        for chars, width, height, _, ruler, buffer in _cases():
+            font = max_font_size_px(chars, width, height, ruler, buffer)
+            if font is None:
+                assert _target(width, height, 1, ruler, buffer) < chars
+            else:
+                assert _target(width, height, font, ruler, buffer) >= chars
+                assert _target(width, height, font + 1, ruler, buffer) < chars
+
+    def test_invalid_arguments(self):
+        """Test unknown parameters and empty targets."""
+        with pytest.raises(ValueError, match="Unknown parameter"):
+            solve_budget("ruler", 100, 1920, 1080)
+        with pytest.raises(ValueError, match="at least 1"):
+            solve_budget("width", 0, height_px=1080)
+
+
+class TestFitProfile:
+    """Test solving profile parameters."""
+
+    def test_fit_profile(self):
+        """Test that only the solved field changes."""
+        phone = load_profile("phone")
+        taller = fit_profile(phone, "height", 2000)
+        assert (taller.width_px, taller.font_size_px) == (phone.width_px, phone.font_size_px)
+        assert _target(taller.width_px, taller.height_px, taller.font_size_px,
+                       taller.editor_ruler_columns, taller.buffer) >= 2000
+        assert phone.height_px == 667
+        # The phone's 40-column ruler caps every row, so widening never reaches 2000 chars
+        assert fit_profile(phone, "width", 2000) is None
+
+    def test_cli(self):
+        """Test 'vision-ui fit' text and JSON output."""
+        def run(argv):
+            args = build_parser().parse_args(argv)
+            stdout = io.StringIO()
+            with patch("sys.stdout", stdout):
+                args.func(args)
+            return stdout.getvalue()
+
+        out = run(["fit", "--chars", "2000", "--solve", "height", "--profiles", "phone"])
+        assert out.strip() == "phone: height_px >= 885 (was 667) for 2000 chars"
+
+        data = json.loads(run(["fit", "--chars", "2000", "--solve", "font",
+                               "--profiles", "phone,laptop", "--format", "json"]))
+        assert data["phone"] is None
+        assert data["laptop"]["font_size_px"] == max_font_size_px(2000, 1920, 1080, 80, 0.9)
+        assert data["laptop"]["target_chars"] >= 2000
+
+    def test_cli_file_measured_in_cells(self, tmp_path, capsys):
+        """Test that 'vision-ui fit --file' sizes wide characters as two cells."""
+        path = tmp_path / "doc.txt"
+        path.write_text("漢字" * 500 + "\n", encoding="utf-8")
+        args = build_parser().parse_args(
+            ["fit", "--file", str(path), "--solve", "height", "--profiles", "phone"])
+        args.func(args)
+        assert capsys.readouterr().out.strip() == \
+            "phone: height_px >= 885 (was 667) for 2000 chars"
+
+    def test_cli_skips_token_profiles(self, capsys):
+        """Test that 'vision-ui fit' notes token profiles and fits the rest."""
+        args = build_parser().parse_args(
+            ["fit", "--chars", "2000", "--solve", "height", "--profiles", "prompt-8k,phone"])
+        args.func(args)
+        captured = capsys.readouterr()
+        assert captured.out.strip() == "phone: height_px >= 885 (was 667) for 2000 chars"
+        assert "Skipping prompt-8k: token profiles have no screen to fit" in captured.err
@@ -0,0 +1,100 @@
+"""
+Tests for the vectorized BudgetTable.
+"""
+
+import itertools
+
+import pytest
+
+from UI_UX import budget_table
+from UI_UX.budget import compute_budget
+from UI_UX.budget_table import BudgetTable
+from vision_ui.profiles import Profile, load_profile
+
+GRID = list(itertools.product(
+    [1, 280, 375, 1024, 1366, 1920, 3840],  # width
+    [1, 400, 667, 768, 1080, 2160],         # height
+    [6, 10, 12, 14, 18, 24],                # font
+    [None, 0, 40, 80],                      # ruler
+    [0.333, 0.85, 0.9, 1.0],                # buffer
+))
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test with NumPy and with the pure-Python fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(budget_table, "_NUMPY_AVAILABLE", True)
+    else:
+        monkeypatch.setattr(budget_table, "_NUMPY_AVAILABLE", False)
+    return request.param
+
+
+class TestBudgetTable:
+    """Test that BudgetTable matches compute_budget."""
+
+    def test_matches_compute_budget(self, backend):
+        """Test every row against the scalar function, including value types."""
+        table = BudgetTable(*[list(column) for column in zip(*GRID)])
+        assert len(table) == len(GRID)
+        for i, (width, height, font, ruler, buffer) in enumerate(GRID):
+            expected = compute_budget(width, height, font_size_px=font,
+                                      editor_ruler_columns=ruler, buffer=buffer)
+            row = table.budget(i)
+            assert row == expected
+            assert {k: type(v) for k, v in row.items()} == {k: type(v) for k, v in expected.items()}
+
+    def test_scalars_broadcast(self, backend):
+        """Test that scalar arguments apply to every configuration."""
+        table = BudgetTable([375, 1920], 1080, font_size_px=14)
+        assert list(table.height_px) == [1080, 1080]
+        assert BudgetTable(1366, 768).budget(0) == compute_budget(1366, 768)
+
+    def test_numpy_matches_python_fallback(self, monkeypatch):
+        """Test that both backends produce the same columns for the same inputs."""
+        pytest.importorskip("numpy")
+        columns = [list(column) for column in zip(*GRID)]
+        tables = {}
+        for available in (True, False):
+            monkeypatch.setattr(budget_table, "_NUMPY_AVAILABLE", available)
+            tables[available] = BudgetTable(*columns)
+        for name in ("columns", "lines", "effective_columns", "char_budget", "target_chars"):
+            assert list(getattr(tables[True], name)) == list(getattr(tables[False], name)), name
+
+    def test_python_fallback_rejects_ragged_inputs(self, monkeypatch):
+        """Test that the fallback refuses sequences of different lengths."""
+        monkeypatch.setattr(budget_table, "_NUMPY_AVAILABLE", False)
+        with pytest.raises(ValueError, match="equal lengths"):
+            BudgetTable([100, 200], [100, 200, 300])
+
+
+class TestProfileTables:
+    """Test memoized per-profile tables."""
+
+    def test_memoized_by_budget_fields(self):
+        """Test that equal screens share one table, and changed ones do not."""
+        first = BudgetTable.for_profiles([load_profile("phone"), load_profile("laptop")])
+        again = BudgetTable.for_profiles([load_profile("phone"), load_profile("laptop")])
+        assert first is again
+
+        wider = Profile("phone", 414, 667, 12)
+        assert BudgetTable.for_profiles([wider, load_profile("laptop")]) is not first
+
+    def test_profile_rows(self):
+        """Test that rows follow profile order and match compute_budget."""
+        profiles = [load_profile("slides"), load_profile("tweet")]
+        table = BudgetTable.for_profiles(profiles)
+        for i, profile in enumerate(profiles):
+            assert table.budget(i) == compute_budget(
+                profile.width_px, profile.height_px, font_size_px=profile.font_size_px,
+                editor_ruler_columns=profile.editor_ruler_columns, buffer=profile.buffer
+            )
+
+    def test_columns_read_only(self):
+        """Test that shared tables cannot be modified in place."""
+        np = pytest.importorskip("numpy")
+        table = BudgetTable.for_profiles([load_profile("phone")])
+        assert isinstance(table.target_chars, np.ndarray)
+        with pytest.raises(ValueError):
+            table.target_chars[0] = 0
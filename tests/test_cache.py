@@ -0,0 +1,228 @@
+"""
+Tests for the two-tier summary cache.
+"""
+
+import io
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+from UI_UX.budget import compute_budget, naive_summarize
+from vision_ui.cache import LRUCache, SQLiteStore, SummaryCache, summarizer_identity, text_hash
+from vision_ui.cli import build_parser
+from vision_ui.deadline import Deadline
+from vision_ui.layered_summarizer import layered_summarize
+from vision_ui.personas import Persona
+from vision_ui.profiles import load_profile
+from vision_ui.summarize import multi_profile_summarize
+
+TEXT = "Replica lag crossed the paging threshold. Reads were shifted to the primary. " * 20
+
+
+def _counting_summarizer():
+    calls = []
+
+    def summarize(text, char_limit):
+        calls.append(char_limit)
+        return text[:char_limit]
+
+    summarize.cache_id = "counting:v1"
+    return summarize, calls
+
+
+def _summarize_in_worker(path):
+    """Run in a child process: summarize through a cache file shared with the parent."""
+    cache = SummaryCache(path)
+    multi_profile_summarize(TEXT, [load_profile("phone")], cache=cache)
+    cache.close()
+    return cache.stats.hits
+
+
+class TestLRUCache:
+    """Test the in-memory tier."""
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Test that the byte cap evicts the oldest entry, counting reads as use."""
+        cache = LRUCache(max_bytes=25)
+        cache.put("a", "x" * 9)
+        cache.put("b", "y" * 9)
+        assert cache.get("a") == "x" * 9
+        cache.put("c", "z" * 9)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.size == 20
+
+    def test_oversized_entry_not_stored(self):
+        """Test that a value larger than the cap is skipped."""
+        cache = LRUCache(max_bytes=5)
+        cache.put("key", "too long")
+        assert len(cache) == 0
+
+
+class TestSQLiteStore:
+    """Test the persistent tier."""
+
+    def test_wal_and_persistence(self, tmp_path):
+        """Test that entries survive reopening and the database runs in WAL mode."""
+        path = tmp_path / "cache.sqlite3"
+        store = SQLiteStore(path)
+        store.put_many({"k1": "v1", "k2": "v2"})
+        store.close()
+
+        assert sqlite3.connect(str(path)).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        reopened = SQLiteStore(path)
+        assert reopened.get_many(["k1", "k3"]) == {"k1": "v1"}
+        reopened.close()
+
+    def test_size_eviction(self, tmp_path):
+        """Test that the store evicts least-recently-read entries past its byte limit."""
+        store = SQLiteStore(tmp_path / "cache.sqlite3", max_bytes=100)
+        store.put_many({"old": "a" * 40})
+        store.put_many({"new": "b" * 40})
+        store.get_many(["old"])
+        store.put_many({"third": "c" * 40})
+        assert set(store.get_many(["old", "new", "third"])) == {"old", "third"}
+        store.close()
+
+    def test_tracked_total(self, tmp_path):
+        """Test that the stored byte total follows inserts, replacements, evictions and clears."""
+        path = tmp_path / "cache.sqlite3"
+
+        def totals(store):
+            tracked = store._conn.execute(
+                "SELECT value FROM summary_meta WHERE name = 'total_size'").fetchone()[0]
+            actual = store._conn.execute("SELECT TOTAL(size) FROM summaries").fetchone()[0]
+            return tracked, actual
+
+        store = SQLiteStore(path, max_bytes=100)
+        store.put_many({"a": "x" * 30, "b": "y" * 30})
+        store.put_many({"a": "z" * 10})
+        assert totals(store) == (42, 42)  # the replaced entry no longer counts
+        store.put_many({"c": "w" * 60})
+        tracked, actual = totals(store)
+        assert tracked == actual <= 90
+        store.clear()
+        assert totals(store) == (0, 0)
+        store.close()
+
+        # A store written before the total was tracked is measured once when opened
+        legacy = sqlite3.connect(str(path))
+        legacy.executescript("DROP TABLE summary_meta; DROP TRIGGER summaries_size_insert;")
+        legacy.execute("INSERT INTO summaries VALUES ('k', 'v', 2, 0)")
+        legacy.commit()
+        legacy.close()
+        store = SQLiteStore(path, max_bytes=100)
+        assert totals(store) == (2, 2)
+        store.close()
+
+
+class TestKeys:
+    """Test cache key components."""
+
+    def test_summarizer_identity(self):
+        """Test that only summarizers with a stable identity are cacheable."""
+        assert summarizer_identity(naive_summarize) == "UI_UX.budget.naive_summarize"
+        assert summarizer_identity(lambda text, limit: text) is None
+        summarize, _ = _counting_summarizer()
+        assert summarizer_identity(summarize) == "counting:v1"
+
+    def test_key_changes_with_every_component(self):
+        """Test that each key component produces a distinct key."""
+        doc = text_hash(TEXT)
+        base = SummaryCache.key(doc, 400, "headline", None, "s")
+        variants = [
+            SummaryCache.key(text_hash(TEXT + "!"), 400, "headline", None, "s"),
+            SummaryCache.key(doc, 401, "headline", None, "s"),
+            SummaryCache.key(doc, 400, "deep", None, "s"),
+            SummaryCache.key(doc, 400, "headline", "{}", "s"),
+            SummaryCache.key(doc, 400, "headline", None, "t"),
+        ]
+        assert base not in variants and len(set(variants)) == len(variants)
+
+
+class TestCachedSummarize:
+    """Test the cache in front of multi_profile_summarize and layered_summarize."""
+
+    def test_results_unchanged_and_reused(self):
+        """Test that a repeated call is served entirely from the cache."""
+        summarize, calls = _counting_summarizer()
+        profiles = [load_profile("phone"), load_profile("laptop")]
+        cache = SummaryCache()
+
+        first = multi_profile_summarize(TEXT, profiles, summarizer=summarize, cache=cache)
+        call_count = len(calls)
+        second = multi_profile_summarize(TEXT, profiles, summarizer=summarize, cache=cache)
+
+        assert first == second == multi_profile_summarize(TEXT, profiles, summarizer=summarize)
+        assert len(calls) == 2 * call_count
+        assert cache.stats.memory_hits == 6
+
+    def test_persona_definition_is_part_of_key(self):
+        """Test that editing a persona's definition misses the cache."""
+        cache = SummaryCache()
+        profiles = [load_profile("laptop")]
+        persona = Persona(name="ops", vocabulary_mappings={"Replica": "Follower"})
+        edited = Persona(name="ops", vocabulary_mappings={"Replica": "Standby"})
+
+        multi_profile_summarize(TEXT, profiles, persona=persona, cache=cache)
+        result = multi_profile_summarize(TEXT, profiles, persona=edited, cache=cache)
+
+        assert cache.stats.hits == 0
+        assert "Standby" in result["laptop"]["headline"]
+
+    def test_deadline_fallbacks_not_stored(self):
+        """Test that [partial] fallbacks are never written to the cache."""
+        summarize, _ = _counting_summarizer()
+        cache = SummaryCache()
+        multi_profile_summarize(TEXT, [load_profile("phone")], summarizer=summarize,
+                                cache=cache, deadline=Deadline(timeout=0))
+        assert len(cache.memory) == 0
+
+    def test_uncacheable_summarizer_bypasses_cache(self):
+        """Test that summarizers without an identity are always called."""
+        cache = SummaryCache()
+        multi_profile_summarize(TEXT, [load_profile("phone")], summarizer=lambda t, n: t[:n],
+                                cache=cache)
+        assert len(cache.memory) == 0 and cache.stats.misses == 0
+
+    def test_shared_with_layered_summarize(self):
+        """Test that layered_summarize reads entries written by multi_profile_summarize."""
+        cache = SummaryCache()
+        profile = load_profile("laptop")
+        expected = multi_profile_summarize(TEXT, [profile], cache=cache)["laptop"]
+        target_chars = compute_budget(profile.width_px, profile.height_px,
+                                      font_size_px=profile.font_size_px,
+                                      editor_ruler_columns=profile.editor_ruler_columns,
+                                      buffer=profile.buffer)["target_chars"]
+        result = layered_summarize(TEXT, target_chars, list(expected), cache=cache)
+        assert result == expected
+        assert cache.stats.memory_hits == 3
+
+    def test_disk_tier_shared_between_processes(self, tmp_path):
+        """Test that another process reads what this one wrote."""
+        path = tmp_path / "cache.sqlite3"
+        cache = SummaryCache(path)
+        multi_profile_summarize(TEXT, [load_profile("phone")], cache=cache)
+        cache.close()
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(_summarize_in_worker, str(path)).result() == 3
+
+    def test_cli_cache(self, tmp_path):
+        """Test that a second CLI run is served from the on-disk cache."""
+        sample = tmp_path / "log.txt"
+        sample.write_text(TEXT, encoding="utf-8")
+        argv = ["summarize-multi", "--file", str(sample), "--profiles", "phone",
+                "--format", "compact", "--cache", str(tmp_path / "cache.sqlite3")]
+
+        outputs = []
+        for _ in range(2):
+            args = build_parser().parse_args(argv)
+            stdout, stderr = io.StringIO(), io.StringIO()
+            with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+                args.func(args)
+            outputs.append((stdout.getvalue(), stderr.getvalue()))
+
+        assert outputs[0][0] == outputs[1][0]
+        assert "cache: 0 hits" in outputs[0][1]
+        assert "cache: 3 hits (0 memory, 3 disk)" in outputs[1][1]
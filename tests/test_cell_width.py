@@ -0,0 +1,122 @@
+"""
+Tests for display-cell width measurement.
+"""
+
+import random
+import textwrap
+import unicodedata
+from io import StringIO
+
+import pytest
+from rich.console import Console
+
+from UI_UX import cell_width as cw
+from UI_UX.budget import naive_summarize
+from UI_UX.cell_width import cell_width, char_width, shorten_cells, truncate_cells
+from vision_ui.profiles import load_profile
+from vision_ui.segments import SegmentedText
+from vision_ui.triage import TriageBoard
+from vision_ui.wrap import wrapped_line_count
+
+CJK = "数据库副本延迟达到四十秒。读取已切换到主库。没有数据丢失。团队正在调查原因。"
+
+
+def _reference(text):
+    """Per-character widths straight from unicodedata."""
+    return sum(cw._codepoint_width(ord(c)) for c in text)
+
+
+class TestCellWidth:
+    """Test widths and the table lookup paths."""
+
+    def test_widths(self):
+        """Test narrow, wide, emoji and zero-width characters."""
+        assert cell_width("budget") == len("budget")
+        assert cell_width("漢字") == 4
+        assert cell_width("ｶﾀｶﾅ") == 4  # halfwidth katakana
+        assert cell_width("Ａ") == 2  # fullwidth Latin
+        assert cell_width("😀") == 2
+        assert cell_width("e\u0301") == 1  # combining acute accent
+        assert cell_width("a\u200bb") == 2  # zero-width space
+        assert cell_width("\u1100\u1161") == 2  # conjoining Hangul jamo
+        assert char_width("\u00ad") == 1  # soft hyphen
+
+    def test_lookup_paths_agree(self, monkeypatch):
+        """Test the loop and NumPy paths against unicodedata on random text."""
+        rng = random.Random(3)
+        ranges = [(0x20, 0x7E), (0xA0, 0x24F), (0x300, 0x36F), (0x3040, 0x30FF),
+                  (0x4E00, 0x9FFF), (0xAC00, 0xD7A3), (0x1F300, 0x1F64F), (0x20000, 0x2A6DF)]
+        texts = []
+        for _ in range(50):
+            chars = [chr(rng.randint(*rng.choice(ranges))) for _ in range(rng.randint(1, 300))]
+            texts.append("".join(chars))
+        for text in texts:
+            assert cell_width(text) == _reference(text)
+        monkeypatch.setattr(cw, "_NUMPY_AVAILABLE", False)
+        for text in texts:
+            assert cell_width(text) == _reference(text)
+
+    def test_blocks_shared(self):
+        """Test that identical table blocks are one object."""
+        cell_width("一丁" + chr(0x5000) + chr(0x6000))
+        assert cw._blocks[0x4E] is cw._blocks[0x50] is cw._blocks[0x60]
+
+    def test_matches_unicodedata(self):
+        """Test a few code points against their East Asian width property."""
+        for char in "가あ中！":
+            assert unicodedata.east_asian_width(char) in ("W", "F")
+            assert char_width(char) == 2
+
+
+class TestTruncation:
+    """Test cutting and shortening by cells."""
+
+    def test_truncate_ascii_matches_slicing(self):
+        """Test the ASCII behaviour TriageBoard relied on."""
+        text = "x" * 150
+        assert truncate_cells(text, 100) == text[:97] + "..."
+        assert truncate_cells("short", 100) == "short"
+
+    def test_truncate_wide(self):
+        """Test that wide characters are not split and marks stay attached."""
+        assert truncate_cells("漢字漢字漢字", 8) == "漢字..."
+        assert cell_width(truncate_cells(CJK, 21)) <= 21
+        assert truncate_cells("e\u0301" * 5, 4) == "e\u0301..."
+
+    @pytest.mark.parametrize("width", [8, 15, 30, 60])
+    def test_shorten(self, width):
+        """Test shortening against textwrap for ASCII and by cells otherwise."""
+        ascii_text = "Replica lag   reached forty seconds on the primary database."
+        assert shorten_cells(ascii_text, width) == textwrap.shorten(
+            ascii_text, width=width, placeholder="...")
+        mixed = "Replica 数据库 lag 延迟达到四十秒 on db-3"
+        shortened = shorten_cells(mixed, width)
+        assert cell_width(shortened) <= width
+        assert shorten_cells(CJK, width).startswith(CJK[:2])
+
+
+class TestCellBudgets:
+    """Test that budgets and displays count cells."""
+
+    @pytest.mark.parametrize("limit", [10, 25, 40, 80])
+    def test_summaries_fit_in_cells(self, limit):
+        """Test naive_summarize and the prefix index on CJK text."""
+        text = CJK.replace("。", ". ") * 3
+        summary = naive_summarize(text, limit)
+        assert cell_width(summary) <= limit
+        assert SegmentedText.from_text(text).summarize(limit) == summary
+
+    def test_wrap_counts_cells(self):
+        """Test that wide text takes twice the lines."""
+        assert wrapped_line_count("漢字 " * 20, 30) == 2 * wrapped_line_count("ab " * 20, 30)
+
+    def test_triage_length_column(self):
+        """Test that TriageBoard shows cell widths and truncates by cells."""
+        console = Console(file=StringIO(), width=200, color_system=None)
+        board = TriageBoard(console=console)
+        summary = CJK * 4
+        board.display_progressive([(load_profile("phone"), "headline", summary)],
+                                  [load_profile("phone")])
+        first = console.file.getvalue().splitlines()[0]
+        assert f"{cell_width(summary):>6} " in first
+        assert truncate_cells(summary, 100) in first
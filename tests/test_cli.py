@@ -221,6 +221,30 @@ class TestSummarizeMultiCLI:
             output = captured_output.getvalue()
             assert "phone.headline:" in output
             assert len(output) > 0
+    
+    def test_summarize_multi_progressive(self):
+        """Test that --progressive prints headlines before deep layers."""
+        content = "This is a test sentence. This is another test sentence. " * 10
+        temp_file = self.create_sample_file(content)
+        
+        try:
+            args = build_parser().parse_args([
+                'summarize-multi',
+                '--file', str(temp_file),
+                '--profiles', 'laptop,phone',
+                '--layers', 'deep,headline',
+                '--progressive'
+            ])
+            
+            captured_output = StringIO()
+            with patch('sys.stdout', captured_output):
+                cmd_summarize_multi(args)
+            
+            prefixes = [line.split(':')[0] for line in captured_output.getvalue().splitlines()]
+            assert prefixes == ['phone.headline', 'laptop.headline', 'phone.deep', 'laptop.deep']
+            
+        finally:
+            self.cleanup_sample_file(temp_file)
 
 
 class TestParser:
@@ -285,3 +309,10 @@ class TestParser:
         assert args.layers == 'headline,one_screen,deep'  # default
         assert args.persona is None  # default
         assert args.format == 'stacked'  # default
+
+    def test_profile_stub_lists_builtins(self, capsys):
+        """Test that the profile stub lists every built-in profile, token profiles included."""
+        args = build_parser().parse_args(['profile'])
+        with pytest.raises(SystemExit):
+            args.func(args)
+        assert "Available profiles: laptop, phone, prompt-8k, slides, tweet" in capsys.readouterr().err
@@ -0,0 +1,182 @@
+"""
+Tests for deadline-aware summarization.
+"""
+
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from vision_ui.cli import build_parser
+from vision_ui.deadline import DEADLINE_MARKER, CancellationToken, Deadline
+from vision_ui.ocr import OCRResult
+from vision_ui.profiles import load_profile
+from vision_ui.screenshot_handlers import screenshot_aware_summarize
+from vision_ui.summarize import multi_profile_summarize
+
+TEXT = "The canary stalled at ten percent. Error rates doubled on the new build. " * 30
+
+
+class TestDeadline:
+    """Test the Deadline and CancellationToken primitives."""
+
+    def test_remaining_and_expiry(self):
+        """Test that remaining time counts down on the supplied clock."""
+        now = [100.0]
+        deadline = Deadline(timeout=0.5, clock=lambda: now[0])
+        assert deadline.remaining() == 0.5
+        now[0] = 100.75
+        assert deadline.remaining() == 0.0
+        assert deadline.expired
+
+    def test_cancellation_expires(self):
+        """Test that a cancelled token expires a deadline without a time limit."""
+        token = CancellationToken()
+        deadline = Deadline(token=token)
+        assert deadline.remaining() is None and not deadline.expired
+        token.cancel()
+        assert deadline.expired
+
+    def test_resolve(self):
+        """Test argument resolution."""
+        assert Deadline.resolve() is None
+        assert Deadline.resolve(timeout=1.0).expires_at is not None
+        with pytest.raises(ValueError, match="either deadline or timeout"):
+            Deadline.resolve(Deadline(1.0), timeout=1.0)
+        with pytest.raises(ValueError, match="non-negative"):
+            Deadline.resolve(timeout=-1)
+
+
+class TestDeadlineSummarize:
+    """Test cooperative stopping in multi_profile_summarize."""
+
+    def test_no_deadline_pressure_is_unchanged(self):
+        """Test that a generous deadline changes nothing."""
+        profiles = [load_profile("phone"), load_profile("laptop")]
+        deadline = Deadline(timeout=60)
+        assert multi_profile_summarize(TEXT, profiles, deadline=deadline) == \
+            multi_profile_summarize(TEXT, profiles)
+        assert deadline.fallbacks == 0
+
+    def test_sequential_stops_and_falls_back(self):
+        """Test that calls stop after the deadline and the rest fall back with a marker."""
+        calls = []
+
+        def slow(text, char_limit):
+            calls.append(char_limit)
+            time.sleep(0.05)
+            return "model summary"
+
+        profiles = [load_profile("phone"), load_profile("laptop")]
+        deadline = Deadline(timeout=0.01)
+        result = multi_profile_summarize(TEXT, profiles, summarizer=slow, deadline=deadline)
+
+        assert len(calls) == 1
+        assert result["phone"]["headline"] == "model summary"  # cheapest call ran first
+        assert result["laptop"]["one_screen"].startswith(DEADLINE_MARKER)
+        assert result["laptop"]["deep"].startswith(DEADLINE_MARKER + "[hash:")
+        assert deadline.fallbacks == 5
+
+    def test_executor_returns_without_waiting_for_stragglers(self):
+        """Test that slow executor calls are abandoned at the deadline."""
+        release = threading.Event()
+
+        def stuck(text, char_limit):
+            if char_limit > 1000:  # everything but the headline
+                release.wait(2)
+            return "done"
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            start = time.perf_counter()
+            result = multi_profile_summarize(
+                TEXT, [load_profile("laptop")], summarizer=stuck,
+                executor=executor, timeout=0.05
+            )
+            elapsed = time.perf_counter() - start
+            release.set()
+
+        assert elapsed < 1.0
+        assert result["laptop"]["headline"] == "done"
+        assert result["laptop"]["deep"].startswith(DEADLINE_MARKER)
+
+    def test_queued_calls_cancelled(self):
+        """Test that calls still queued at the deadline never run."""
+        release = threading.Event()
+        calls = []
+
+        def stuck(text, char_limit):
+            calls.append(char_limit)
+            if len(calls) == 2:
+                release.wait(2)
+            return "done"
+
+        result = multi_profile_summarize(
+            TEXT, [load_profile("laptop")], summarizer=stuck, max_workers=1, timeout=0.05
+        )
+        release.set()
+        time.sleep(0.1)
+        assert len(calls) == 2
+        assert result["laptop"]["deep"].startswith(DEADLINE_MARKER)
+
+    def test_cancel_token(self):
+        """Test that cancelling from another thread stops the run."""
+        token = CancellationToken()
+
+        def cancelling(text, char_limit):
+            token.cancel()
+            return "first"
+
+        result = multi_profile_summarize(
+            TEXT, [load_profile("phone")], summarizer=cancelling, cancel_token=token
+        )
+        assert result["phone"]["headline"] == "first"
+        assert result["phone"]["one_screen"].startswith(DEADLINE_MARKER)
+
+
+class TestDeadlineScreenshot:
+    """Test deadlines across OCR and summarization."""
+
+    def test_ocr_gets_remaining_time(self):
+        """Test that the analyzer is called with the time left on the deadline."""
+        analyzer = MagicMock()
+        analyzer.analyze_screenshot.return_value = OCRResult(
+            full_text="Build 42 failed. Tests timed out.", regions=[],
+            image_info={'size': (800, 600)}, preprocessing_applied=[]
+        )
+        analyzer.estimate_text_density.return_value = 0.5
+
+        result = screenshot_aware_summarize(
+            "test.png", [load_profile("laptop")], ocr_analyzer=analyzer, timeout=5.0
+        )
+
+        timeout = analyzer.analyze_screenshot.call_args.kwargs["timeout"]
+        assert 0 < timeout <= 5.0
+        assert "Build 42 failed" in result["laptop"]["one_screen"]
+
+    def test_expired_before_ocr(self):
+        """Test that an already-expired deadline fails fast."""
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(TimeoutError):
+            screenshot_aware_summarize("test.png", [load_profile("laptop")],
+                                       ocr_analyzer=MagicMock(), cancel_token=token)
+
+    def test_cli_deadline_ms(self, tmp_path):
+        """Test that --deadline-ms is parsed and fallbacks are reported on stderr."""
+        sample = tmp_path / "log.txt"
+        sample.write_text(TEXT, encoding="utf-8")
+        args = build_parser().parse_args([
+            "summarize-multi", "--file", str(sample), "--profiles", "phone",
+            "--format", "compact", "--deadline-ms", "0",
+        ])
+        assert args.deadline_ms == 0
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+            args.func(args)
+
+        assert DEADLINE_MARKER in stdout.getvalue()
+        assert "deadline: 3 results fell back" in stderr.getvalue()
@@ -0,0 +1,209 @@
+"""
+Tests for near-duplicate detection and summary reuse.
+"""
+
+import json
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from vision_ui.dedup import SimHashIndex, _table_masks, hamming_distance, simhash
+from vision_ui.personas import PersonaRegistry
+from vision_ui.profiles import load_profile
+from vision_ui.summarize import multi_profile_summarize
+
+ALERT = (
+    "Replica lag on db-primary exceeded 30 seconds. The replication slot is falling behind. "
+    "Writes are still accepted but reads from replicas may be stale. On-call should check "
+    "the WAL sender and network throughput between zones. Dashboard shows sustained lag. "
+)
+
+
+class TestSimHash:
+    """Test fingerprinting."""
+
+    def test_identical_text_same_fingerprint(self):
+        """Test that fingerprints are deterministic."""
+        assert simhash(ALERT) == simhash(ALERT)
+
+    def test_near_duplicate_is_close(self):
+        """Test that a small edit moves the fingerprint only a few bits."""
+        edited = ALERT.replace("30 seconds", "45 seconds")
+        assert hamming_distance(simhash(ALERT), simhash(edited)) <= 6
+
+    def test_unrelated_text_is_far(self):
+        """Test that unrelated documents are far apart."""
+        other = "The quarterly design review covers typography, spacing and color tokens."
+        assert hamming_distance(simhash(ALERT), simhash(other)) > 10
+
+    def test_empty_text(self):
+        """Test that empty text fingerprints to zero."""
+        assert simhash("") == 0
+
+
+class TestSimHashIndex:
+    """Test the banded index."""
+
+    def test_lookup_within_threshold(self):
+        """Test that entries within the threshold are found."""
+        index = SimHashIndex(threshold=3)
+        index.add(0b1011 << 40, "key", "value")
+        assert index.lookup((0b1011 << 40) ^ 0b111, "key") == "value"
+        assert len(index) == 1
+
+    def test_lookup_beyond_threshold(self):
+        """Test that entries beyond the threshold are not found."""
+        index = SimHashIndex(threshold=3)
+        index.add(0, "key", "value")
+        assert index.lookup(0b1111, "key") is None
+
+    def test_key_must_match(self):
+        """Test that the exact-match key separates configurations."""
+        index = SimHashIndex()
+        index.add(12345, ("phone",), "phone result")
+        assert index.lookup(12345, ("laptop",)) is None
+        assert index.lookup(12345, ("phone",)) == "phone result"
+
+    def test_closest_entry_wins(self):
+        """Test that the nearest fingerprint is returned."""
+        index = SimHashIndex(threshold=4)
+        index.add(0b1111, "k", "far")
+        index.add(0b0001, "k", "near")
+        assert index.lookup(0, "k") == "near"
+
+    def test_invalid_threshold(self):
+        """Test that out-of-range thresholds and sizes are rejected."""
+        with pytest.raises(ValueError):
+            SimHashIndex(threshold=64)
+        with pytest.raises(ValueError, match="max_entries"):
+            SimHashIndex(max_entries=0)
+
+    def test_table_keys(self):
+        """Test that tables key on enough bits and cover every threshold-bit difference."""
+        masks = _table_masks(3, 1_000_000)
+        assert len(masks) == 10
+        assert min(bin(mask).count("1") for mask in masks) >= 21
+        rng = random.Random(2)
+        for _ in range(200):
+            flipped = 0
+            for bit in rng.sample(range(64), 3):
+                flipped |= 1 << bit
+            assert any(flipped & mask == 0 for mask in masks)
+
+    def test_oldest_entries_evicted(self):
+        """Test that the index keeps at most max_entries entries, dropping the oldest."""
+        index = SimHashIndex(threshold=0, max_entries=3)
+        for i in range(5):
+            index.add(i, "k", f"v{i}")
+        assert len(index) == 3
+        assert [index.lookup(i, "k") for i in range(5)] == [None, None, "v2", "v3", "v4"]
+        index.add(2, "k", "newer")
+        assert index.lookup(2, "k") == "newer"
+
+    @pytest.mark.parametrize("threshold", [0, 2, 3, 6])
+    def test_matches_linear_scan(self, threshold):
+        """Test lookups against a brute-force scan while entries are added and evicted."""
+        rng = random.Random(threshold)
+        index = SimHashIndex(threshold, max_entries=40)
+        stored = []
+        bases = [rng.getrandbits(64) for _ in range(5)]
+        for step in range(2000):
+            fingerprint = rng.choice(bases)
+            for _ in range(rng.randint(0, threshold + 2)):
+                fingerprint ^= 1 << rng.randrange(64)
+            key = rng.choice("ab")
+            if rng.random() < 0.5:
+                index.add(fingerprint, key, step)
+                stored = (stored + [(fingerprint, key, step)])[-40:]
+                continue
+            expected = None
+            best = threshold
+            for other, other_key, value in stored:  # later entries win ties
+                distance = hamming_distance(fingerprint, other)
+                if other_key == key and distance <= best:
+                    expected, best = value, distance
+            assert index.lookup(fingerprint, key) == expected
+
+
+class TestMultiProfileDedup:
+    """Test dedup integration with multi_profile_summarize."""
+
+    def test_near_duplicate_reuses_result(self):
+        """Test that a near-duplicate document skips summarization."""
+        calls = []
+
+        def counting_summarizer(text: str, char_limit: int) -> str:
+            calls.append(char_limit)
+            return text[:char_limit]
+
+        index = SimHashIndex(threshold=6)
+        profiles = [load_profile("phone")]
+        first = multi_profile_summarize(
+            ALERT, profiles, ["headline"], summarizer=counting_summarizer, dedup_index=index
+        )
+        call_count = len(calls)
+        second = multi_profile_summarize(
+            ALERT.replace("30 seconds", "45 seconds"), profiles, ["headline"],
+            summarizer=counting_summarizer, dedup_index=index
+        )
+
+        assert second == first
+        assert len(calls) == call_count
+
+    def test_different_layers_miss(self):
+        """Test that a different layer set is not served from the index."""
+        index = SimHashIndex()
+        profiles = [load_profile("phone")]
+        multi_profile_summarize(ALERT, profiles, ["headline"], dedup_index=index)
+        result = multi_profile_summarize(ALERT, profiles, ["one_screen"], dedup_index=index)
+        assert "one_screen" in result["phone"]
+
+    def test_force_recompute(self):
+        """Test that force_recompute bypasses the index."""
+        calls = []
+
+        def counting_summarizer(text: str, char_limit: int) -> str:
+            calls.append(char_limit)
+            return text[:char_limit]
+
+        index = SimHashIndex()
+        profiles = [load_profile("phone")]
+        multi_profile_summarize(ALERT, profiles, ["headline"], summarizer=counting_summarizer, dedup_index=index)
+        multi_profile_summarize(
+            ALERT, profiles, ["headline"], summarizer=counting_summarizer,
+            dedup_index=index, force_recompute=True
+        )
+        assert len(calls) == 2
+        assert len(index) == 2
+
+    def test_cached_result_is_a_copy(self):
+        """Test that mutating a returned result does not corrupt the index."""
+        index = SimHashIndex()
+        profiles = [load_profile("phone")]
+        first = multi_profile_summarize(ALERT, profiles, ["headline"], dedup_index=index)
+        first["phone"]["headline"] = "mutated"
+        second = multi_profile_summarize(ALERT, profiles, ["headline"], dedup_index=index)
+        assert second["phone"]["headline"] != "mutated"
+
+    def test_persona_edit_misses(self, tmp_path):
+        """Test that editing a persona file is not hidden by near-duplicate reuse."""
+        path = tmp_path / "oncall.json"
+
+        def write_persona(replacement):
+            path.write_text(json.dumps(
+                {"name": "oncall", "vocabulary_mappings": {"db": replacement}}), encoding="utf-8")
+
+        write_persona("database")
+        registry = PersonaRegistry(tmp_path, refresh_interval=0)
+        index = SimHashIndex()
+        with patch("vision_ui.personas._default_registry", registry):
+            first = multi_profile_summarize("The db is slow.", [load_profile("phone")],
+                                            ["headline"], persona="oncall", dedup_index=index)
+            write_persona("datastore")
+            os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+            second = multi_profile_summarize("The db is slow.", [load_profile("phone")],
+                                             ["headline"], persona="oncall", dedup_index=index)
+        assert "database" in first["phone"]["headline"]
+        assert "datastore" in second["phone"]["headline"]
@@ -0,0 +1,134 @@
+"""
+Tests for memory-mapped document indexes.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from vision_ui.cli import build_parser
+from vision_ui.docindex import (
+    MappedDocument,
+    build_index,
+    index_path_for,
+    load_or_build,
+    open_index,
+)
+from vision_ui.profiles import load_profile
+from vision_ui.segments import SegmentedText
+from vision_ui.summarize import multi_profile_summarize
+
+TEXT = ("Café  déjà vu on db-3.  Replica lag reached forty seconds.. Reads moved to the primary. "
+        * 40 + "Trailing clause without a period")
+
+
+def _summarize_mapped(path):
+    """Run in a child process: summarize straight from a mapped index."""
+    with open_index(path) as doc:
+        return multi_profile_summarize(doc, [load_profile("phone")])
+
+
+@pytest.fixture
+def doc(tmp_path):
+    doc = open_index(build_index(TEXT, tmp_path / "doc.vdx"))
+    yield doc
+    doc.close()
+
+
+class TestMappedDocument:
+    """Test that a mapped document matches in-memory segmentation."""
+
+    def test_matches_segmented_text(self, doc):
+        """Test sentences, prefix index, hashes and summaries against SegmentedText."""
+        segments = SegmentedText.from_text(TEXT)
+        assert list(doc.sentences) == segments.sentences
+        assert list(doc.prefix_lengths) == segments.prefix_lengths
+        assert doc.sentences[-1] == segments.sentences[-1]
+        assert (doc.digest, doc.content_hash) == (segments.digest, segments.content_hash)
+        for limit in (5, 40, 300, 5000, 10 ** 6):
+            assert doc.summarize(limit) == segments.summarize(limit)
+        assert doc.text == TEXT
+
+    def test_summaries_skip_full_decode(self, doc):
+        """Test that the default summarizer never decodes the whole text."""
+        multi_profile_summarize(doc, [load_profile("phone"), load_profile("laptop")])
+        assert "text" not in doc.__dict__ and "pieces" not in doc.__dict__
+
+    def test_multi_profile_matches_text_input(self, doc):
+        """Test identical output to summarizing the raw text, with and without a persona."""
+        profiles = [load_profile("phone"), load_profile("laptop")]
+        assert multi_profile_summarize(doc, profiles) == multi_profile_summarize(TEXT, profiles)
+        assert multi_profile_summarize(doc, profiles, persona="developer") == \
+            multi_profile_summarize(TEXT, profiles, persona="developer")
+
+    def test_term_lookup(self, doc):
+        """Test term-id queries over sentences."""
+        hits = doc.find("Replica", "lag")
+        assert len(hits) == 40
+        assert next(doc.matching_sentences("primary")) == "Reads moved to the primary"
+        assert doc.find("replica", "kubernetes") == []
+        assert doc.vocabulary["café"] == 0
+
+    def test_empty_document(self, tmp_path):
+        """Test that an empty document round-trips."""
+        with open_index(build_index("", tmp_path / "empty.vdx")) as doc:
+            assert doc.sentence_count == 0 and doc.summarize(100) == ""
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that non-index files are refused."""
+        path = tmp_path / "bogus.vdx"
+        path.write_bytes(b"not an index" * 10)
+        with pytest.raises(ValueError, match="document index"):
+            MappedDocument(path)
+
+    def test_shared_across_processes(self, tmp_path):
+        """Test that worker processes can map the same index."""
+        path = str(build_index(TEXT, tmp_path / "doc.vdx"))
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(_summarize_mapped, [path, path]))
+        assert results[0] == results[1] == multi_profile_summarize(TEXT, [load_profile("phone")])
+
+
+class TestLoadOrBuild:
+    """Test index freshness handling."""
+
+    def test_rebuilds_when_source_changes(self, tmp_path):
+        """Test that an index is reused until its source changes."""
+        source = tmp_path / "incident.log"
+        source.write_text(TEXT, encoding="utf-8")
+        with load_or_build(source) as doc:
+            assert doc.path == index_path_for(source)
+        built = os.stat(index_path_for(source)).st_mtime_ns
+
+        with load_or_build(source):
+            assert os.stat(index_path_for(source)).st_mtime_ns == built
+
+        source.write_text("Changed. Entirely.", encoding="utf-8")
+        with load_or_build(source) as doc:
+            assert list(doc.sentences) == ["Changed", "Entirely"]
+
+    def test_index_dir(self, tmp_path):
+        """Test that indexes can live in a separate directory."""
+        source = tmp_path / "a.txt"
+        source.write_text(TEXT, encoding="utf-8")
+        with load_or_build(source, tmp_path / "idx") as doc:
+            assert doc.path == tmp_path / "idx" / "a.txt.vdx"
+
+    def test_cli(self, tmp_path):
+        """Test 'vision-ui index' and summarize-multi --doc-index."""
+        source = tmp_path / "incident.log"
+        source.write_text(TEXT, encoding="utf-8")
+
+        def run(argv):
+            args = build_parser().parse_args(argv)
+            stdout = io.StringIO()
+            with patch("sys.stdout", stdout):
+                args.func(args)
+            return stdout.getvalue()
+
+        assert "sentences" in run(["index", str(source)])
+        argv = ["summarize-multi", "--file", str(source), "--profiles", "phone", "--format", "json"]
+        assert run(argv + ["--doc-index"]) == run(argv)
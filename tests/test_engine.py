@@ -0,0 +1,162 @@
+"""
+Tests for the reusable VisionEngine session object.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from vision_ui.cache import text_hash
+from vision_ui.engine import VisionEngine
+from vision_ui.ocr import OCRResult
+from vision_ui.personas import get_persona_registry
+from vision_ui.profiles import Profile, load_profile
+from vision_ui.redaction import Redactor
+from vision_ui.store import ResultStore
+from vision_ui.summarize import multi_profile_summarize
+
+TEXT = "Nightly export finished late. Two partitions were retried after throttling. " * 15
+
+
+def _analyzer(text="Queue is healthy. No alerts were raised overnight."):
+    analyzer = MagicMock()
+    analyzer.analyze_screenshot.side_effect = lambda path, **kwargs: OCRResult(
+        full_text=f"{text} Captured from {path.split('.')[0]}.", regions=[],
+        image_info={'size': (800, 600)}, preprocessing_applied=[]
+    )
+    analyzer.estimate_text_density.return_value = 0.5
+    return analyzer
+
+
+class TestResources:
+    """Test that the engine resolves shared state once."""
+
+    def test_profiles_loaded_once(self):
+        """Test that profile names are loaded from disk only once."""
+        engine = VisionEngine()
+        with patch("vision_ui.engine.load_profile", side_effect=load_profile) as loader:
+            first = engine.profiles("phone,laptop")
+            second = engine.profiles(["laptop", "phone"])
+        assert loader.call_count == 2
+        assert first[0] is second[1]
+
+    def test_profile_objects_pass_through(self):
+        """Test that Profile objects are used as given."""
+        custom = Profile("kiosk", 1080, 1920, 20)
+        assert VisionEngine().profiles(custom) == [custom]
+
+    def test_persona_resolved_through_registry(self):
+        """Test that personas come from the engine's registry."""
+        registry = MagicMock()
+        registry.get.return_value = None
+        VisionEngine(persona_registry=registry).summarize_text(TEXT, "phone", persona="developer")
+        registry.get.assert_called_once_with("developer")
+
+    def test_personas_option_resolved_through_registry(self):
+        """Test that names in a `personas=` option also come from the engine's registry."""
+        registry = MagicMock()
+        registry.get.side_effect = get_persona_registry().get
+        engine = VisionEngine(persona_registry=registry)
+        with patch("vision_ui.summarize.resolve_persona") as shared:
+            result = engine.summarize_text(TEXT, "phone", personas=["developer", "manager"])
+        assert shared.call_count == 0
+        assert [call.args for call in registry.get.call_args_list] == [("developer",), ("manager",)]
+        assert list(result) == ["developer", "manager"]
+
+    def test_budget_cached(self):
+        """Test that budgets are computed once per screen setup and returned as copies."""
+        engine = VisionEngine()
+        with patch("vision_ui.engine.profile_budget", return_value={"target_chars": 10}) as compute:
+            engine.budget("phone")
+            budget = engine.budget("phone")
+            budget["target_chars"] = 0
+        assert compute.call_count == 1
+        assert engine.budget("phone")["target_chars"] == 10
+
+    def test_tokenizer_loaded_lazily_once(self):
+        """Test that the tokenizer is only loaded when first needed."""
+        with patch("vision_ui.engine.get_tokenizer", return_value="tok") as loader:
+            engine = VisionEngine(model_name="gpt2")
+            assert loader.call_count == 0
+            assert engine.tokenizer == "tok"
+            assert engine.tokenizer == "tok"
+        loader.assert_called_once_with("gpt2")
+
+    def test_invalid_worker_count(self):
+        """Test that a zero-sized OCR pool is rejected."""
+        with pytest.raises(ValueError, match="ocr_workers"):
+            VisionEngine(ocr_workers=0)
+
+
+class TestSummarization:
+    """Test engine summarization methods."""
+
+    def test_summarize_text_matches_function(self):
+        """Test that engine output equals the module-level function."""
+        profiles = [load_profile("phone"), load_profile("laptop")]
+        result = VisionEngine().summarize_text(TEXT, "phone,laptop", persona="manager")
+        assert result == multi_profile_summarize(TEXT, profiles, persona="manager")
+
+    def test_result_cache_reused(self):
+        """Test that a repeated document is served from the engine's result cache."""
+        calls = []
+
+        def counting(text, char_limit):
+            calls.append(char_limit)
+            return text[:char_limit]
+
+        engine = VisionEngine(summarizer=counting, dedup_threshold=0)
+        first = engine.summarize_texts([TEXT, TEXT], "phone")
+        assert first[0] == first[1]
+        assert len(calls) == 3
+
+    def test_summarize_image_uses_shared_analyzer(self):
+        """Test that one analyzer is reused and inputs are redacted."""
+        analyzer = _analyzer("Alert sent to oncall@example.com.")
+        engine = VisionEngine(ocr_analyzer=analyzer, redactor=Redactor())
+        first = engine.summarize_image("a.png", "laptop")
+        engine.summarize_image("b.png", "laptop")
+
+        assert analyzer.analyze_screenshot.call_count == 2
+        assert "oncall@example.com" not in first["laptop"]["one_screen"]
+        assert first["_ocr_metadata"]["image_size"] == (800, 600)
+
+    def test_summarize_images_runs_ocr_in_pool(self):
+        """Test that batch OCR runs in worker threads and keeps input order."""
+        threads = set()
+        analyzer = _analyzer()
+        inner = analyzer.analyze_screenshot.side_effect
+
+        def tracking(path, **kwargs):
+            threads.add(threading.current_thread().name)
+            return inner(path, **kwargs)
+
+        analyzer.analyze_screenshot.side_effect = tracking
+        with VisionEngine(ocr_analyzer=analyzer, ocr_workers=2) as engine:
+            results = engine.summarize_images(["a.png", "b.png", "c.png"], "laptop", ["one_screen"])
+
+        assert all(name.startswith("vision-ocr") for name in threads)
+        assert [r["laptop"]["one_screen"].split()[-1] for r in results] == ["a.", "b.", "c."]
+        assert engine._ocr_pool is None
+
+    def test_summarize_images_deadline_bounds_ocr(self):
+        """Test that a batch timeout is passed on to every OCR call."""
+        analyzer = _analyzer()
+        with VisionEngine(ocr_analyzer=analyzer) as engine:
+            engine.summarize_images(["a.png", "b.png"], "laptop", ["headline"], timeout=30)
+        calls = analyzer.analyze_screenshot.call_args_list
+        timeouts = [call.kwargs.get("timeout") for call in calls]
+        assert len(timeouts) == 2 and all(0 < t <= 30 for t in timeouts)
+
+    def test_image_runs_recorded_by_file_hash(self, tmp_path):
+        """Test that image runs are recorded under the image file's hash, as the CLI does."""
+        image = tmp_path / "a.png"
+        image.write_bytes(b"not really a png")
+        store = ResultStore(tmp_path / "results.sqlite3")
+        engine = VisionEngine(ocr_analyzer=_analyzer(), store=store)
+        engine.summarize_image(str(image), "laptop", ["one_screen"])
+        engine.summarize_images([str(image)], "laptop", ["one_screen"])
+        hits = store.search("healthy")
+        assert len(hits) == 2
+        assert {hit.doc_hash for hit in hits} == {text_hash(image.read_bytes())}
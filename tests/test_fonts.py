@@ -0,0 +1,158 @@
+"""
+Tests for font glyph width tables and font-aware budgets.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from UI_UX.budget import compute_budget
+from UI_UX.budget_table import BudgetTable
+from vision_ui import fonts
+from vision_ui.fonts import FontMetrics, load_font_metrics
+from vision_ui.profiles import Profile, fit_profile, load_profile
+from vision_ui.wrap import WrapFitter, wrapped_line_count
+
+FONT = Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+
+pytestmark = pytest.mark.skipif(
+    not fonts._PIL_AVAILABLE or not FONT.exists(), reason="needs Pillow and DejaVu Sans"
+)
+
+
+@pytest.fixture(autouse=True)
+def font_cache(tmp_path, monkeypatch):
+    """Keep width tables out of the user's cache and start every test unmemoized."""
+    monkeypatch.setattr(fonts, "default_font_cache_dir", lambda: tmp_path)
+    monkeypatch.setattr(fonts, "_metrics", {})
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    return load_font_metrics(FONT, 14, cache_dir=tmp_path)
+
+
+class TestFontMetrics:
+    """Test width tables against Pillow."""
+
+    def test_matches_pillow(self, metrics):
+        """Test per-character and per-text widths."""
+        from PIL import ImageFont
+
+        font = ImageFont.truetype(str(FONT), 14)
+        for char in "aWi .€漢":
+            assert metrics.char_width(char) == pytest.approx(font.getlength(char))
+        text = "Replica lag reached 40 seconds on db-3"
+        expected = sum(font.getlength(c) for c in text)
+        assert metrics.text_width(text) == pytest.approx(expected, rel=1e-6)
+        assert metrics.text_width(text[:10]) == pytest.approx(
+            sum(font.getlength(c) for c in text[:10]), rel=1e-6)
+
+    def test_proportional_font(self, metrics):
+        """Test that a proportional font is narrower than the 0.55 heuristic for prose."""
+        assert metrics.char_width("i") < metrics.char_width("W")
+        assert 0 < metrics.avg_char_width_px < 14 * 0.55
+
+    def test_disk_cache(self, tmp_path, metrics, monkeypatch):
+        """Test that measured blocks are written and read back without measuring again."""
+        width = metrics.text_width("Replica lag 漢字")
+        assert len(list(tmp_path.glob("*.gw"))) == 1
+        fonts._metrics.clear()
+        monkeypatch.setattr(fonts, "_measure_block", None)  # measuring again would fail
+        reloaded = load_font_metrics(FONT, 14, cache_dir=tmp_path)
+        assert reloaded.text_width("Replica lag 漢字") == width
+
+    def test_corrupt_cache_rebuilt(self, tmp_path, metrics):
+        """Test that an unreadable table is rebuilt."""
+        width = metrics.text_width("Replica lag")
+        cache_file = next(tmp_path.glob("*.gw"))
+        cache_file.write_bytes(b"junk")
+        fonts._metrics.clear()
+        assert load_font_metrics(FONT, 14, cache_dir=tmp_path).text_width("Replica lag") == width
+
+    def test_blocks_measured_lazily(self, metrics, monkeypatch):
+        """Test that loading measures nothing and text measures only the blocks it uses."""
+        measured = []
+        measure_block = fonts._measure_block
+        monkeypatch.setattr(fonts, "_measure_block",
+                            lambda font, index: measured.append(index) or measure_block(font, index))
+        assert measured == []
+        metrics.text_width("plain ASCII, then 漢 and \U0001F600")
+        assert sorted(measured) == [0x00, 0x6F, 0xFF]
+        metrics.text_width("more ASCII")
+        assert metrics.char_width("漢") > 0
+        assert len(measured) == 3
+
+    def test_lone_surrogates(self, metrics):
+        """Test that lone surrogates measure as zero width on both paths."""
+        text = "Replica lag reached 40 seconds"
+        assert metrics.text_width(text + "\ud800") == pytest.approx(metrics.text_width(text))
+        assert metrics.text_width("ab\udfff") == pytest.approx(metrics.text_width("ab"))
+
+
+class TestFontProfiles:
+    """Test profiles that name a font."""
+
+    def test_budget_uses_font(self, metrics):
+        """Test that BudgetTable and compute_budget agree for font profiles."""
+        profile = Profile("mono-free", 375, 667, 14, None, 0.9, font=str(FONT))
+        assert profile.avg_char_width_px == metrics.avg_char_width_px
+        expected = compute_budget(375, 667, 14, avg_char_width_px=metrics.avg_char_width_px,
+                                  editor_ruler_columns=None, buffer=0.9)
+        table = BudgetTable.for_profiles([profile, load_profile("phone")])
+        assert table.target_chars[0] == expected["target_chars"]
+        assert table.columns[0] > compute_budget(375, 667, 14, editor_ruler_columns=None)["columns"]
+
+    def test_profile_file_relative_font(self, tmp_path):
+        """Test that a profile file's font path is relative to the file."""
+        (tmp_path / "fonts").mkdir()
+        (tmp_path / "fonts" / FONT.name).write_bytes(FONT.read_bytes())
+        path = tmp_path / "kiosk.json"
+        path.write_text(json.dumps({"name": "kiosk", "width_px": 800, "height_px": 480,
+                                    "font": f"fonts/{FONT.name}"}), encoding="utf-8")
+        profile = load_profile(path)
+        assert Path(profile.font) == tmp_path / "fonts" / FONT.name
+        assert profile.to_dict()["font"] == profile.font
+        assert "font" not in load_profile("phone").to_dict()
+
+    def test_fit_profile_width(self):
+        """Test that solved widths are tight with the measured char width."""
+        profile = Profile("narrow", 375, 667, 14, None, 0.9, font=str(FONT))
+        fitted = fit_profile(profile, "width", 3000)
+        avg = profile.avg_char_width_px
+
+        def target(width):
+            return compute_budget(width, 667, 14, avg_char_width_px=avg,
+                                  editor_ruler_columns=None, buffer=0.9)["target_chars"]
+
+        assert target(fitted.width_px) >= 3000 > target(fitted.width_px - 1)
+
+
+class TestFontWrap:
+    """Test wrapping by measured widths."""
+
+    def test_wide_glyphs_take_more_lines(self, metrics):
+        """Test that text of wide glyphs wraps sooner than narrow text."""
+        narrow = " ".join(["illicit"] * 40)
+        wide = " ".join(["MWMWMWM"] * 40)
+        assert wrapped_line_count(narrow, 40) == wrapped_line_count(wide, 40)
+        assert wrapped_line_count(wide, 40, metrics) > wrapped_line_count(narrow, 40, metrics)
+
+    def test_fit_with_font(self, metrics):
+        """Test that fitted summaries fit by measured width."""
+        summary = "WIDE WORDS MAKE MORE LINES. Narrow ones less. Final sentence here."
+        fitter = WrapFitter()
+        fitted = fitter.fit(summary, 20, 2, font=metrics)
+        assert fitter.fits(fitted, 20, 2, font=metrics)
+        assert summary.startswith(fitted.rstrip("."))
+        assert len(fitted) < len(summary)
+
+    def test_metrics_without_table_file(self):
+        """Test FontMetrics on a synthetic table."""
+        from array import array
+
+        widths = array("f", [10.0]) * fonts.TABLE_SIZE
+        table = FontMetrics(widths, 10)
+        assert table.text_width("abc" * 10) == 300
+        assert table.char_width("\U0001F600") == 10
@@ -2,12 +2,21 @@
 Tests for multi-profile summarization functionality.
 """
 
+import textwrap
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import pytest
 
 from vision_ui.layered_summarizer import DEFAULT_LAYERS, layered_summarize
 from vision_ui.personas import BUILTIN_PERSONAS, Persona
-from vision_ui.profiles import load_profile
-from vision_ui.summarize import format_multi_profile_output, multi_profile_summarize
+from vision_ui.profiles import Profile, load_profile
+from vision_ui.summarize import (
+    format_multi_profile_output,
+    iter_multi_profile_summarize,
+    multi_profile_summarize,
+)
 
 
 class TestLayeredSummarize:
@@ -280,6 +289,146 @@ class TestFormatOutput:
         assert "laptop.headline: Laptop headline" in lines
 
 
+class TestProgressiveSummarize:
+    """Test the cheapest-first generator API."""
+    
+    TEXT = "Deploy failed on node seven. Rolled back to the previous build. " * 40
+    
+    def test_matches_multi_profile_summarize(self):
+        """Test that collected results equal the batch API."""
+        profiles = [load_profile("laptop"), load_profile("phone"), load_profile("tweet")]
+        layers = ["headline", "one_screen", "deep"]
+        
+        collected = {}
+        for profile, layer, summary in iter_multi_profile_summarize(
+            self.TEXT, profiles, layers, persona="developer"
+        ):
+            collected.setdefault(profile.name, {})[layer] = summary
+        
+        expected = multi_profile_summarize(self.TEXT, profiles, layers, persona="developer")
+        assert collected == expected
+    
+    def test_cheapest_first_order(self):
+        """Test that every headline precedes deep layers and budgets grow within a layer."""
+        profiles = [load_profile("laptop"), load_profile("phone")]
+        order = [
+            (profile.name, layer)
+            for profile, layer, _ in iter_multi_profile_summarize(
+                self.TEXT, profiles, ["deep", "headline"]
+            )
+        ]
+        assert order == [
+            ("phone", "headline"), ("laptop", "headline"),
+            ("phone", "deep"), ("laptop", "deep"),
+        ]
+    
+    def test_yields_before_all_work_is_done(self):
+        """Test that the first result arrives after a single summarizer call."""
+        calls = []
+        
+        def counting(text, char_limit):
+            calls.append(char_limit)
+            return text[:char_limit]
+        
+        results = iter_multi_profile_summarize(
+            self.TEXT, [load_profile("phone"), load_profile("laptop")],
+            summarizer=counting
+        )
+        next(results)
+        assert len(calls) == 1
+    
+    def test_invalid_layer_raises(self):
+        """Test that unknown layers are rejected before any work."""
+        with pytest.raises(ValueError, match="Unknown layer"):
+            next(iter_multi_profile_summarize(self.TEXT, [load_profile("phone")], ["nope"]))
+
+
+class TestParallelExecution:
+    """Test fanning summarizer calls out to executors."""
+    
+    TEXT = "Queue depth rose past the alert line. Workers were scaled from four to twelve. " * 20
+    PROFILES = ["phone", "laptop", "tweet", "slides"]
+    
+    def _profiles(self):
+        return [load_profile(name) for name in self.PROFILES]
+    
+    def test_thread_pool_matches_sequential(self):
+        """Test that output and its ordering are unchanged with a thread pool."""
+        expected = multi_profile_summarize(self.TEXT, self._profiles(), persona="designer",
+                                           summarizer=textwrap.shorten)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            result = multi_profile_summarize(self.TEXT, self._profiles(), persona="designer",
+                                             summarizer=textwrap.shorten, executor=executor)
+        assert result == expected
+        assert list(result) == self.PROFILES
+        assert all(list(layers) == ["headline", "one_screen", "deep"] for layers in result.values())
+    
+    def test_process_pool_matches_sequential(self):
+        """Test that a picklable summarizer runs in a process pool with the same output."""
+        expected = multi_profile_summarize(self.TEXT, self._profiles(), summarizer=textwrap.shorten)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = multi_profile_summarize(self.TEXT, self._profiles(),
+                                             summarizer=textwrap.shorten, executor=executor)
+        assert result == expected
+    
+    def test_max_workers_overlaps_slow_calls(self):
+        """Test that slow summarizers overlap instead of running back to back."""
+        threads = set()
+        
+        def slow(text, char_limit):
+            threads.add(threading.get_ident())
+            time.sleep(0.02)
+            return text[:char_limit]
+        
+        start = time.perf_counter()
+        multi_profile_summarize(self.TEXT, self._profiles(), summarizer=slow, max_workers=12)
+        elapsed = time.perf_counter() - start
+        
+        assert len(threads) > 1
+        assert elapsed < 0.02 * 12 / 2  # 12 sequential calls take at least 0.24s
+    
+    def test_executor_and_max_workers_are_exclusive(self):
+        """Test that passing both is rejected."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(ValueError, match="either executor or max_workers"):
+                multi_profile_summarize(self.TEXT, self._profiles(), executor=executor, max_workers=2)
+
+
+class TestSharedBudgets:
+    """Test that profiles with equal effective budgets share work."""
+    
+    TEXT = "Replica lag hit nine seconds. Reads were pinned to the primary. " * 20
+    
+    def test_equal_budgets_call_summarizer_once(self):
+        """Test that identical budgets are summarized once and results shared."""
+        calls = []
+        
+        def counting(text, char_limit):
+            calls.append(char_limit)
+            return text[:char_limit]
+        
+        base = load_profile("phone")
+        twins = [
+            Profile(f"phone_{i}", base.width_px, base.height_px, base.font_size_px,
+                    base.editor_ruler_columns, base.buffer)
+            for i in range(5)
+        ]
+        result = multi_profile_summarize(self.TEXT, [base] + twins + [load_profile("laptop")],
+                                         summarizer=counting)
+        
+        assert len(calls) == 2 * 3  # two distinct budgets, three layers each
+        assert all(result[twin.name] == result["phone"] for twin in twins)
+        assert result["laptop"] != result["phone"]
+    
+    def test_shared_budgets_keep_persona_output(self):
+        """Test that shared results match an unshared run with persona post-processing."""
+        laptop = load_profile("laptop")
+        copy = Profile("laptop_copy", laptop.width_px, laptop.height_px, laptop.font_size_px)
+        result = multi_profile_summarize(self.TEXT, [laptop, copy], persona="manager")
+        single = multi_profile_summarize(self.TEXT, [laptop], persona="manager")
+        assert result["laptop"] == result["laptop_copy"] == single["laptop"]
+
+
 class TestLayerConfig:
     """Test layer configuration."""
     
@@ -0,0 +1,122 @@
+"""
+Tests for the streaming text normalizer.
+"""
+
+import io
+from unittest.mock import patch
+
+import pytest
+
+from vision_ui.cli import build_parser
+from vision_ui.normalize import TextNormalizer, normalize_text
+from vision_ui.profiles import load_profile
+from vision_ui.summarize import multi_profile_summarize
+
+
+class TestStages:
+    """Test individual normalization behaviours."""
+
+    def test_strips_ansi_codes(self):
+        """Test that color and cursor escape codes are removed."""
+        text = "\x1b[31mERROR\x1b[0m build failed\x1b[2K"
+        assert normalize_text(text) == "ERROR build failed"
+
+    def test_strips_control_and_carriage_returns(self):
+        """Test that progress-bar redraws keep only the final segment."""
+        text = "progress 10%\rprogress 50%\rprogress 100%\x07"
+        assert normalize_text(text) == "progress 100%"
+
+    def test_unifies_punctuation(self):
+        """Test that typographic punctuation is mapped to ASCII."""
+        text = "“Quoted” — it’s done…"
+        assert normalize_text(text) == "\"Quoted\" - it's done..."
+
+    def test_collapses_whitespace_and_blank_runs(self):
+        """Test that space runs and blank-line runs collapse."""
+        text = "\n\nfirst   line\t\there\n\n\n\nsecond line\n"
+        assert normalize_text(text) == "first line here\n\nsecond line"
+
+    def test_drops_duplicate_lines_and_sentences(self):
+        """Test that repeated lines and sentences are removed."""
+        text = "Disk full. Retrying.\nDisk full. Retrying.\nRetrying. Giving up."
+        assert normalize_text(text) == "Disk full. Retrying.\nGiving up."
+
+    def test_custom_stage_selection(self):
+        """Test that only the requested stages run."""
+        normalizer = TextNormalizer(stages=["strip_ansi"])
+        assert normalizer.normalize("\x1b[1ma  b\x1b[0m") == "a  b"
+
+    def test_unknown_stage(self):
+        """Test that unknown stage names are rejected."""
+        with pytest.raises(ValueError, match="Unknown normalization stage"):
+            TextNormalizer(stages=["nope"])
+
+
+class TestReport:
+    """Test byte accounting."""
+
+    def test_report_tracks_each_stage(self):
+        """Test that every stage reports bytes in and out."""
+        normalizer = TextNormalizer()
+        normalizer.normalize("\x1b[32mok\x1b[0m\nok\n\n\n")
+        report = normalizer.last_report
+
+        assert [s.name for s in report.stages][0] == "strip_ansi"
+        assert report.stages[0].bytes_saved == len("\x1b[32m\x1b[0m")
+        assert report.bytes_out < report.bytes_in
+        assert 0.0 < report.reduction < 1.0
+        assert "strip_ansi" in report.format()
+
+    def test_streaming_lines(self):
+        """Test that file-like input is processed line by line."""
+        stream = io.StringIO("alpha\nalpha\nbeta\n")
+        normalizer = TextNormalizer()
+        assert list(normalizer.iter_lines(stream)) == ["alpha", "beta"]
+        assert normalizer.last_report.stages[-2].lines_dropped == 1
+
+    def test_interleaved_runs(self):
+        """Test that runs in progress at the same time keep separate stage state."""
+        normalizer = TextNormalizer()
+        first = normalizer.iter_lines(["alpha", "beta", "alpha"])
+        second = normalizer.iter_lines(["beta", "alpha", "beta"])
+        assert [next(first), next(second), next(first), next(second)] == [
+            "alpha", "beta", "beta", "alpha"
+        ]
+        assert list(first) == [] and list(second) == []
+
+
+class TestIntegration:
+    """Test normalizer wiring into summarization and the CLI."""
+
+    def test_multi_profile_summarize_uses_normalizer(self):
+        """Test that escape codes never reach the summarizer."""
+        seen = []
+
+        def capture(text: str, char_limit: int) -> str:
+            seen.append(text)
+            return text[:char_limit]
+
+        normalizer = TextNormalizer()
+        multi_profile_summarize(
+            "\x1b[31mfailed\x1b[0m\n\n\nfailed", [load_profile("phone")], ["headline"],
+            summarizer=capture, normalizer=normalizer
+        )
+        assert seen == ["failed"]
+        assert normalizer.last_report.bytes_in > normalizer.last_report.bytes_out
+
+    def test_cli_normalize_reports_to_stderr(self, tmp_path):
+        """Test that --normalize prints the byte report on stderr only."""
+        sample = tmp_path / "log.txt"
+        sample.write_text("\x1b[33mwarn\x1b[0m disk at 91%.\n" * 5, encoding="utf-8")
+        args = build_parser().parse_args([
+            "summarize-multi", "--file", str(sample), "--profiles", "phone",
+            "--layers", "headline", "--format", "compact", "--normalize",
+        ])
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+            args.func(args)
+
+        assert "\x1b" not in stdout.getvalue()
+        assert "normalize:" in stderr.getvalue()
+        assert "normalize:" not in stdout.getvalue()
@@ -0,0 +1,185 @@
+"""
+Tests for compiled persona vocabulary rewriting and the persona registry.
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import vision_ui.personas as personas_module
+from vision_ui.personas import (
+    BUILTIN_PERSONAS,
+    CompiledPersona,
+    Persona,
+    PersonaRegistry,
+    VocabularyMatcher,
+    _calculate_persona_overhead,
+    compile_vocabulary,
+)
+from vision_ui.profiles import load_profile
+from vision_ui.summarize import multi_profile_summarize
+
+
+class TestVocabularyMatcher:
+    """Test the single-pass vocabulary matcher."""
+
+    def test_whole_words_only(self):
+        """Test that terms inside larger words are left alone."""
+        matcher = VocabularyMatcher({"user": "end-user"})
+        assert matcher.sub("The user changed the username.") == "The end-user changed the username."
+
+    def test_substring_mode(self):
+        """Test that whole_words=False keeps substring replacement available."""
+        matcher = VocabularyMatcher({"user": "end-user"}, whole_words=False)
+        assert matcher.sub("username") == "end-username"
+
+    def test_single_pass_does_not_chain(self):
+        """Test that replacements are not themselves rewritten."""
+        matcher = VocabularyMatcher({"problem": "issue", "issue": "ticket"})
+        assert matcher.sub("problem and issue") == "issue and ticket"
+
+    def test_longest_key_wins(self):
+        """Test that overlapping keys prefer the longest match."""
+        matcher = VocabularyMatcher({"code": "interface", "code review": "design critique"})
+        assert matcher.sub("code review of the code") == "design critique of the interface"
+
+    def test_keys_with_punctuation(self):
+        """Test that regex metacharacters in keys are escaped."""
+        matcher = VocabularyMatcher({"C++": "native code", "e.g.": "for example"})
+        assert matcher.sub("Use C++, e.g. for speed") == "Use native code, for example for speed"
+
+    def test_empty_mappings(self):
+        """Test that an empty mapping is a no-op."""
+        assert VocabularyMatcher({}).sub("unchanged") == "unchanged"
+
+    def test_many_mappings(self):
+        """Test a large custom vocabulary."""
+        mappings = {f"term{i}": f"word{i}" for i in range(500)}
+        matcher = VocabularyMatcher(mappings)
+        assert matcher.sub("term7 term499 term5000") == "word7 word499 term5000"
+
+    def test_compile_is_cached(self):
+        """Test that equal mappings share one compiled matcher."""
+        assert compile_vocabulary({"a": "b"}) is compile_vocabulary({"a": "b"})
+
+
+class TestPersonaVocabulary:
+    """Test Persona integration."""
+
+    def test_apply_uses_whole_words(self):
+        """Test that Persona.apply no longer rewrites inside words."""
+        persona = Persona(name="dev", vocabulary_mappings={"fix": "resolve"})
+        assert persona.apply("fix the prefix") == "resolve the prefix"
+
+    def test_persona_substring_opt_in(self):
+        """Test that personas can opt back into substring matching."""
+        persona = Persona(name="dev", vocabulary_mappings={"fix": "resolve"}, whole_words=False)
+        assert persona.apply_vocabulary("prefix") == "preresolve"
+
+
+def _write_persona(directory: Path, name: str, **fields) -> Path:
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps({"name": name, **fields}), encoding="utf-8")
+    return path
+
+
+class TestPersonaRegistry:
+    """Test the file-backed persona registry."""
+
+    def test_builtins_available(self, tmp_path):
+        """Test that built-in personas resolve precompiled."""
+        registry = PersonaRegistry(tmp_path)
+        compiled = registry.get("developer")
+        assert isinstance(compiled, CompiledPersona)
+        assert compiled.persona is BUILTIN_PERSONAS["developer"]
+        assert compiled.overhead == _calculate_persona_overhead(BUILTIN_PERSONAS["developer"])
+
+    def test_loads_directory(self, tmp_path):
+        """Test that JSON persona files are loaded and compiled."""
+        _write_persona(tmp_path, "oncall", vocabulary_mappings={"db": "database"},
+                       context_prefix="On-call view:")
+        registry = PersonaRegistry(tmp_path)
+        compiled = registry.get("oncall")
+        assert compiled.apply_vocabulary("db is down") == "database is down"
+        assert compiled.context == "On-call view:"
+        assert "oncall" in registry.names()
+
+    def test_name_defaults_to_stem(self, tmp_path):
+        """Test that files without a name use the filename."""
+        (tmp_path / "sre.json").write_text(json.dumps({"context_prefix": "SRE:"}), encoding="utf-8")
+        assert PersonaRegistry(tmp_path).get("sre").persona.name == "sre"
+
+    def test_reloads_only_changed_files(self, tmp_path):
+        """Test that unchanged files are not re-parsed on refresh."""
+        _write_persona(tmp_path, "a", context_prefix="A")
+        path_b = _write_persona(tmp_path, "b", context_prefix="B")
+        registry = PersonaRegistry(tmp_path, refresh_interval=0)
+        registry.refresh()
+
+        path_b.write_text(json.dumps({"name": "b", "context_prefix": "B2"}), encoding="utf-8")
+        stat = path_b.stat()
+        os.utime(path_b, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        with patch("vision_ui.personas._load_persona_file", wraps=personas_module._load_persona_file) as load:
+            assert registry.get("b").context == "B2"
+            registry.get("a")
+        assert [call.args[0].name for call in load.call_args_list] == ["b.json"]
+
+    def test_removed_file_is_dropped(self, tmp_path):
+        """Test that deleting a file removes its persona."""
+        path = _write_persona(tmp_path, "temp", context_prefix="T")
+        registry = PersonaRegistry(tmp_path, refresh_interval=0)
+        assert "temp" in registry
+        path.unlink()
+        with pytest.raises(ValueError, match="Unknown persona"):
+            registry.get("temp")
+
+    def test_refresh_interval_limits_scans(self, tmp_path):
+        """Test that lookups within the interval skip the directory scan."""
+        registry = PersonaRegistry(tmp_path, refresh_interval=3600)
+        registry.get("developer")
+        _write_persona(tmp_path, "late", context_prefix="L")
+        assert "late" not in registry.names()
+        registry.refresh(force=True)
+        assert "late" in registry.names()
+
+    def test_file_overrides_builtin(self, tmp_path):
+        """Test that a file persona can replace a built-in one."""
+        _write_persona(tmp_path, "manager", context_prefix="Custom manager view:")
+        assert PersonaRegistry(tmp_path).get("manager").context == "Custom manager view:"
+
+    def test_invalid_file(self, tmp_path):
+        """Test that a malformed persona file is reported without breaking other personas."""
+        (tmp_path / "broken.json").write_text("{not json", encoding="utf-8")
+        _write_persona(tmp_path, "oncall", context_prefix="On call:")
+        registry = PersonaRegistry(tmp_path, refresh_interval=0)
+        assert registry.get("developer").name == "developer"
+        assert registry.get("oncall").context == "On call:"
+        assert "Invalid persona file" in registry.errors[tmp_path / "broken.json"]
+        with pytest.raises(ValueError, match="Unknown persona: broken"):
+            registry.get("broken")
+
+    def test_invalid_edit_keeps_last_good_version(self, tmp_path):
+        """Test that a half-written edit keeps serving the previous version."""
+        path = _write_persona(tmp_path, "oncall", context_prefix="On call:")
+        registry = PersonaRegistry(tmp_path, refresh_interval=0)
+        assert registry.get("oncall").context == "On call:"
+        path.write_text('{"name": "oncall", "context_pre', encoding="utf-8")
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        assert registry.get("oncall").context == "On call:"
+        assert path in registry.errors
+        _write_persona(tmp_path, "oncall", context_prefix="Fixed:")
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert registry.get("oncall").context == "Fixed:"
+        assert registry.errors == {}
+
+    def test_multi_profile_uses_registry(self, tmp_path):
+        """Test that directory personas work in multi_profile_summarize."""
+        _write_persona(tmp_path, "oncall", vocabulary_mappings={"db": "database"})
+        with patch("vision_ui.personas._default_registry", PersonaRegistry(tmp_path)):
+            result = multi_profile_summarize("The db is slow.", [load_profile("phone")], ["headline"],
+                                             persona="oncall")
+        assert "database" in result["phone"]["headline"]
@@ -0,0 +1,216 @@
+"""
+Tests for profile packs and profile selectors.
+"""
+
+import json
+import threading
+
+import pytest
+
+import vision_ui.profiles as profiles_module
+from vision_ui.cli import main
+from vision_ui.profile_pack import ProfilePack, build_profile_pack
+from vision_ui.profiles import Profile, ProfileRegistry, load_profile, parse_profiles_from_cli
+
+
+def _device(i):
+    tags = ["android" if i % 2 else "ios"]
+    if i % 5 == 0:
+        tags.append("tablet")
+    return {"name": f"device-{i:04d}", "width_px": 320 + i, "height_px": 640, "tags": tags}
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    return build_profile_pack([_device(i) for i in range(500)], tmp_path / "devices.vpk")
+
+
+@pytest.fixture
+def profile_dir(tmp_path, pack_path, monkeypatch):
+    """A profile directory holding the pack and one tagged JSON profile."""
+    (tmp_path / "kiosk.json").write_text(json.dumps(
+        {"name": "kiosk", "width_px": 800, "height_px": 480, "tags": ["android"]}
+    ), encoding="utf-8")
+    monkeypatch.setattr(profiles_module, "get_profile_dir", lambda: tmp_path)
+    return tmp_path
+
+
+class TestProfilePack:
+    """Test building and reading packs."""
+
+    def test_lookup(self, pack_path):
+        """Test that every profile is found by name and others are not."""
+        with ProfilePack(pack_path) as pack:
+            assert len(pack) == 500
+            for i in range(500):
+                assert pack.get(f"device-{i:04d}") == _device(i)
+            assert pack.get("device-9999") is None
+            assert "device-0007" in pack and "laptop" not in pack
+            assert pack.names == [f"device-{i:04d}" for i in range(500)]
+
+    def test_tags(self, pack_path):
+        """Test the tag index."""
+        with ProfilePack(pack_path) as pack:
+            assert pack.tagged("tablet") == [f"device-{i:04d}" for i in range(0, 500, 5)]
+            assert len(pack.tagged("android")) == 250
+            assert pack.tagged("watch") == []
+
+    def test_profile_objects_and_empty_pack(self, tmp_path):
+        """Test packing Profile objects and an empty list."""
+        path = build_profile_pack([Profile("p", 400, 800, tags=["x"])], tmp_path / "one.vpk")
+        with ProfilePack(path) as pack:
+            assert pack.get("p")["tags"] == ["x"]
+        with ProfilePack(build_profile_pack([], tmp_path / "empty.vpk")) as pack:
+            assert len(pack) == 0 and pack.get("p") is None and pack.tags == {}
+
+    def test_invalid(self, tmp_path):
+        """Test duplicate names and files that are not packs."""
+        with pytest.raises(ValueError, match="Duplicate profile name in pack: a"):
+            build_profile_pack([{"name": "a"}, {"name": "a"}], tmp_path / "dup.vpk")
+        with pytest.raises(ValueError, match="needs a name"):
+            build_profile_pack([{"width_px": 1}], tmp_path / "anon.vpk")
+        for content in (b"", b"junk", b"JUNK" + bytes(28)):
+            path = tmp_path / "bad.vpk"
+            path.write_bytes(content)
+            with pytest.raises(ValueError, match="profile pack"):
+                ProfilePack(path)
+
+
+class TestPackRegistry:
+    """Test packs in the profile directory."""
+
+    def test_names_resolve(self, profile_dir):
+        """Test that pack profiles load by name next to built-ins and JSON files."""
+        registry = ProfileRegistry(profile_dir)
+        profile = registry.get("device-0042")
+        assert (profile.width_px, profile.tags) == (362, ["ios"])
+        assert registry.get("device-0042") is profile
+        assert registry.get("kiosk").tags == ["android"]
+        assert "device-0499" in registry and "device-0500" not in registry
+        assert len(registry.names()) == 500 + 1 + 5
+        assert load_profile("device-0001").name == "device-0001"
+
+    def test_json_file_shadows_pack(self, profile_dir):
+        """Test that a JSON profile file wins over a pack entry of the same name."""
+        (profile_dir / "device-0003.json").write_text(json.dumps(
+            {"name": "device-0003", "width_px": 1, "height_px": 1}), encoding="utf-8")
+        assert ProfileRegistry(profile_dir).get("device-0003").width_px == 1
+
+    def test_rebuilt_pack_reloaded(self, profile_dir, pack_path):
+        """Test that replacing a pack is picked up on the next scan."""
+        registry = ProfileRegistry(profile_dir, refresh_interval=0)
+        assert registry.get("device-0001").width_px == 321
+        build_profile_pack([{**_device(1), "width_px": 999}], pack_path)
+        assert registry.get("device-0001").width_px == 999
+        with pytest.raises(ValueError, match="Profile not found"):
+            registry.get("device-0002")
+
+    def test_replaced_and_removed_packs_unmapped(self, profile_dir, pack_path):
+        """Test that packs the registry stops using are closed."""
+        registry = ProfileRegistry(profile_dir, refresh_interval=0)
+        registry.get("device-0001")
+        old = registry._packs[pack_path][1]
+        build_profile_pack([_device(1)], pack_path)
+        registry.get("device-0001")
+        new = registry._packs[pack_path][1]
+        assert old._mmap.closed and not new._mmap.closed
+        pack_path.unlink()
+        registry.refresh(force=True)
+        assert new._mmap.closed and registry._packs == {}
+
+    def test_concurrent_lookups(self, profile_dir):
+        """Test that lookups and forced re-scans from several threads don't interfere."""
+        registry = ProfileRegistry(profile_dir, refresh_interval=0)
+        errors = []
+
+        def work(offset):
+            try:
+                for i in range(offset, 500, 25):
+                    assert registry.get(f"device-{i:04d}").width_px == 320 + i
+                    registry.refresh(force=True)
+                    assert "kiosk" in registry
+            except Exception as e:  # reported below; a thread's exception is otherwise lost
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+    def test_select(self, profile_dir):
+        """Test tag and glob selectors."""
+        registry = ProfileRegistry(profile_dir)
+        tablets = registry.select("tag:tablet")
+        assert [p.name for p in tablets][:2] == ["device-0000", "device-0005"]
+        android = [p.name for p in registry.select("tag:android")]
+        assert len(android) == 251 and "kiosk" in android
+        assert [p.name for p in registry.select("device-001[0-2]")] == [
+            "device-0010", "device-0011", "device-0012"]
+        assert [p.name for p in registry.select("lap*")] == ["laptop"]
+        assert registry.select("tag:watch") == []
+
+
+class TestSelectors:
+    """Test selectors in --profiles lists."""
+
+    def test_tag_selector(self, profile_dir):
+        """Test expanding a tag."""
+        profiles = parse_profiles_from_cli("phone,tag:tablet")
+        assert profiles[0].name == "phone"
+        assert [p.name for p in profiles[1:]] == [f"device-{i:04d}" for i in range(0, 500, 5)]
+
+    def test_no_duplicates(self, profile_dir):
+        """Test that profiles picked twice are listed once."""
+        profiles = parse_profiles_from_cli("device-000*,tag:tablet", buffer_override=0.5)
+        names = [p.name for p in profiles]
+        assert names[:10] == [f"device-{i:04d}" for i in range(10)]
+        assert len(names) == len(set(names)) == 10 + 98
+
+    def test_buffer_override_keeps_tags(self, profile_dir):
+        """Test that overridden copies keep their tags."""
+        (profile,) = parse_profiles_from_cli("kiosk", buffer_override=0.5)
+        assert (profile.buffer, profile.tags) == (0.5, ["android"])
+
+    def test_empty_selector(self, profile_dir):
+        """Test that a selector matching nothing is an error."""
+        with pytest.raises(ValueError, match="No profiles match 'tag:watch'"):
+            parse_profiles_from_cli("phone,tag:watch")
+
+
+class TestProfilePackCommand:
+    """Test the profile-pack command."""
+
+    def test_pack_directory_and_names(self, tmp_path, capsys):
+        """Test packing a directory of profiles and a built-in."""
+        source = tmp_path / "src"
+        source.mkdir()
+        for i in range(3):
+            (source / f"device-{i}.json").write_text(json.dumps(
+                {"name": f"device-{i}", "width_px": 400, "height_px": 800, "tags": ["ios"]}
+            ), encoding="utf-8")
+        output = tmp_path / "out.vpk"
+        main(["profile-pack", str(output), str(source), "phone"])
+        assert capsys.readouterr().out.strip() == f"Packed 4 profiles (1 tags) into {output}"
+        with ProfilePack(output) as pack:
+            assert pack.names == ["device-0", "device-1", "device-2", "phone"]
+
+    def test_pack_file(self, tmp_path, capsys):
+        """Test packing a single profile file given by path."""
+        source = tmp_path / "kiosk.json"
+        source.write_text(json.dumps(
+            {"name": "kiosk", "width_px": 800, "height_px": 480, "tags": ["android"]}
+        ), encoding="utf-8")
+        output = tmp_path / "out.vpk"
+        main(["profile-pack", str(output), str(source), "laptop"])
+        assert capsys.readouterr().out.strip() == f"Packed 2 profiles (1 tags) into {output}"
+        with ProfilePack(output) as pack:
+            assert pack.names == ["kiosk", "laptop"]
+            assert pack.get("kiosk")["width_px"] == 800
+
+    def test_error(self, tmp_path, capsys):
+        """Test that duplicates are reported."""
+        with pytest.raises(SystemExit):
+            main(["profile-pack", str(tmp_path / "out.vpk"), "phone", "phone"])
+        assert "Duplicate profile name" in capsys.readouterr().err
@@ -3,14 +3,19 @@ Tests for vision_ui.profiles module.
 """
 
 import json
+import os
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+import vision_ui.profiles as profiles_module
+from UI_UX.budget import compute_budget
 from vision_ui.profiles import (
     DEFAULT_PROFILES,
     Profile,
+    ProfileRegistry,
     get_profile_dir,
     list_profiles,
     load_profile,
@@ -278,3 +283,86 @@ class TestParseProfilesFromCli:
         """Test parsing invalid profile name raises error."""
         with pytest.raises(ValueError, match="Failed to load profile 'nonexistent'"):
             parse_profiles_from_cli("laptop,nonexistent")
+
+
+def _write_profile(directory, name, **fields):
+    path = directory / f"{name}.json"
+    data = {"name": name, "width_px": 800, "height_px": 600, **fields}
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def _touch(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestProfileRegistry:
+    """Test the cached, mtime-invalidated profile registry."""
+
+    def test_builtins_and_files(self, tmp_path):
+        """Test that built-ins and directory profiles resolve with their budgets."""
+        _write_profile(tmp_path, "kiosk", font_size_px=16)
+        registry = ProfileRegistry(tmp_path)
+        assert registry.get("laptop") is DEFAULT_PROFILES["laptop"]
+        assert registry.get("kiosk").font_size_px == 16
+        assert registry.budget("kiosk") == compute_budget(800, 600, font_size_px=16)
+        assert registry.names() == ["kiosk", "laptop", "phone", "prompt-8k", "slides", "tweet"]
+        with pytest.raises(ValueError, match="Profile not found: missing"):
+            registry.get("missing")
+
+    def test_parses_once(self, tmp_path):
+        """Test that repeated lookups do not touch the file again."""
+        _write_profile(tmp_path, "kiosk")
+        registry = ProfileRegistry(tmp_path)
+        with patch("vision_ui.profiles._load_profile_file",
+                   wraps=profiles_module._load_profile_file) as load:
+            first = registry.get("kiosk")
+            for _ in range(10):
+                assert registry.get("kiosk") is first
+        assert load.call_count == 1
+
+    def test_reloads_only_changed_files(self, tmp_path):
+        """Test that a refresh re-parses modified files only."""
+        _write_profile(tmp_path, "a")
+        path_b = _write_profile(tmp_path, "b")
+        registry = ProfileRegistry(tmp_path, refresh_interval=0)
+        registry.preload()
+
+        _write_profile(tmp_path, "b", width_px=1024)
+        _touch(path_b)
+        with patch("vision_ui.profiles._load_profile_file",
+                   wraps=profiles_module._load_profile_file) as load:
+            assert registry.get("b").width_px == 1024
+            registry.get("a")
+        assert [call.args[0].name for call in load.call_args_list] == ["b.json"]
+
+    def test_new_and_removed_files(self, tmp_path):
+        """Test that new files are found at once and deleted ones dropped on refresh."""
+        registry = ProfileRegistry(tmp_path, refresh_interval=3600)
+        assert "kiosk" not in registry.names()
+        path = _write_profile(tmp_path, "kiosk")
+        assert registry.get("kiosk").name == "kiosk"  # a miss forces a re-scan
+        path.unlink()
+        registry.refresh(force=True)
+        assert "kiosk" not in registry
+
+    def test_paths_and_name_lists_cached(self, tmp_path):
+        """Test explicit profile paths and @file lists."""
+        path = _write_profile(tmp_path, "kiosk")
+        names = tmp_path / "set.txt"
+        names.write_text("laptop\nphone\n", encoding="utf-8")
+        registry = ProfileRegistry(tmp_path / "empty")
+        assert registry.load_path(path) is registry.load_path(path)
+        assert registry.name_list(names) == ["laptop", "phone"]
+        names.write_text("tweet", encoding="utf-8")
+        _touch(names)
+        assert registry.name_list(names) == ["tweet"]
+
+    def test_default_registry_follows_profile_dir(self, tmp_path, monkeypatch):
+        """Test that load_profile, list_profiles and save_profile share the registry."""
+        monkeypatch.setattr(profiles_module, "get_profile_dir", lambda: tmp_path)
+        save_profile(Profile(name="desk", width_px=2560, height_px=1440))
+        assert "desk" in list_profiles()
+        assert load_profile("desk").width_px == 2560
+        assert profiles_module.get_profile_registry().directory == tmp_path
@@ -0,0 +1,197 @@
+"""
+Tests for multi-pattern safety screening.
+"""
+
+import json
+import random
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from vision_ui import screening
+from vision_ui.cli import build_parser
+from vision_ui.profiles import load_profile
+from vision_ui.screening import FLAG_MARKER, Screener, load_term_lists
+from vision_ui.segments import SegmentedText
+from vision_ui.summarize import multi_profile_summarize
+
+TERMS = {"credentials": ["password", "api key"], "violence": ["attack"]}
+
+
+@pytest.fixture(params=["automaton", "regex"])
+def backend(request, monkeypatch):
+    """Run a test with the native Aho-Corasick prefilter and with the regex scan alone."""
+    if request.param == "automaton":
+        pytest.importorskip("ahocorasick_rs")
+        monkeypatch.setattr(screening, "_AHOCORASICK_AVAILABLE", True)
+    else:
+        monkeypatch.setattr(screening, "_AHOCORASICK_AVAILABLE", False)
+    return request.param
+
+
+@pytest.mark.usefixtures("backend")
+class TestScreener:
+    """Test term matching."""
+
+    def test_scan_returns_spans_and_categories(self):
+        """Test that matches carry offsets, original text and category."""
+        text = "Rotate the API key. The Password leaked."
+        matches = Screener(TERMS).scan(text)
+        assert [(m.term, m.category) for m in matches] == [("API key", "credentials"), ("Password", "credentials")]
+        assert all(text[m.start:m.end] == m.term for m in matches)
+
+    def test_whole_words(self):
+        """Test that terms inside larger words do not match."""
+        assert Screener(TERMS).scan("passwords and counterattack") == []
+        assert len(Screener(TERMS, whole_words=False).scan("passwords")) == 1
+
+    def test_case_sensitive(self):
+        """Test case-sensitive screening."""
+        screener = Screener(TERMS, case_sensitive=True)
+        assert screener.scan("PASSWORD") == []
+        assert len(screener.scan("password")) == 1
+
+    def test_non_ascii_text(self):
+        """Test that offsets stay correct when lowercasing changes length."""
+        text = "İstanbul attack report"
+        matches = Screener(TERMS).scan(text)
+        assert [text[m.start:m.end] for m in matches] == ["attack"]
+
+    def test_empty_term_lists(self):
+        """Test that a screener without terms matches nothing."""
+        screener = Screener({"empty": []})
+        assert screener.scan("anything") == []
+        assert list(screener.iter_scan(["any", "thing"])) == []
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 50])
+    def test_iter_scan_matches_scan(self, size):
+        """Test that streaming finds the same spans across chunk boundaries."""
+        text = "The attack used a password. No api key was stored; attackers tried password123. " * 4
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        screener = Screener(TERMS)
+        assert list(screener.iter_scan(chunks)) == screener.scan(text)
+
+    def test_iter_scan_longer_match_across_chunks(self):
+        """Test a longer match that starts before a shorter pending one."""
+        screener = Screener({"x": ["c", "bcb"]}, whole_words=False)
+        assert screener.scan("xbcb") == list(screener.iter_scan(["xbc", "b"]))
+        assert [(m.start, m.end) for m in screener.scan("xbcb")] == [(1, 4)]
+
+    @pytest.mark.parametrize("whole_words", [True, False])
+    @pytest.mark.parametrize("case_sensitive", [True, False])
+    def test_iter_scan_random_chunking(self, whole_words, case_sensitive):
+        """Test random texts split at random points against scan."""
+        rng = random.Random(11)
+        for _ in range(300):
+            terms = ["".join(rng.choice("abcAB") for _ in range(rng.randint(1, 4)))
+                     for _ in range(rng.randint(1, 5))]
+            screener = Screener({"x": terms}, case_sensitive=case_sensitive,
+                                whole_words=whole_words)
+            text = "".join(rng.choice("abcAB ") for _ in range(rng.randint(0, 40)))
+            cuts = sorted(rng.sample(range(len(text) + 1), rng.randint(0, min(6, len(text)))))
+            chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+            assert list(screener.iter_scan(chunks)) == screener.scan(text), (terms, chunks)
+
+    @pytest.mark.parametrize("whole_words", [True, False])
+    @pytest.mark.parametrize("case_sensitive", [True, False])
+    def test_automaton_matches_regex(self, monkeypatch, whole_words, case_sensitive):
+        """Test that the native prefilter finds the same spans as the regex scan."""
+        pytest.importorskip("ahocorasick_rs")
+        rng = random.Random(5)
+        for _ in range(600):
+            terms = ["".join(rng.choice("akisAé") for _ in range(rng.randint(1, 4)))
+                     for _ in range(rng.randint(1, 5))]
+            # Some texts hold characters that lowercase or case-fold to ASCII letters
+            alphabet = rng.choice(["akisAéÉß ", "akisAıſKΣ ", "akisAİıſK "])
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            spans = {}
+            for available in (True, False):
+                monkeypatch.setattr(screening, "_AHOCORASICK_AVAILABLE", available)
+                screener = Screener({"x": terms}, case_sensitive=case_sensitive,
+                                    whole_words=whole_words)
+                spans[available] = screener.scan(text)
+            assert spans[True] == spans[False], (terms, text)
+
+
+class TestScreenSegments:
+    """Test sentence-level drop/flag actions."""
+
+    TEXT = "Deploy finished. The password is hunter2. Monitoring is green."
+
+    def test_flag(self):
+        """Test that matching sentences are marked."""
+        screened, matches, affected = Screener(TERMS).screen_segments(SegmentedText.from_text(self.TEXT))
+        assert affected == 1
+        assert f"{FLAG_MARKER}The password is hunter2" in screened.text
+
+    def test_drop(self):
+        """Test that matching sentences are removed."""
+        screened, _, _ = Screener(TERMS).screen_segments(SegmentedText.from_text(self.TEXT), "drop")
+        assert "password" not in screened.text
+        assert "Monitoring is green" in screened.text
+
+    def test_report(self):
+        """Test that report leaves the text alone."""
+        segments = SegmentedText.from_text(self.TEXT)
+        screened, matches, _ = Screener(TERMS).screen_segments(segments, "report")
+        assert screened is segments
+        assert len(matches) == 1
+
+    def test_unknown_action(self):
+        """Test that unknown actions raise."""
+        with pytest.raises(ValueError, match="Unknown screen action"):
+            Screener(TERMS).screen_segments(SegmentedText.from_text(self.TEXT), "erase")
+
+
+class TestIntegration:
+    """Test screening inside multi_profile_summarize and the CLI."""
+
+    def test_drop_before_budget(self):
+        """Test that dropped sentences never reach summaries."""
+        text = "The password is hunter2. Deploy finished. Monitoring is green."
+        screener = Screener(TERMS)
+        result = multi_profile_summarize(text, [load_profile("laptop")], ["one_screen"],
+                                         screener=screener, screen_action="drop")
+        assert "password" not in result["laptop"]["one_screen"]
+        assert screener.last_report.sentences_affected == 1
+        assert screener.last_report.summary_matches["laptop"]["one_screen"] == []
+
+    def test_report_screens_summaries(self):
+        """Test that summaries are screened after generation."""
+        screener = Screener(TERMS)
+        multi_profile_summarize("Possible attack detected. Investigating.", [load_profile("laptop")],
+                                ["one_screen"], screener=screener, screen_action="report")
+        report = screener.last_report
+        assert report.flagged
+        assert report.summary_matches["laptop"]["one_screen"][0].term == "attack"
+        assert "violence=1" in report.format()
+
+    def test_load_term_lists(self, tmp_path):
+        """Test the supported term list file formats."""
+        as_json = tmp_path / "terms.json"
+        as_json.write_text(json.dumps(TERMS), encoding="utf-8")
+        as_text = tmp_path / "terms.txt"
+        as_text.write_text("password\n\nattack\n", encoding="utf-8")
+        assert load_term_lists(as_json) == TERMS
+        assert load_term_lists(as_text) == {"default": ["password", "attack"]}
+        with pytest.raises(ValueError, match="Term list not found"):
+            load_term_lists(tmp_path / "missing.txt")
+
+    def test_cli_screen_terms(self, tmp_path):
+        """Test --screen-terms/--screen-action on summarize-multi."""
+        sample = tmp_path / "doc.txt"
+        sample.write_text("The password is hunter2. Deploy finished.", encoding="utf-8")
+        terms = tmp_path / "terms.txt"
+        terms.write_text("password\n", encoding="utf-8")
+        args = build_parser().parse_args([
+            "summarize-multi", "--file", str(sample), "--profiles", "laptop", "--layers", "one_screen",
+            "--format", "compact", "--screen-terms", str(terms), "--screen-action", "drop",
+        ])
+
+        stdout, stderr = StringIO(), StringIO()
+        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+            args.func(args)
+
+        assert "password" not in stdout.getvalue()
+        assert "screening: 1 input matches" in stderr.getvalue()
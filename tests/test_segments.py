@@ -0,0 +1,114 @@
+"""
+Tests for shared segmentation and the persona matrix.
+"""
+
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from UI_UX.budget import naive_summarize
+from vision_ui.cli import build_parser
+from vision_ui.layered_summarizer import PreparedDocument, layered_summarize
+from vision_ui.personas import BUILTIN_PERSONAS, Persona
+from vision_ui.profiles import load_profile
+from vision_ui.segments import SegmentedText
+from vision_ui.summarize import format_persona_matrix_output, multi_profile_summarize
+
+TEXT = (
+    "The user has a problem with the login code. The fix needs a technical review. "
+    "Implementation is scheduled for next sprint. Functionality must stay stable. " * 6
+)
+
+
+class TestSegmentedText:
+    """Test the prefix-indexed segmentation."""
+
+    @pytest.mark.parametrize("limit", [0, 5, 10, 30, 80, 200, 5000])
+    def test_matches_naive_summarize(self, limit):
+        """Test that the index reproduces naive_summarize exactly."""
+        for text in [TEXT, "", "no periods here at all", "...", "A. .B. C .  D."]:
+            assert SegmentedText.from_text(text).summarize(limit) == naive_summarize(text, limit)
+
+    def test_with_affixes_matches_resplit(self):
+        """Test that affixes merge into boundary pieces like a fresh split would."""
+        segments = SegmentedText.from_text("body one. body two")
+        wrapped = segments.with_affixes("Context: a.b\n\n", "\n\nExample: x.")
+        assert wrapped.pieces == "Context: a.b\n\nbody one. body two\n\nExample: x.".split(".")
+
+    def test_prepared_document_matches_persona_apply(self):
+        """Test that persona views equal the unshared transformations."""
+        for persona in BUILTIN_PERSONAS.values():
+            prepared = PreparedDocument(TEXT, persona)
+            assert prepared.persona_text.text == persona.apply(TEXT)
+            assert prepared.vocabulary.text == persona.apply_vocabulary(TEXT)
+
+    def test_vocabulary_with_periods_resegments(self):
+        """Test that mappings introducing periods still segment correctly."""
+        persona = Persona(name="abbr", vocabulary_mappings={"user": "U.S. user"})
+        prepared = PreparedDocument("The user left. Done", persona)
+        assert prepared.vocabulary.pieces == "The U.S. user left. Done".split(".")
+
+    def test_layered_summarize_with_prepared(self):
+        """Test that a prepared document gives the same result as raw text."""
+        persona = BUILTIN_PERSONAS["developer"]
+        layers = ["headline", "one_screen", "deep"]
+        expected = layered_summarize(TEXT, 400, layers, persona=persona)
+        prepared = PreparedDocument(TEXT, persona)
+        assert layered_summarize(TEXT, 400, layers, persona=persona, prepared=prepared) == expected
+
+
+class TestPersonaMatrix:
+    """Test multi_profile_summarize(personas=...)."""
+
+    def test_matrix_matches_individual_runs(self):
+        """Test that each persona view equals a dedicated single-persona run."""
+        profiles = [load_profile("phone"), load_profile("laptop")]
+        names = ["developer", "designer", "manager"]
+        matrix = multi_profile_summarize(TEXT, profiles, personas=names)
+
+        assert list(matrix) == names
+        for name in names:
+            assert matrix[name] == multi_profile_summarize(TEXT, profiles, persona=name)
+
+    def test_matrix_segments_once(self):
+        """Test that the source segmentation is shared across personas."""
+        profiles = [load_profile("phone")]
+        with patch("vision_ui.summarize.SegmentedText.from_text", wraps=SegmentedText.from_text) as seg:
+            multi_profile_summarize(TEXT, profiles, personas=["developer", "designer"])
+        assert [c.args[0] for c in seg.call_args_list].count(TEXT) == 1
+
+    def test_persona_and_personas_conflict(self):
+        """Test that persona and personas are mutually exclusive."""
+        with pytest.raises(ValueError, match="either persona or personas"):
+            multi_profile_summarize(TEXT, [load_profile("phone")], persona="developer", personas=["designer"])
+
+    def test_unknown_persona_in_matrix(self):
+        """Test that unknown personas in the matrix raise."""
+        with pytest.raises(ValueError, match="Unknown persona"):
+            multi_profile_summarize(TEXT, [load_profile("phone")], personas=["developer", "nope"])
+
+    def test_format_matrix(self):
+        """Test matrix formatting."""
+        matrix = {"developer": {"phone": {"headline": "Dev headline"}}}
+        assert "##### DEVELOPER #####" in format_persona_matrix_output(matrix)
+        assert format_persona_matrix_output(matrix, "compact") == "developer.phone.headline: Dev headline"
+        assert json.loads(format_persona_matrix_output(matrix, "json")) == matrix
+
+    def test_cli_personas(self, tmp_path):
+        """Test --personas on summarize-multi."""
+        sample = tmp_path / "doc.txt"
+        sample.write_text(TEXT, encoding="utf-8")
+        args = build_parser().parse_args([
+            "summarize-multi", "--file", str(sample), "--profiles", "phone",
+            "--layers", "headline", "--personas", "developer,manager", "--format", "json",
+        ])
+
+        captured = StringIO()
+        with patch("sys.stdout", captured):
+            args.func(args)
+
+        output = json.loads(captured.getvalue())
+        assert set(output) == {"developer", "manager"}
+        assert "headline" in output["manager"]["phone"]
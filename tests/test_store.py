@@ -0,0 +1,109 @@
+"""
+Tests for the searchable result store.
+"""
+
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from vision_ui.cli import build_parser
+from vision_ui.engine import VisionEngine
+from vision_ui.store import ResultStore
+
+INCIDENT = "Replica lag on db-3 reached forty seconds. Reads were moved to the primary. " * 10
+DEPLOY = "Deploy 118 rolled out to all regions. No errors were reported by the canary. " * 10
+
+
+def _run(argv):
+    args = build_parser().parse_args(argv)
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+        args.func(args)
+    return stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(tmp_path / "results.sqlite3")
+    yield store
+    store.close()
+
+
+class TestResultStore:
+    """Test recording and searching runs."""
+
+    def test_record_and_search(self, store):
+        """Test that summaries are found by content with their document reference."""
+        store.record({"phone": {"headline": "Replica lag on db-3."}}, INCIDENT,
+                     doc_id="incident.log", elapsed_ms=4.2)
+        store.record({"phone": {"headline": "Deploy 118 rolled out."}}, DEPLOY)
+
+        hits = store.search("replica lag")
+        assert len(hits) == 1
+        assert hits[0].doc_id == "incident.log"
+        assert (hits[0].profile, hits[0].layer) == ("phone", "headline")
+        assert "*Replica* *lag*" in hits[0].snippet
+        deploy = store.search("deploy")[0]
+        assert deploy.doc_id is None and deploy.document == deploy.doc_hash[:12]
+        assert len(store) == 2
+
+    def test_filters(self, store):
+        """Test profile, layer and persona filters."""
+        store.record({"phone": {"headline": "Replica lag."}, "laptop": {"deep": "Replica lag."}},
+                     INCIDENT, persona="developer")
+        assert [h.profile for h in store.search("replica", profile="laptop")] == ["laptop"]
+        assert [h.layer for h in store.search("replica", layer="headline")] == ["headline"]
+        assert store.search("replica", persona="manager") == []
+
+    def test_persona_matrix(self, store):
+        """Test that persona matrices record one row per persona."""
+        matrix = {"developer": {"phone": {"headline": "Replica lag."}},
+                  "manager": {"phone": {"headline": "Replica lag."}}}
+        store.record(matrix, INCIDENT, personas=True)
+        assert sorted(h.persona for h in store.search("lag")) == ["developer", "manager"]
+
+    def test_invalid_query_syntax_falls_back_to_terms(self, store):
+        """Test that text which is not valid FTS5 syntax is searched as plain terms."""
+        store.record({"phone": {"headline": "db-3 replica lag."}}, INCIDENT)
+        assert len(store.search("db-3")) == 1
+        assert store.search('"unbalanced') == []
+        assert store.search("   ") == []
+
+    def test_metadata_keys_skipped(self, store):
+        """Test that '_ocr_metadata' entries are not recorded as summaries."""
+        store.record({"phone": {"headline": "Replica lag."}, "_ocr_metadata": {"regions": 3}},
+                     b"image bytes")
+        assert len(store.search("lag")) == 1
+
+
+class TestStoreIntegration:
+    """Test recording from the CLI and the engine."""
+
+    def test_cli_store_and_search(self, tmp_path):
+        """Test that a --store run is found by 'vision-ui search'."""
+        sample = tmp_path / "incident.log"
+        sample.write_text(INCIDENT, encoding="utf-8")
+        db = str(tmp_path / "results.sqlite3")
+        _run(["summarize-multi", "--file", str(sample), "--profiles", "phone,laptop",
+              "--format", "compact", "--store", db])
+
+        stdout, _ = _run(["search", "replica lag", "--store", db, "--layer", "headline"])
+        assert str(sample) in stdout
+        assert stdout.count("\n") == 2
+
+        stdout, _ = _run(["search", "replica", "--store", db, "--format", "json"])
+        hits = json.loads(stdout)
+        assert {hit["profile"] for hit in hits} == {"phone", "laptop"}
+
+        _, stderr = _run(["search", "kubernetes", "--store", db])
+        assert "No matching summaries" in stderr
+
+    def test_engine_records_runs(self, store):
+        """Test that engine runs are recorded with their document id."""
+        engine = VisionEngine(store=store)
+        engine.summarize_text(INCIDENT, "phone", doc_id="pager-4411")
+        engine.summarize_texts([DEPLOY], "phone")
+        assert len(store) == 2
+        assert store.search("replica")[0].doc_id == "pager-4411"
@@ -0,0 +1,183 @@
+"""
+Tests for budget sweeps.
+"""
+
+import csv
+import io
+import itertools
+import json
+from unittest.mock import patch
+
+import pytest
+
+from UI_UX import budget_table
+from UI_UX.budget import compute_budget
+from vision_ui import sweep as sweep_module
+from vision_ui.cli import build_parser
+from vision_ui.sweep import (
+    BudgetSweep,
+    SweepAxis,
+    load_npy_header,
+    parse_sweep,
+    parse_sweep_axis,
+)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test with NumPy and with the pure-Python fallback."""
+    available = request.param == "numpy"
+    if available:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(budget_table, "_NUMPY_AVAILABLE", available)
+    monkeypatch.setattr(sweep_module, "_NUMPY_AVAILABLE", available)
+    return request.param
+
+
+def _run(argv):
+    args = build_parser().parse_args(argv)
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+        args.func(args)
+    return stdout.getvalue(), stderr.getvalue()
+
+
+class TestParseSweep:
+    """Test axis specifications."""
+
+    def test_ranges_and_lists(self):
+        """Test inclusive ranges, default steps, float steps and value lists."""
+        assert parse_sweep_axis("width=320:3840:16").values[-1] == 3840
+        assert len(parse_sweep_axis("width=320:3840:16")) == 221
+        assert parse_sweep_axis("font=10:13").values == [10, 11, 12, 13]
+        assert parse_sweep_axis("buffer=0.5:0.9:0.1").values == [0.5, 0.6, 0.7, 0.8, 0.9]
+        assert parse_sweep_axis("ruler=40,80,120").values == [40, 80, 120]
+
+    @pytest.mark.parametrize("spec", [
+        "width", "depth=1:2", "width=1:2:0", "width=9:1", "width=a:b", "width=1:2:3:4",
+    ])
+    def test_rejects_malformed(self, spec):
+        """Test that malformed specifications raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_sweep_axis(spec)
+
+    def test_rejects_repeated_parameter(self):
+        """Test that a parameter can only be swept once."""
+        with pytest.raises(ValueError, match="more than once"):
+            parse_sweep(["width=1:2", "width=3:4"])
+
+
+class TestBudgetSweep:
+    """Test sweep output against compute_budget."""
+
+    def test_rows_match_compute_budget(self, backend):
+        """Test grid order and values across chunk boundaries."""
+        axes = parse_sweep(["width=320:1024:64", "height=480:1080:100", "ruler=40,80"])
+        sweep = BudgetSweep(axes, fixed={"font": 12, "buffer": 0.85}, chunk_rows=7)
+        out = io.StringIO()
+        assert sweep.write_jsonl(out) == len(sweep) == 12 * 7 * 2
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        grid = itertools.product(axes[0].values, axes[1].values, axes[2].values)
+        for row, (width, height, ruler) in zip(rows, grid):
+            expected = compute_budget(width, height, font_size_px=12,
+                                      editor_ruler_columns=ruler, buffer=0.85)
+            assert row.pop("editor_ruler_columns") == ruler
+            assert row == expected
+
+    def test_csv(self, backend):
+        """Test the CSV header and column selection."""
+        sweep = BudgetSweep(parse_sweep(["font=10:12"]), fixed={"width": 800, "height": 600},
+                            columns=["font_size_px", "target_chars"])
+        out = io.StringIO()
+        sweep.write_csv(out)
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        assert rows[0] == ["font_size_px", "target_chars"]
+        assert rows[1] == ["10", str(compute_budget(800, 600, font_size_px=10)["target_chars"])]
+        assert len(rows) == 4
+
+    def test_npy_matrix(self, backend):
+        """Test the binary matrix header, shape and values."""
+        axes = parse_sweep(["width=320:640:160", "font=10,14"])
+        sweep = BudgetSweep(axes, fixed={"height": 720}, columns=["width_px", "target_chars"])
+        out = io.BytesIO()
+        sweep.write_npy(out)
+        data = out.getvalue()
+        dtype, shape, offset = load_npy_header(data)
+        assert (dtype, shape, offset % 64) == ("<i4", (3, 2, 2), 0)
+
+        np = pytest.importorskip("numpy")
+        matrix = np.load(io.BytesIO(data))
+        assert matrix.shape == (3, 2, 2)
+        assert matrix[2, 1].tolist() == [640, compute_budget(640, 720, 14)["target_chars"]]
+
+    def test_float_columns_use_f8(self):
+        """Test that float columns switch the matrix to float64."""
+        sweep = BudgetSweep(parse_sweep(["buffer=0.5:1:0.25"]), fixed={"width": 1, "height": 1})
+        assert sweep.npy_dtype() == "<f8"
+
+    def test_dtype_with_no_ruler(self):
+        """Test that a ruler axis including None (no ruler) still picks an integer dtype."""
+        sweep = BudgetSweep([SweepAxis("width", [320, 640]), SweepAxis("ruler", [None, 80])],
+                            fixed={"height": 720},
+                            columns=["width_px", "editor_ruler_columns", "target_chars"])
+        assert sweep.npy_dtype() == "<i4"
+        out = io.BytesIO()
+        assert sweep.write_npy(out) == 4
+
+    def test_needs_width_and_height(self):
+        """Test that width and height must be swept or fixed."""
+        with pytest.raises(ValueError, match="height"):
+            BudgetSweep(parse_sweep(["width=1:2"]))
+        with pytest.raises(ValueError, match="Unknown sweep column"):
+            BudgetSweep(parse_sweep(["width=1:2"]), fixed={"height": 1}, columns=["area"])
+
+
+class TestSweepCLI:
+    """Test 'vision-ui budget --sweep'."""
+
+    def test_csv_and_jsonl(self):
+        """Test streamed CSV and JSON lines on stdout."""
+        stdout, _ = _run(["budget", "--sweep", "width=320:3840:16", "height=480:2160:16",
+                          "font=10:24", "--columns", "target_chars"])
+        lines = stdout.splitlines()
+        assert len(lines) == 1 + 221 * 106 * 15
+        assert lines[-1] == str(compute_budget(3840, 2160, 24)["target_chars"])
+
+        stdout, _ = _run(["budget", "--sweep", "width=1024", "--height", "768", "--json"])
+        assert json.loads(stdout)["target_chars"] == compute_budget(1024, 768)["target_chars"]
+
+    def test_npy_output_file(self, tmp_path):
+        """Test that npy output keeps integer columns by default."""
+        path = tmp_path / "grid.npy"
+        _run(["budget", "--sweep", "width=320:400:40", "height=480:600:60", "--format", "npy",
+              "--output", str(path)])
+        dtype, shape, _ = load_npy_header(path.read_bytes())
+        assert (dtype, shape) == ("<i4", (3, 3, 8))
+
+    def test_closed_pipe(self, tmp_path):
+        """Test that a reader closing the pipe ends the sweep quietly."""
+        class ClosedPipe(io.StringIO):
+            def __init__(self, fd):
+                super().__init__()
+                self.fd = fd
+
+            def write(self, text):
+                raise BrokenPipeError(32, "Broken pipe")
+
+            def fileno(self):
+                return self.fd
+
+        with open(tmp_path / "stdout", "w") as target:
+            args = build_parser().parse_args(["budget", "--sweep", "width=320:3840",
+                                              "--height", "768"])
+            with patch("sys.stdout", ClosedPipe(target.fileno())):
+                with pytest.raises(SystemExit) as exc:
+                    args.func(args)
+        assert exc.value.code == 1
+
+    def test_errors(self):
+        """Test missing dimensions and bad specifications."""
+        for argv in (["budget", "--width", "100"], ["budget", "--sweep", "width=1:x"]):
+            with pytest.raises(SystemExit):
+                _run(argv)
@@ -0,0 +1,221 @@
+"""
+Tests for token-budget profiles and chars-per-token calibration.
+"""
+
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from rich.console import Console
+
+from UI_UX.cell_width import cell_width
+from vision_ui import token_profiles
+from vision_ui.engine import VisionEngine
+from vision_ui.profiles import (
+    ProfileRegistry,
+    fit_profile,
+    load_profile,
+    parse_profiles_from_cli,
+)
+from vision_ui.segments import SegmentedText
+from vision_ui.summarize import multi_profile_summarize
+from vision_ui.token_profiles import (
+    TokenProfile,
+    calibrate_chars_per_token,
+    chars_per_token,
+)
+from vision_ui.triage import TriageBoard
+from vision_ui.wrap import WrapFitter
+
+TEXT = "Replica lag reached forty seconds on db-3. Reads moved to the primary. " * 200
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word, Hugging Face style."""
+
+    def encode(self, text, add_special_tokens=True):
+        return text.split()
+
+
+class BareTokenizer:
+    """A tokenizer whose encode takes no keywords (like tiktoken)."""
+
+    def encode(self, text):
+        return list(text)
+
+
+@pytest.fixture(autouse=True)
+def calibration(tmp_path, monkeypatch):
+    """Keep calibrations out of the user's cache and start every test unmemoized."""
+    path = tmp_path / "token_calibration.json"
+    monkeypatch.setattr(token_profiles, "default_calibration_path", lambda: path)
+    monkeypatch.setattr(token_profiles, "_ratios", {})
+    return path
+
+
+class TestTokenProfile:
+    """Test token budgets."""
+
+    def test_budget(self):
+        """Test the token and character targets."""
+        profile = TokenProfile("p", context_tokens=8192, output_tokens=1024, chars_per_token=4.0)
+        budget = profile.budget()
+        assert budget["token_budget"] == 7168
+        assert budget["target_tokens"] == int(7168 * 0.9)
+        assert budget["char_budget"] == 7168 * 4
+        assert profile.target_chars == budget["target_chars"] == int(7168 * 0.9) * 4
+
+    def test_round_trip_and_validation(self):
+        """Test to_dict/from_dict and a reserved output as large as the context."""
+        profile = TokenProfile("p", 4096, 512, model="m", tags=["llm"])
+        assert TokenProfile.from_dict(profile.to_dict()) == profile
+        with pytest.raises(ValueError, match="must be below context_tokens"):
+            TokenProfile.from_dict({"name": "p", "context_tokens": 100, "output_tokens": 100})
+
+    def test_builtin(self):
+        """Test the built-in prompt profile."""
+        profile = load_profile("prompt-8k")
+        assert isinstance(profile, TokenProfile)
+        assert profile.context_tokens == 8192
+
+
+class TestCalibration:
+    """Test the calibration table."""
+
+    def test_calibrate_and_reuse(self, calibration):
+        """Test that a measured ratio is stored and later read without a tokenizer."""
+        ratio = calibrate_chars_per_token("words", WordTokenizer(), samples=["ab cd", "efgh"])
+        assert ratio == pytest.approx(9 / 3)
+        assert json.loads(calibration.read_text()) == {"words": ratio}
+
+        token_profiles._ratios.clear()
+        with patch("vision_ui.token_profiles.get_tokenizer") as loader:
+            assert chars_per_token("words") == ratio
+        loader.assert_not_called()
+
+    def test_tokenizer_loaded_once(self, calibration):
+        """Test that an uncalibrated model loads its tokenizer once per process."""
+        with patch("vision_ui.token_profiles.get_tokenizer", return_value=BareTokenizer()) as loader:
+            first = chars_per_token("chars")
+            for _ in range(5):
+                assert chars_per_token("chars") == first
+        assert loader.call_count == 1
+        assert first == pytest.approx(1.0)  # one token per character
+
+    def test_no_tokenizer(self, calibration):
+        """Test the fallback ratio, which is not written to the table."""
+        with patch("vision_ui.token_profiles.get_tokenizer", return_value=None):
+            assert chars_per_token("missing") == token_profiles.DEFAULT_CHARS_PER_TOKEN
+        assert not calibration.exists()
+
+    def test_memo_keyed_by_table(self, tmp_path):
+        """Test that ratios from different calibration tables are memoized separately."""
+        first, second = tmp_path / "first.json", tmp_path / "second.json"
+        first.write_text(json.dumps({"m": 3.0}), encoding="utf-8")
+        second.write_text(json.dumps({"m": 5.0}), encoding="utf-8")
+        assert chars_per_token("m", path=first) == 3.0
+        assert chars_per_token("m", path=second) == 5.0
+        assert chars_per_token("m", path=first) == 3.0
+
+    def test_downloads_opt_in(self, monkeypatch):
+        """Test that budgets use only local tokenizers unless downloads are enabled."""
+        with patch("vision_ui.token_profiles.get_tokenizer", return_value=None) as loader:
+            monkeypatch.delenv(token_profiles.DOWNLOAD_ENV, raising=False)
+            assert chars_per_token("a") == token_profiles.DEFAULT_CHARS_PER_TOKEN
+            monkeypatch.setenv(token_profiles.DOWNLOAD_ENV, "1")
+            chars_per_token("b")
+            chars_per_token("c", download=False)
+            calibrate_chars_per_token("d")
+        assert [call.kwargs["local_files_only"] for call in loader.call_args_list] == [
+            True, False, True, False
+        ]
+
+    def test_cells_per_token(self):
+        """Test that wide characters count two cells each."""
+        text = "漢字漢字"
+        ratio = calibrate_chars_per_token("cjk", BareTokenizer(), samples=[text])
+        assert ratio == cell_width(text) / len(text) == 2
+
+
+class TestTokenProfileFiles:
+    """Test token profiles stored as files."""
+
+    def test_load_from_directory(self, tmp_path, monkeypatch):
+        """Test that a file with context_tokens loads as a TokenProfile."""
+        monkeypatch.setattr("vision_ui.profiles.get_profile_dir", lambda: tmp_path)
+        (tmp_path / "claude-ctx.json").write_text(json.dumps(
+            {"name": "claude-ctx", "context_tokens": 32000, "output_tokens": 4000,
+             "chars_per_token": 3.5, "tags": ["llm"]}), encoding="utf-8")
+        (profile,) = parse_profiles_from_cli("tag:llm", buffer_override=0.5)
+        assert isinstance(profile, TokenProfile)
+        assert (profile.buffer, profile.target_chars) == (0.5, int(28000 * 0.5 * 3.5))
+        (tmp_path / "bad.json").write_text(json.dumps(
+            {"name": "bad", "context_tokens": 10, "output_tokens": 20}), encoding="utf-8")
+        with pytest.raises(ValueError, match="Invalid profile file"):
+            load_profile("bad")
+
+    def test_tokenizer_not_loaded_by_selection(self, tmp_path):
+        """Test that parsing token profiles (e.g. for a tag) never loads their tokenizer."""
+        (tmp_path / "remote.json").write_text(json.dumps(
+            {"name": "remote", "context_tokens": 4096, "model": "someorg/some-model"}
+        ), encoding="utf-8")
+        (tmp_path / "kiosk.json").write_text(json.dumps(
+            {"name": "kiosk", "width_px": 800, "height_px": 480, "tags": ["android"]}
+        ), encoding="utf-8")
+        registry = ProfileRegistry(tmp_path)
+        with patch("vision_ui.token_profiles.get_tokenizer", return_value=None) as loader:
+            assert registry.tagged("android") == ["kiosk"]
+            registry.preload()
+            registry.get("remote")
+            loader.assert_not_called()
+            assert registry.budget("remote")["chars_per_token"] == 4.0
+        loader.assert_called_once_with("someorg/some-model", trust_remote_code=False,
+                                       local_files_only=True)
+
+    def test_fit_rejected(self):
+        """Test that only screen profiles can be fitted."""
+        with pytest.raises(ValueError, match="token profile"):
+            fit_profile(TokenProfile("p", 1000, chars_per_token=4.0), "width", 100)
+
+
+class TestMixedSummaries:
+    """Test token profiles summarized next to screen profiles."""
+
+    def test_one_run(self):
+        """Test phone, laptop and prompt summaries from one segmentation."""
+        prompt = TokenProfile("prompt", context_tokens=2048, output_tokens=512,
+                              chars_per_token=4.0)
+        profiles = [load_profile("phone"), load_profile("laptop"), prompt]
+        with patch("vision_ui.summarize.SegmentedText.from_text",
+                   wraps=SegmentedText.from_text) as segment:
+            results = multi_profile_summarize(TEXT, profiles, layers=["one_screen", "deep"])
+        assert segment.call_count == 1
+        assert list(results) == ["phone", "laptop", "prompt"]
+        assert cell_width(results["prompt"]["deep"]) <= prompt.target_chars
+        assert len(results["prompt"]["deep"]) > len(results["laptop"]["deep"])
+
+    def test_wrap_fitter_skips_token_profiles(self):
+        """Test that wrap fitting leaves prompt summaries alone."""
+        prompt = TokenProfile("prompt", context_tokens=1024, chars_per_token=4.0)
+        plain = multi_profile_summarize(TEXT, [prompt], layers=["deep"])
+        fitter = WrapFitter()
+        fitted = multi_profile_summarize(TEXT, [load_profile("phone"), prompt], layers=["deep"],
+                                         wrap_fitter=fitter)
+        assert fitted["prompt"] == plain["prompt"]
+
+    def test_engine_budget(self):
+        """Test the engine's budgets for token profiles."""
+        prompt = TokenProfile("prompt", context_tokens=1024, chars_per_token=4.0)
+        with VisionEngine() as engine:
+            assert engine.budget(prompt) == prompt.budget()
+            assert engine.token_budget(prompt) == prompt.budget()
+            assert engine.summarize_text(TEXT, [prompt, "phone"], layers=["headline"])
+
+    def test_triage_profile_info(self):
+        """Test that the profile table shows the context window."""
+        console = Console(file=StringIO(), width=120, color_system=None)
+        prompt = TokenProfile("prompt", context_tokens=8192, chars_per_token=4.0)
+        TriageBoard(console=console).display_profile_info([load_profile("phone"), prompt])
+        output = console.file.getvalue()
+        assert "8,192 tok" in output and f"{prompt.target_chars:,} chars" in output
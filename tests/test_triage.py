@@ -60,6 +60,30 @@ class TestTriageBoard:
         assert "Mobile headline summary" in output
         assert "Laptop headline summary" in output
     
+    def test_display_progressive(self):
+        """Test that progressive results print in arrival order and are collected."""
+        profiles = [
+            Profile("phone", 375, 667, font_size_px=14),
+            Profile("laptop", 1920, 1080, font_size_px=16)
+        ]
+        results = [
+            (profiles[0], "headline", "Phone headline first"),
+            (profiles[1], "headline", "Laptop headline second"),
+            (profiles[0], "deep", "Phone deep last"),
+        ]
+        
+        string_io = StringIO()
+        board = TriageBoard(Console(file=string_io, width=120))
+        summaries = board.display_progressive(iter(results), profiles)
+        
+        output = string_io.getvalue()
+        assert output.index("Phone headline first") < output.index("Laptop headline second")
+        assert "MULTI-PROFILE TRIAGE BOARD" in output
+        assert summaries == {
+            "phone": {"headline": "Phone headline first", "deep": "Phone deep last"},
+            "laptop": {"headline": "Laptop headline second"}
+        }
+    
     def test_display_comparison_with_ocr_metadata(self):
         """Test comparison display with OCR metadata."""
         summaries = {
@@ -0,0 +1,100 @@
+"""
+Tests for wrap-accurate summary fitting.
+"""
+
+import random
+import textwrap
+
+from UI_UX.budget import compute_budget
+from vision_ui.deadline import DEADLINE_MARKER
+from vision_ui.profiles import load_profile
+from vision_ui.summarize import multi_profile_summarize
+from vision_ui.wrap import WrapFitter, layer_lines, wrapped_line_count
+
+# Many short words make greedy wrapping waste line ends
+TEXT = " ".join(
+    f"Node {i} of the cluster reported an elevated error rate during the rollout window."
+    for i in range(60)
+)
+
+
+def _screen(profile):
+    budget = compute_budget(profile.width_px, profile.height_px, profile.font_size_px,
+                            editor_ruler_columns=profile.editor_ruler_columns,
+                            buffer=profile.buffer)
+    return budget["effective_columns"], budget["lines"]
+
+
+class TestWrappedLineCount:
+    """Test the greedy wrapper."""
+
+    def test_matches_textwrap(self):
+        """Test line counts against textwrap, long words included."""
+        rng = random.Random(5)
+        words = ["a", "to", "the", "budget", "db-3", "summarization", "x" * 45]
+        for _ in range(500):
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 60)))
+            width = rng.randint(1, 90)
+            expected = len(textwrap.wrap(text, width, break_on_hyphens=False))
+            assert wrapped_line_count(text, width) == expected
+
+    def test_hard_line_breaks(self):
+        """Test that newlines start new lines and blank lines count."""
+        assert wrapped_line_count("one\n\ntwo", 40) == 3
+        assert wrapped_line_count("", 40) == 1
+
+
+class TestWrapFitter:
+    """Test shortening summaries to fit."""
+
+    def test_fitting_summary_unchanged(self):
+        """Test that summaries which fit are returned as they are."""
+        fitter = WrapFitter()
+        assert fitter.fit("Short. Summary.", 40, 2) == "Short. Summary."
+
+    def test_drops_trailing_sentences(self):
+        """Test that whole sentences are dropped until the summary fits."""
+        summary = "Alpha beta gamma. Delta epsilon zeta. Eta theta iota kappa lambda."
+        fitted = WrapFitter().fit(summary, 20, 2)
+        assert fitted == "Alpha beta gamma. Delta epsilon zeta."
+        assert wrapped_line_count(fitted, 20) <= 2
+
+    def test_truncates_first_sentence(self):
+        """Test the word-boundary fallback when no sentence fits."""
+        fitted = WrapFitter().fit("One two three four five six seven eight nine.", 10, 2)
+        assert fitted == "One two three..."
+
+    def test_lead_and_tail(self):
+        """Test that the lead counts and the tail is kept but not counted."""
+        fitter = WrapFitter()
+        tail = "\n\nExample one.\nExample two.\nExample three."
+        fitted = fitter.fit("[hash:abc] One two. Three four." + tail, 12, 2,
+                            lead="[hash:abc] ", tail=tail)
+        assert fitted == "[hash:abc] One two." + tail
+
+
+class TestMultiProfileWrapFit:
+    """Test the wrap_fitter stage of multi_profile_summarize."""
+
+    def test_every_summary_fits(self):
+        """Test that every profile/layer result fits its share of the screen."""
+        profiles = [load_profile(name) for name in ("phone", "laptop", "slides", "tweet")]
+        fitter = WrapFitter()
+        plain = multi_profile_summarize(TEXT, profiles)
+        fitted = multi_profile_summarize(TEXT, profiles, wrap_fitter=fitter)
+
+        overflowed = 0
+        for profile in profiles:
+            columns, lines = _screen(profile)
+            for layer, summary in fitted[profile.name].items():
+                assert wrapped_line_count(summary, columns) <= layer_lines(lines, layer)
+                assert plain[profile.name][layer].startswith(summary.rstrip("."))
+                overflowed += summary != plain[profile.name][layer]
+        assert fitter.last_report.checked == 12
+        assert fitter.last_report.shrunk == overflowed > 0
+
+    def test_deadline_marker_kept(self):
+        """Test that the partial marker survives fitting."""
+        fitted = WrapFitter().fit(DEADLINE_MARKER + "A b c. D e f. G h i.", 8, 2,
+                                  lead=DEADLINE_MARKER)
+        assert fitted.startswith(DEADLINE_MARKER)
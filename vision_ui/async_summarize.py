@@ -0,0 +1,264 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.async_summarize
+
+Asyncio counterparts of the multi-profile and screenshot summarization pipelines.
+Async summarizer backends are awaited concurrently across profiles and layers; input
+preparation, blocking summarizers and Tesseract run in an executor, and a semaphore bounds
+in-flight calls.
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from UI_UX.budget import naive_summarize
+
+from .deadline import CANCEL_POLL_SECONDS, DEADLINE_MARKER, CancellationToken, Deadline
+from .layered_summarizer import DEFAULT_LAYERS, LayerPlan, plan_layer
+from .normalize import TextNormalizer
+from .ocr import ScreenshotAnalyzer
+from .profiles import AnyProfile, Profile
+from .redaction import Redactor
+from .screening import Screener
+from .screenshot_handlers import analyze_for_profiles, ocr_metadata
+from .segments import SegmentedText
+from .summarize import prepare_input
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+AnySummarizer = Union[Callable[[str, int], str], Callable[[str, int], Awaitable[str]]]
+
+
+def _is_async(summarizer: AnySummarizer) -> bool:
+    """True for coroutine functions and objects with an async __call__."""
+    return inspect.iscoroutinefunction(summarizer) or inspect.iscoroutinefunction(
+        getattr(summarizer, "__call__", None)
+    )
+
+
+async def _run_call(
+    summarizer: AnySummarizer,
+    plan: LayerPlan,
+    semaphore: asyncio.Semaphore,
+    executor: Optional[Executor],
+    deadline: Optional[Deadline] = None
+) -> Optional[str]:
+    """
+    Run the summarizer call of a layer plan without blocking the event loop.
+
+    Returns None, without calling the summarizer, if the deadline expires before the call
+    gets a slot.
+    """
+    if summarizer is naive_summarize:
+        # A binary search over the shared prefix index; cheaper than a thread hop
+        return plan.document.summarize(plan.char_limit)
+    async with semaphore:
+        if deadline is not None and deadline.expired:
+            return None
+        if _is_async(summarizer):
+            return await summarizer(plan.document.text, plan.char_limit)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, summarizer, plan.document.text, plan.char_limit
+        )
+
+
+async def async_multi_profile_summarize(
+    text: Union[str, SegmentedText],
+    profiles: List[AnyProfile],
+    layers: List[str] = ['headline', 'one_screen', 'deep'],
+    persona: Optional[str] = None,
+    summarizer: Optional[AnySummarizer] = None,
+    normalizer: Optional[TextNormalizer] = None,
+    screener: Optional[Screener] = None,
+    screen_action: str = "flag",
+    redactor: Optional[Redactor] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    executor: Optional[Executor] = None,
+    deadline: Optional[Deadline] = None,
+    timeout: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None
+) -> Dict[str, Dict[str, str]]:
+    """
+    Generate multi-profile, multi-layer summaries without blocking the event loop.
+
+    Every (profile, layer) summarizer call is started at once, so latency is bounded by the
+    slowest call rather than the sum of all of them. Results are identical to
+    `multi_profile_summarize`. Results are not cached or deduplicated: a SummaryCache or
+    SimHashIndex would do blocking SQLite and index work on the loop, so run
+    `multi_profile_summarize` in an executor when those are needed.
+
+    Args:
+        text: Input text to summarize, or an already segmented document such as a
+            memory-mapped `docindex.MappedDocument`
+        profiles: List of Profile and TokenProfile objects
+        layers: List of layer names to generate for each profile
+        persona: Optional persona name (built-in or from the persona directory)
+        summarizer: Optional summarizer; coroutine functions are awaited, plain functions run
+            in `executor`
+        normalizer: Optional TextNormalizer applied to the text first
+        screener: Optional Screener; see `multi_profile_summarize`
+        screen_action: What to do with input sentences containing matches
+        redactor: Optional Redactor applied to the text before any other stage
+        max_concurrency: Maximum summarizer calls in flight at once
+        executor: Executor for input preparation and blocking summarizers (default: the
+            loop's default executor)
+        deadline: Optional Deadline; as in `multi_profile_summarize`, layers whose call has
+            not finished when it expires fall back to the prefix summary, prefixed with
+            DEADLINE_MARKER (unfinished calls are cancelled, though a blocking summarizer
+            already running in the executor runs to completion)
+        timeout: Seconds until the deadline (use instead of `deadline`)
+        cancel_token: Optional CancellationToken that expires the deadline when cancelled
+
+    Returns:
+        Nested dictionary: {profile_name: {layer_name: summary}}
+    """
+    if summarizer is None:
+        summarizer = naive_summarize
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+
+    for layer_name in layers:
+        if layer_name not in DEFAULT_LAYERS:
+            raise ValueError(f"Unknown layer: {layer_name}")
+
+    deadline = Deadline.resolve(deadline, timeout, cancel_token)
+
+    loop = asyncio.get_running_loop()
+    prepared, targets, report = await loop.run_in_executor(executor, partial(
+        prepare_input, text, profiles, persona, normalizer, screener, screen_action, redactor
+    ))
+
+    plans = []
+    for profile, target_chars in zip(profiles, targets):
+        for layer_name in layers:
+            plans.append((profile, plan_layer(prepared, target_chars, layer_name)))
+
+    # Profiles with equal effective budgets share one summarizer call
+    calls: Dict[Tuple[int, int], LayerPlan] = {}
+    for _, plan in plans:
+        calls.setdefault(plan.call_key, plan)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [
+        asyncio.ensure_future(_run_call(summarizer, plan, semaphore, executor, deadline))
+        for plan in calls.values()
+    ]
+    if deadline is None:
+        raw_summaries = await asyncio.gather(*tasks)
+    else:
+        raw_summaries = await _gather_until(tasks, deadline)
+    raw_by_key = dict(zip(calls, raw_summaries))
+
+    results: Dict[str, Dict[str, str]] = {profile.name: {} for profile in profiles}
+    fallbacks = 0
+    for profile, plan in plans:
+        raw = raw_by_key[plan.call_key]
+        if raw is None:
+            # Missed the deadline: the prefix summary is a binary search away
+            summary = DEADLINE_MARKER + plan.finish(plan.document.summarize(plan.char_limit))
+            fallbacks += 1
+        else:
+            summary = plan.finish(raw)
+        results[profile.name][plan.layer_name] = summary
+    if deadline is not None:
+        deadline.fallbacks += fallbacks
+
+    if report is not None:
+        for profile_name, profile_summaries in results.items():
+            report.summary_matches[profile_name] = {
+                layer_name: screener.scan(summary) for layer_name, summary in profile_summaries.items()
+            }
+
+    return results
+
+
+async def _gather_until(
+    tasks: List["asyncio.Future[Optional[str]]"],
+    deadline: Deadline
+) -> List[Optional[str]]:
+    """Results of tasks that finish before the deadline (None for the rest, cancelled)."""
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline.remaining()
+            if remaining is not None and remaining <= 0.0:
+                break
+            # Poll so a cancellation token is noticed even without a time limit
+            wait_for = CANCEL_POLL_SECONDS if deadline.token is not None else remaining
+            if remaining is not None:
+                wait_for = min(wait_for, remaining)
+            _, pending = await asyncio.wait(
+                pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+            )
+    finally:
+        for task in pending:
+            task.cancel()
+    return [None if task in pending else task.result() for task in tasks]
+
+
+async def async_screenshot_aware_summarize(
+    image_path: str,
+    profiles: List[Profile],
+    layers: List[str] = ['headline', 'one_screen'],
+    persona: Optional[str] = None,
+    summarizer: Optional[AnySummarizer] = None,
+    ocr_analyzer: Optional[ScreenshotAnalyzer] = None,
+    redactor: Optional[Redactor] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    executor: Optional[Executor] = None,
+    ocr_executor: Optional[Executor] = None,
+    deadline: Optional[Deadline] = None,
+    timeout: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None
+) -> Dict[str, Any]:
+    """
+    Generate multi-profile summaries from a screenshot without blocking the event loop.
+
+    Args:
+        image_path: Path to the screenshot image file
+        profiles: List of Profile objects for target devices
+        layers: List of layer names to generate
+        persona: Optional persona name
+        summarizer: Optional summarizer (sync or async)
+        ocr_analyzer: Optional ScreenshotAnalyzer instance
+        redactor: Optional Redactor applied to the OCR text and regions right after extraction
+        max_concurrency: Maximum summarizer calls in flight at once
+        executor: Executor for input preparation and blocking summarizers
+        ocr_executor: Executor Tesseract runs in; its worker count bounds concurrent OCR
+            across requests (default: the loop's default executor)
+        deadline: Optional Deadline bounding OCR and summarization (see
+            `async_multi_profile_summarize`)
+        timeout: Seconds until the deadline (use instead of `deadline`)
+        cancel_token: Optional CancellationToken that expires the deadline when cancelled
+
+    Returns:
+        Nested dictionary: {profile_name: {layer_name: summary}} plus '_ocr_metadata'
+    """
+    deadline = Deadline.resolve(deadline, timeout, cancel_token)
+    loop = asyncio.get_running_loop()
+    ocr_result, text_density, adjusted_profiles = await loop.run_in_executor(
+        ocr_executor, analyze_for_profiles, image_path, profiles, ocr_analyzer, redactor, deadline
+    )
+
+    summaries: Dict[str, Any] = await async_multi_profile_summarize(
+        text=ocr_result.full_text,
+        profiles=adjusted_profiles,
+        layers=layers,
+        persona=persona,
+        summarizer=summarizer,
+        max_concurrency=max_concurrency,
+        executor=executor,
+        deadline=deadline
+    )
+
+    summaries['_ocr_metadata'] = ocr_metadata(ocr_result, text_density)
+    return summaries
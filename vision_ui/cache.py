@@ -0,0 +1,339 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.cache
+
+Content-addressed summary cache shared across calls, CLI runs and processes.
+An in-process LRU bounded by bytes sits in front of an optional SQLite store (WAL mode, evicted
+least-recently-used first by size); entries are keyed by a hash of the document, the character
+budget, the layer, the persona definition and the summarizer identity.
+"""
+
+import hashlib
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Union
+
+from . import __version__
+
+DEFAULT_MEMORY_BYTES = 32 * 1024 * 1024
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+CACHE_FORMAT = 2  # 2: budgets counted in display cells
+_SQL_BATCH = 500  # stay under SQLite's bound-variable limit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS summaries_accessed ON summaries (accessed);
+CREATE TABLE IF NOT EXISTS summary_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO summary_meta (name, value)
+    SELECT 'total_size', TOTAL(size) FROM summaries;
+CREATE TRIGGER IF NOT EXISTS summaries_size_insert AFTER INSERT ON summaries BEGIN
+    UPDATE summary_meta SET value = value + NEW.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS summaries_size_delete AFTER DELETE ON summaries BEGIN
+    UPDATE summary_meta SET value = value - OLD.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS summaries_size_update AFTER UPDATE OF size ON summaries BEGIN
+    UPDATE summary_meta SET value = value + NEW.size - OLD.size WHERE name = 'total_size';
+END;
+"""
+
+
+def text_hash(text: Union[str, bytes]) -> str:
+    """Content hash of a document, text or raw bytes (128-bit BLAKE2b, hex)."""
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def summarizer_identity(summarizer: Callable[[str, int], str]) -> Optional[str]:
+    """
+    Stable identity of a summarizer for cache keys, or None if it has none.
+
+    A summarizer may set a ``cache_id`` attribute (e.g. ``"my-llm:v3"``) and should change it
+    whenever its output changes. Otherwise module-level functions are identified by their
+    qualified name. Lambdas, closures, partials and callable objects carry state the name
+    does not capture, so they are not cached unless they set ``cache_id``.
+
+    Args:
+        summarizer: Summarizer callable
+
+    Returns:
+        Identity string, or None when results must not be cached
+    """
+    cache_id = getattr(summarizer, "cache_id", None)
+    if cache_id is not None:
+        return str(cache_id)
+    if not (inspect.isfunction(summarizer) or inspect.isbuiltin(summarizer)):
+        return None
+    qualname = getattr(summarizer, "__qualname__", "")
+    if not qualname or "<" in qualname:  # <lambda>, <locals>
+        return None
+    return f"{summarizer.__module__}.{qualname}"
+
+
+def default_cache_path() -> Path:
+    """
+    Default on-disk cache location.
+
+    ``$VISION_UI_CACHE_DIR`` if set, else ``$XDG_CACHE_HOME/vision-ui`` (``~/.cache/vision-ui``).
+    """
+    directory = os.environ.get("VISION_UI_CACHE_DIR")
+    if directory:
+        return Path(directory) / "summaries.sqlite3"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "vision-ui" / "summaries.sqlite3"
+
+
+def _entry_size(key: str, value: str) -> int:
+    return len(key) + len(value.encode("utf-8"))
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU of string values, bounded by total key+value bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_BYTES):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be non-negative, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        size = _entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= _entry_size(key, old)
+            self._entries[key] = value
+            self.size += size
+            while self.size > self.max_bytes:
+                old_key, old_value = self._entries.popitem(last=False)
+                self.size -= _entry_size(old_key, old_value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class SQLiteStore:
+    """
+    Summary store in a SQLite file, safe to share between processes.
+
+    The database runs in WAL mode so readers in other processes never block a writer. When
+    the stored key+value bytes exceed `max_bytes`, least-recently-read entries are deleted
+    down to 90% of the limit. The byte total is kept in a meta row by triggers, so checking
+    it does not scan the table on every write.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = DEFAULT_DISK_BYTES):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be non-negative, got {max_bytes}")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # INSERT OR REPLACE fires the delete trigger for the replaced row only with this on
+        self._conn.execute("PRAGMA recursive_triggers=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """Look up keys, marking hits as recently used."""
+        found: Dict[str, str] = {}
+        now = time.time()
+        with self._lock, self._conn:
+            for start in range(0, len(keys), _SQL_BATCH):
+                batch = keys[start:start + _SQL_BATCH]
+                marks = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM summaries WHERE key IN ({marks})", batch
+                ).fetchall()
+                found.update(rows)
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE summaries SET accessed = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows]
+                    )
+        return found
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        """Store entries, evicting old ones if the store grows past its limit."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                [(key, value, _entry_size(key, value), now) for key, value in items.items()]
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        (total,) = self._conn.execute(
+            "SELECT value FROM summary_meta WHERE name = 'total_size'"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * 0.9)
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM summaries ORDER BY accessed"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM summaries WHERE key = ?", doomed)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM summaries")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CacheStats:
+    """Hit/miss counts for a SummaryCache."""
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def format(self) -> str:
+        return (f"cache: {self.hits} hits ({self.memory_hits} memory, {self.disk_hits} disk), "
+                f"{self.misses} misses")
+
+
+class SummaryCache:
+    """
+    Two-tier summary cache: an in-process LRU in front of an optional SQLite store.
+
+    Disk hits are promoted into memory and writes go to both tiers. Pass one instance to
+    `multi_profile_summarize(cache=...)` or `layered_summarize(cache=...)`; point several
+    processes at the same `path` to share results between them.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        disk_bytes: int = DEFAULT_DISK_BYTES
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file for the persistent tier (None keeps the cache in memory only)
+            memory_bytes: Byte cap of the in-process LRU
+            disk_bytes: Byte cap of the SQLite store
+        """
+        self.memory = LRUCache(memory_bytes)
+        self.disk = SQLiteStore(path, disk_bytes) if path is not None else None
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(
+        doc_hash: str,
+        char_budget: int,
+        layer_name: str,
+        persona_key: Hashable,
+        summarizer_id: str
+    ) -> str:
+        """
+        Cache key for one layer summary.
+
+        Args:
+            doc_hash: `text_hash` of the document being summarized
+            char_budget: Character budget of the profile
+            layer_name: Layer name
+            persona_key: Persona definition (JSON text, or None without a persona)
+            summarizer_id: `summarizer_identity` of the summarizer
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        parts = (
+            CACHE_FORMAT, __version__, doc_hash, char_budget, layer_name, persona_key, summarizer_id
+        )
+        return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Look up keys in memory, then on disk; returns the entries found."""
+        found: Dict[str, str] = {}
+        missing = []
+        for key in keys:
+            value = self.memory.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        self.stats.memory_hits += len(found)
+        from_disk: Dict[str, str] = {}
+        if missing and self.disk is not None:
+            from_disk = self.disk.get_many(missing)
+            for key, value in from_disk.items():
+                self.memory.put(key, value)
+            found.update(from_disk)
+        self.stats.disk_hits += len(from_disk)
+        self.stats.misses += len(missing) - len(from_disk)
+        return found
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        """Store entries in both tiers."""
+        for key, value in items.items():
+            self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put_many(items)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        if self.disk is not None:
+            self.disk.close()
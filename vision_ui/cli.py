@@ -12,15 +12,36 @@ budget and perform a naive summary. `profile` and `report` commands are stubs fo
 """
 import argparse
 import json
+import os
 import sys
-from typing import Optional
+import time
+from pathlib import Path
+from typing import Optional, Union
 
 from UI_UX.budget import compute_budget, naive_summarize, pretty_budget
+from UI_UX.cell_width import cell_width
 
-from .profiles import parse_profiles_from_cli
+from .cache import SummaryCache, default_cache_path
+from .deadline import Deadline
+from .docindex import MappedDocument, load_or_build
+from .fonts import load_font_metrics
+from .normalize import TextNormalizer
+from .profile_pack import build_profile_pack
+from .profiles import DEFAULT_PROFILES, fit_profile, load_profile, parse_profiles_from_cli
+from .redaction import Redactor
+from .screening import SCREEN_ACTIONS, Screener, load_term_lists
 from .screenshot_handlers import screenshot_aware_summarize
-from .summarize import format_multi_profile_output, multi_profile_summarize
-from .triage import display_triage_board, format_triage_output
+from .store import ResultStore
+from .summarize import (
+    format_multi_profile_output,
+    format_persona_matrix_output,
+    iter_multi_profile_summarize,
+    multi_profile_summarize,
+)
+from .sweep import SWEEP_FORMATS, BudgetSweep, default_sweep_columns, parse_sweep
+from .token_profiles import TokenProfile
+from .triage import TriageBoard, display_triage_board, format_triage_output
+from .wrap import WrapFitter
 
 
 def _read_text_from_file_or_stdin(path: str) -> str:
@@ -30,15 +51,202 @@ def _read_text_from_file_or_stdin(path: str) -> str:
         return fh.read()
 
 
+def _normalizer_from_args(args: argparse.Namespace) -> Optional[TextNormalizer]:
+    if not getattr(args, "normalize", False):
+        return None
+    return TextNormalizer()
+
+
+def _report_normalization(normalizer: Optional[TextNormalizer]) -> None:
+    if normalizer is not None and normalizer.last_report is not None:
+        print(normalizer.last_report.format(), file=sys.stderr)
+
+
+def _redactor_from_args(args: argparse.Namespace) -> Optional[Redactor]:
+    if not getattr(args, "redact", False):
+        return None
+    return Redactor()
+
+
+def _report_redaction(redactor: Optional[Redactor]) -> None:
+    if redactor is not None and redactor.last_report is not None:
+        print(redactor.last_report.format(), file=sys.stderr)
+
+
+def _deadline_from_args(args: argparse.Namespace) -> Optional[Deadline]:
+    deadline_ms = getattr(args, "deadline_ms", None)
+    if deadline_ms is None:
+        return None
+    return Deadline(timeout=deadline_ms / 1000.0)
+
+
+def _report_deadline(deadline: Optional[Deadline]) -> None:
+    if deadline is not None and deadline.fallbacks:
+        print(deadline.format(), file=sys.stderr)
+
+
+def _cache_from_args(args: argparse.Namespace) -> Optional[SummaryCache]:
+    cache_path = getattr(args, "cache", None)
+    if cache_path is None:
+        return None
+    return SummaryCache(default_cache_path() if cache_path is True else cache_path)
+
+
+def _report_cache(cache: Optional[SummaryCache]) -> None:
+    if cache is not None:
+        print(cache.stats.format(), file=sys.stderr)
+        cache.close()
+
+
+def _store_from_args(args: argparse.Namespace) -> Optional[ResultStore]:
+    store_path = getattr(args, "store", None)
+    if store_path is None:
+        return None
+    return ResultStore(None if store_path is True else store_path)
+
+
+def _record_run(
+    store: Optional[ResultStore],
+    summaries: dict,
+    text: Union[str, bytes, MappedDocument],
+    doc_id: str,
+    persona: Optional[str],
+    started: float,
+    personas: bool = False
+) -> None:
+    if store is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    store.record(
+        summaries, text, doc_id=None if doc_id == "-" else os.path.abspath(doc_id),
+        persona=persona, elapsed_ms=elapsed_ms, personas=personas
+    )
+    store.close()
+
+
+def _wrap_fitter_from_args(args: argparse.Namespace) -> Optional[WrapFitter]:
+    if not getattr(args, "fit_wrapped", False):
+        return None
+    return WrapFitter()
+
+
+def _report_wrap(wrap_fitter: Optional[WrapFitter]) -> None:
+    if wrap_fitter is not None and wrap_fitter.last_report is not None:
+        print(wrap_fitter.last_report.format(), file=sys.stderr)
+
+
+def _screener_from_args(args: argparse.Namespace) -> Optional[Screener]:
+    terms_path = getattr(args, "screen_terms", None)
+    if not terms_path:
+        return None
+    return Screener(load_term_lists(terms_path))
+
+
+def _report_screening(screener: Optional[Screener]) -> None:
+    if screener is not None and screener.last_report is not None:
+        print(screener.last_report.format(), file=sys.stderr)
+
+
+def _summarize_progressive(
+    args: argparse.Namespace,
+    text: str,
+    profiles: list,
+    layers: list,
+    board: Optional[TriageBoard] = None
+) -> None:
+    """Stream results cheapest-first, to a triage board or as compact lines."""
+    normalizer = _normalizer_from_args(args)
+    screener = _screener_from_args(args)
+    redactor = _redactor_from_args(args)
+    results = iter_multi_profile_summarize(
+        text=text,
+        profiles=profiles,
+        layers=layers,
+        persona=args.persona,
+        normalizer=normalizer,
+        screener=screener,
+        screen_action=getattr(args, "screen_action", "flag"),
+        redactor=redactor
+    )
+    try:
+        if board is not None:
+            board.display_progressive(results, profiles)
+        else:
+            for profile, layer, summary in results:
+                print(f"{profile.name}.{layer}: {summary}", flush=True)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    _report_redaction(redactor)
+    _report_normalization(normalizer)
+    _report_screening(screener)
+
+
+def _cmd_budget_sweep(args: argparse.Namespace) -> None:
+    fmt = args.format or ("jsonl" if args.json else "csv")
+    columns = getattr(args, "columns", None)
+    try:
+        axes = parse_sweep(args.sweep)
+        if columns:
+            columns = [c.strip() for c in columns.split(",")]
+        else:
+            # Keep the binary matrix compact: integer columns only unless asked otherwise
+            columns = default_sweep_columns(axes, floats=fmt != "npy")
+        sweep = BudgetSweep(
+            axes,
+            fixed={"width": args.width, "height": args.height, "font": args.font,
+                   "ruler": args.ruler, "buffer": args.buffer},
+            columns=columns,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    output = getattr(args, "output", None)
+    if output is not None and output != "-":
+        with open(output, "wb" if fmt == "npy" else "w", encoding=None if fmt == "npy" else "utf-8",
+                  newline=None if fmt == "npy" else "") as fh:
+            sweep.write(fh, fmt)
+        return
+    try:
+        if fmt == "npy":
+            sweep.write(sys.stdout.buffer, fmt)
+            sys.stdout.buffer.flush()
+        else:
+            sweep.write(sys.stdout, fmt)
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `| head`); point stdout at devnull so the final
+        # flush at exit does not raise again, and exit without a traceback
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
+
 def cmd_budget(args: argparse.Namespace) -> None:
     if args.profile is not None:
         # Placeholder: profile-based lookup to be implemented later.
         raise NotImplementedError("Profile-based budgets are not implemented yet.")
 
+    if getattr(args, "sweep", None):
+        _cmd_budget_sweep(args)
+        return
+    if args.width is None or args.height is None:
+        print("Error: --width and --height are required (or use --sweep)", file=sys.stderr)
+        sys.exit(1)
+
+    font_file = getattr(args, "font_file", None)
+    try:
+        metrics = load_font_metrics(font_file, args.font) if font_file else None
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
     budget = compute_budget(
         width_px=args.width,
         height_px=args.height,
         font_size_px=args.font,
+        avg_char_width_px=metrics.avg_char_width_px if metrics else None,
         editor_ruler_columns=args.ruler,
         buffer=args.buffer,
     )
@@ -74,11 +282,11 @@ def cmd_summarize(args: argparse.Namespace) -> None:
 def cmd_profile(args: argparse.Namespace) -> None:
     """Manage screen profiles (list, create, edit, delete).
     
-    Phase 2 feature: Profile management is deferred. For now, use built-in profiles:
-    available profiles (laptop, phone, slides, tweet) or load custom JSON profiles.
+    Phase 2 feature: Profile management is deferred. For now, use the built-in profiles
+    (DEFAULT_PROFILES) or load custom JSON profiles.
     """
     print("Profile management is not yet implemented.", file=sys.stderr)
-    print("Available profiles: laptop, phone, slides, tweet", file=sys.stderr)
+    print(f"Available profiles: {', '.join(sorted(DEFAULT_PROFILES))}", file=sys.stderr)
     print("Or use --profile <path.json> with summarize/budget commands.", file=sys.stderr)
     sys.exit(1)
 
@@ -102,17 +310,46 @@ def cmd_triage_compare(args: argparse.Namespace) -> None:
     # Parse layers
     layers = [layer.strip() for layer in args.layers.split(',') if layer.strip()]
     
+    if getattr(args, "progressive", False):
+        board = TriageBoard()
+        if args.show_profile_info:
+            board.display_profile_info(profiles)
+        _summarize_progressive(args, text, profiles, layers, board)
+        return
+    
     # Generate summaries
     try:
+        normalizer = _normalizer_from_args(args)
+        screener = _screener_from_args(args)
+        redactor = _redactor_from_args(args)
+        deadline = _deadline_from_args(args)
+        cache = _cache_from_args(args)
+        store = _store_from_args(args)
+        wrap_fitter = _wrap_fitter_from_args(args)
+        started = time.perf_counter()
         summaries = multi_profile_summarize(
             text=text,
             profiles=profiles,
             layers=layers,
-            persona=args.persona
+            persona=args.persona,
+            normalizer=normalizer,
+            screener=screener,
+            screen_action=getattr(args, "screen_action", "flag"),
+            redactor=redactor,
+            deadline=deadline,
+            cache=cache,
+            wrap_fitter=wrap_fitter
         )
     except Exception as e:
         print(f"Error generating summaries: {e}", file=sys.stderr)
         sys.exit(1)
+    _report_redaction(redactor)
+    _report_normalization(normalizer)
+    _report_screening(screener)
+    _report_deadline(deadline)
+    _report_cache(cache)
+    _report_wrap(wrap_fitter)
+    _record_run(store, summaries, text, args.text, args.persona, started)
     
     # Display triage board
     display_triage_board(
@@ -125,7 +362,13 @@ def cmd_triage_compare(args: argparse.Namespace) -> None:
 
 def cmd_summarize_multi(args: argparse.Namespace) -> None:
     """Handle multi-profile summarization command."""
-    text = _read_text_from_file_or_stdin(args.file)
+    if getattr(args, "doc_index", False):
+        if args.file == "-":
+            print("Error: --doc-index needs a file, not stdin", file=sys.stderr)
+            sys.exit(1)
+        text = load_or_build(args.file, getattr(args, "index_dir", None))
+    else:
+        text = _read_text_from_file_or_stdin(args.file)
     
     # Parse profiles from CLI
     try:
@@ -137,20 +380,75 @@ def cmd_summarize_multi(args: argparse.Namespace) -> None:
     # Parse layers
     layers = [layer.strip() for layer in args.layers.split(',') if layer.strip()]
     
+    # Parse persona matrix
+    personas_arg = getattr(args, "personas", None)
+    personas = None
+    if personas_arg:
+        personas = [name.strip() for name in personas_arg.split(',') if name.strip()]
+    
+    if getattr(args, "progressive", False):
+        if personas is not None:
+            print("Error: --progressive cannot be combined with --personas", file=sys.stderr)
+            sys.exit(1)
+        board = None
+        if args.format == "triage":
+            board = TriageBoard()
+            if args.show_profile_info:
+                board.display_profile_info(profiles)
+        _summarize_progressive(args, text, profiles, layers, board)
+        return
+    
     # Generate summaries
     try:
+        normalizer = _normalizer_from_args(args)
+        screener = _screener_from_args(args)
+        redactor = _redactor_from_args(args)
+        deadline = _deadline_from_args(args)
+        cache = _cache_from_args(args)
+        store = _store_from_args(args)
+        wrap_fitter = _wrap_fitter_from_args(args)
+        started = time.perf_counter()
         summaries = multi_profile_summarize(
             text=text,
             profiles=profiles,
             layers=layers,
-            persona=args.persona
+            persona=args.persona,
+            normalizer=normalizer,
+            personas=personas,
+            screener=screener,
+            screen_action=getattr(args, "screen_action", "flag"),
+            redactor=redactor,
+            deadline=deadline,
+            cache=cache,
+            wrap_fitter=wrap_fitter
         )
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    _report_redaction(redactor)
+    _report_normalization(normalizer)
+    _report_screening(screener)
+    _report_deadline(deadline)
+    _report_cache(cache)
+    _report_wrap(wrap_fitter)
+    _record_run(store, summaries, text, args.file, args.persona, started, personas is not None)
+    if isinstance(text, MappedDocument):
+        text.close()
     
     # Format output
-    if args.format == "triage":
+    if personas is not None:
+        if args.format == "triage":
+            for persona_name, persona_summaries in summaries.items():
+                print(f"##### {persona_name.upper()} #####")
+                print(format_triage_output(
+                    summaries=persona_summaries,
+                    profiles=profiles,
+                    show_profile_info=args.show_profile_info,
+                    show_metadata=args.show_metadata
+                ))
+        else:
+            print(format_persona_matrix_output(summaries, args.format))
+    elif args.format == "triage":
         formatted_output = format_triage_output(
             summaries=summaries,
             profiles=profiles,
@@ -177,18 +475,32 @@ def cmd_summarize_screenshot(args: argparse.Namespace) -> None:
     
     # Generate summaries from screenshot
     try:
+        redactor = _redactor_from_args(args)
+        deadline = _deadline_from_args(args)
+        cache = _cache_from_args(args)
+        store = _store_from_args(args)
+        started = time.perf_counter()
         summaries = screenshot_aware_summarize(
             image_path=args.image,
             profiles=profiles,
             layers=layers,
-            persona=args.persona
+            persona=args.persona,
+            redactor=redactor,
+            deadline=deadline,
+            cache=cache
         )
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    _report_redaction(redactor)
+    _report_deadline(deadline)
+    _report_cache(cache)
     
     # Extract OCR metadata for display
     ocr_metadata = summaries.pop('_ocr_metadata', {})
+    if store is not None:
+        with open(args.image, "rb") as fh:
+            _record_run(store, summaries, fh.read(), args.image, args.persona, started)
     
     # Choose output format
     if args.format == "triage":
@@ -214,6 +526,106 @@ def cmd_summarize_screenshot(args: argparse.Namespace) -> None:
             print(f"Image size: {ocr_metadata.get('image_size', 'N/A')}")
 
 
+def cmd_search(args: argparse.Namespace) -> None:
+    """Search summaries recorded with --store."""
+    try:
+        store = ResultStore(args.store)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    hits = store.search(
+        args.query, limit=args.limit, profile=args.profile, layer=args.layer, persona=args.persona
+    )
+    store.close()
+    if args.format == "json":
+        print(json.dumps([hit.to_dict() for hit in hits], indent=2))
+        return
+    if not hits:
+        print("No matching summaries.", file=sys.stderr)
+        return
+    for hit in hits:
+        print(hit.format())
+
+
+def cmd_index(args: argparse.Namespace) -> None:
+    """Build (or refresh) memory-mappable indexes for text files."""
+    for path in args.files:
+        try:
+            doc = load_or_build(path, args.index_dir)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error indexing {path}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"{doc.path}: {doc.sentence_count} sentences, {doc.vocabulary_size} terms")
+        doc.close()
+
+
+def cmd_fit(args: argparse.Namespace) -> None:
+    """Solve the screen width, height or font size each profile needs for a text length."""
+    if args.chars is not None:
+        target_chars = args.chars
+    else:
+        try:
+            # Budgets count display cells, so wide (CJK) characters count twice
+            target_chars = cell_width(_read_text_from_file_or_stdin(args.file).strip())
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading input: {e}", file=sys.stderr)
+            sys.exit(1)
+    try:
+        profiles = parse_profiles_from_cli(args.profiles)
+        fitted = []
+        for profile in profiles:
+            if isinstance(profile, TokenProfile):
+                # Selectors such as tag:NAME can mix in prompt profiles; they have no screen
+                print(f"Skipping {profile.name}: token profiles have no screen to fit",
+                      file=sys.stderr)
+                continue
+            fitted.append((profile, fit_profile(profile, args.solve, target_chars)))
+    except (ValueError, OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    field = {"width": "width_px", "height": "height_px", "font": "font_size_px"}[args.solve]
+    if args.format == "json":
+        print(json.dumps({
+            profile.name: None if fit is None else {
+                field: getattr(fit, field),
+                "target_chars": int(compute_budget(
+                    fit.width_px, fit.height_px, font_size_px=fit.font_size_px,
+                    avg_char_width_px=None if args.solve == "font" else fit.avg_char_width_px,
+                    editor_ruler_columns=fit.editor_ruler_columns, buffer=fit.buffer
+                )["target_chars"]),
+            }
+            for profile, fit in fitted
+        }, indent=2))
+        return
+    relation = "<=" if args.solve == "font" else ">="
+    for profile, fit in fitted:
+        if fit is None:
+            print(f"{profile.name}: no {args.solve} fits {target_chars} chars")
+        else:
+            print(f"{profile.name}: {field} {relation} {getattr(fit, field)} "
+                  f"(was {getattr(profile, field)}) for {target_chars} chars")
+
+
+def cmd_profile_pack(args: argparse.Namespace) -> None:
+    """Pack profile files, directories of them and named profiles into one indexed file."""
+    profiles = []
+    try:
+        for source in args.sources:
+            path = Path(source)
+            if path.is_dir():
+                profiles.extend(load_profile(p) for p in sorted(path.glob("*.json")))
+            else:
+                # A string is looked up as a profile name; an existing file is loaded as a path
+                profiles.append(load_profile(path if path.is_file() else source))
+        build_profile_pack(profiles, args.output)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    tags = {tag for profile in profiles for tag in profile.tags or ()}
+    print(f"Packed {len(profiles)} profiles ({len(tags)} tags) into {args.output}")
+
+
 def cmd_report(args: argparse.Namespace) -> None:
     """Generate multi-profile reports in HTML/CSV/JSON format.
     
@@ -237,9 +649,15 @@ def build_parser() -> argparse.ArgumentParser:
         "budget",
         help="Compute a one-screen budget for a given window size.",
     )
-    p_budget.add_argument("--width", type=int, required=True, help="Window width in pixels.")
-    p_budget.add_argument("--height", type=int, required=True, help="Window height in pixels.")
+    p_budget.add_argument("--width", type=int, default=None, help="Window width in pixels.")
+    p_budget.add_argument("--height", type=int, default=None, help="Window height in pixels.")
     p_budget.add_argument("--font", type=int, default=14, help="Font size in pixels (default: 14).")
+    p_budget.add_argument(
+        "--font-file",
+        default=None,
+        help="TTF/OTF font to measure character widths with instead of the 0.55 x font size "
+             "estimate (needs Pillow on first use; width tables are cached).",
+    )
     p_budget.add_argument(
         "--ruler",
         type=int,
@@ -263,6 +681,37 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Output full budget as JSON instead of a one-line summary.",
     )
+    p_budget.add_argument(
+        "--sweep",
+        nargs="+",
+        default=None,
+        metavar="NAME=START:STOP[:STEP]",
+        help="Compute budgets for every combination of the given ranges (inclusive) or "
+             "comma-separated values of width, height, font, ruler and buffer, e.g. "
+             "--sweep width=320:3840:16 height=480:2160:16 font=10:24. Parameters that are not "
+             "swept use --width/--height/--font/--ruler/--buffer.",
+    )
+    p_budget.add_argument(
+        "--format",
+        choices=SWEEP_FORMATS,
+        default=None,
+        help="Sweep output: csv (default; jsonl with --json), jsonl, or npy "
+             "(binary matrix shaped like the sweep grid, integer columns by default, for "
+             "numpy.load).",
+    )
+    p_budget.add_argument(
+        "--columns",
+        default=None,
+        help="Comma-separated sweep output columns (default: swept parameters, then all "
+             "budget fields).",
+    )
+    p_budget.add_argument(
+        "--output",
+        "-o",
+        default=None,
+        metavar="PATH",
+        help="Write sweep output to PATH instead of stdout.",
+    )
     p_budget.set_defaults(func=cmd_budget)
 
     # summarize
@@ -314,7 +763,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--profiles",
         type=str,
         required=True,
-        help="Comma-separated profile names (e.g., 'phone,laptop,slides').",
+        help="Comma-separated profile names or selectors (e.g., 'phone,laptop', 'tag:android').",
     )
     p_sum_multi.add_argument(
         "--profile-buffer",
@@ -334,6 +783,13 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional persona name (developer, designer, manager).",
     )
+    p_sum_multi.add_argument(
+        "--personas",
+        type=str,
+        default=None,
+        help="Comma-separated persona names to render in one run, sharing segmentation "
+             "(e.g., 'developer,designer,manager'). Cannot be combined with --persona.",
+    )
     p_sum_multi.add_argument(
         "--format",
         type=str,
@@ -351,6 +807,81 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Show metadata when supported (triage format).",
     )
+    p_sum_multi.add_argument(
+        "--fit-wrapped",
+        action="store_true",
+        help="Word-wrap each summary at the profile's columns and drop trailing sentences "
+             "until it fits the screen's lines (counts are reported on stderr).",
+    )
+    p_sum_multi.add_argument(
+        "--normalize",
+        action="store_true",
+        help="Strip escape codes, collapse whitespace and drop repeated lines before summarizing "
+             "(byte savings per stage are reported on stderr).",
+    )
+    p_sum_multi.add_argument(
+        "--screen-terms",
+        type=str,
+        default=None,
+        help="Term list file (JSON {category: [terms]}, JSON list, or one term per line) "
+             "to screen input and summaries against; matches are reported on stderr.",
+    )
+    p_sum_multi.add_argument(
+        "--screen-action",
+        type=str,
+        default="flag",
+        choices=list(SCREEN_ACTIONS),
+        help="What to do with input sentences matching --screen-terms (default: flag).",
+    )
+    p_sum_multi.add_argument(
+        "--redact",
+        action="store_true",
+        help="Redact emails, IP addresses, API tokens and card numbers before summarizing "
+             "(counts are reported on stderr).",
+    )
+    p_sum_multi.add_argument(
+        "--progressive",
+        action="store_true",
+        help="Print each result as soon as it is ready, cheapest first (headlines before "
+             "deep layers).",
+    )
+    p_sum_multi.add_argument(
+        "--deadline-ms",
+        type=int,
+        default=None,
+        help="Time budget in milliseconds; layers not finished in time fall back to prefix "
+             "summaries marked '[partial]'.",
+    )
+    p_sum_multi.add_argument(
+        "--cache",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help="Reuse layer summaries from earlier runs via an SQLite cache shared between "
+             "processes (default path: $VISION_UI_CACHE_DIR or ~/.cache/vision-ui).",
+    )
+    p_sum_multi.add_argument(
+        "--store",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help="Record this run's summaries in the searchable result store (see 'search'; "
+             "default path: results.sqlite3 next to the cache).",
+    )
+    p_sum_multi.add_argument(
+        "--doc-index",
+        action="store_true",
+        help="Open the file through its memory-mapped document index (built or refreshed "
+             "as needed; see 'index'), skipping decoding and segmentation on later runs.",
+    )
+    p_sum_multi.add_argument(
+        "--index-dir",
+        type=str,
+        default=None,
+        help="Directory for document index files (default: next to the input file).",
+    )
     p_sum_multi.set_defaults(func=cmd_summarize_multi)
 
     # triage-compare
@@ -368,7 +899,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--profiles",
         type=str,
         required=True,
-        help="Comma-separated profile names (e.g., 'phone,laptop,slides').",
+        help="Comma-separated profile names or selectors (e.g., 'phone,laptop', 'tag:android').",
     )
     p_triage.add_argument(
         "--profile-buffer",
@@ -398,6 +929,69 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Show metadata when available (e.g., OCR).",
     )
+    p_triage.add_argument(
+        "--fit-wrapped",
+        action="store_true",
+        help="Word-wrap each summary at the profile's columns and drop trailing sentences "
+             "until it fits the screen's lines (counts are reported on stderr).",
+    )
+    p_triage.add_argument(
+        "--normalize",
+        action="store_true",
+        help="Strip escape codes, collapse whitespace and drop repeated lines before summarizing "
+             "(byte savings per stage are reported on stderr).",
+    )
+    p_triage.add_argument(
+        "--screen-terms",
+        type=str,
+        default=None,
+        help="Term list file (JSON {category: [terms]}, JSON list, or one term per line) "
+             "to screen input and summaries against; matches are reported on stderr.",
+    )
+    p_triage.add_argument(
+        "--screen-action",
+        type=str,
+        default="flag",
+        choices=list(SCREEN_ACTIONS),
+        help="What to do with input sentences matching --screen-terms (default: flag).",
+    )
+    p_triage.add_argument(
+        "--redact",
+        action="store_true",
+        help="Redact emails, IP addresses, API tokens and card numbers before summarizing "
+             "(counts are reported on stderr).",
+    )
+    p_triage.add_argument(
+        "--progressive",
+        action="store_true",
+        help="Print each result as soon as it is ready, cheapest first (headlines before "
+             "deep layers).",
+    )
+    p_triage.add_argument(
+        "--deadline-ms",
+        type=int,
+        default=None,
+        help="Time budget in milliseconds; layers not finished in time fall back to prefix "
+             "summaries marked '[partial]'.",
+    )
+    p_triage.add_argument(
+        "--cache",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help="Reuse layer summaries from earlier runs via an SQLite cache shared between "
+             "processes (default path: $VISION_UI_CACHE_DIR or ~/.cache/vision-ui).",
+    )
+    p_triage.add_argument(
+        "--store",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help="Record this run's summaries in the searchable result store (see 'search'; "
+             "default path: results.sqlite3 next to the cache).",
+    )
     p_triage.set_defaults(func=cmd_triage_compare)
 
     # summarize-screenshot
@@ -415,7 +1009,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--profiles",
         type=str,
         required=True,
-        help="Comma-separated profile names (e.g., 'phone,laptop,slides').",
+        help="Comma-separated profile names or selectors (e.g., 'phone,laptop', 'tag:android').",
     )
     p_sum_screenshot.add_argument(
         "--profile-buffer",
@@ -452,8 +1046,161 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Display detailed profile information (only with triage format).",
     )
+    p_sum_screenshot.add_argument(
+        "--redact",
+        action="store_true",
+        help="Redact emails, IP addresses, API tokens and card numbers before summarizing "
+             "(counts are reported on stderr).",
+    )
+    p_sum_screenshot.add_argument(
+        "--deadline-ms",
+        type=int,
+        default=None,
+        help="Time budget in milliseconds; layers not finished in time fall back to prefix "
+             "summaries marked '[partial]'.",
+    )
+    p_sum_screenshot.add_argument(
+        "--cache",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help="Reuse layer summaries from earlier runs via an SQLite cache shared between "
+             "processes (default path: $VISION_UI_CACHE_DIR or ~/.cache/vision-ui).",
+    )
+    p_sum_screenshot.add_argument(
+        "--store",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help="Record this run's summaries in the searchable result store (see 'search'; "
+             "default path: results.sqlite3 next to the cache).",
+    )
     p_sum_screenshot.set_defaults(func=cmd_summarize_screenshot)
 
+    # search
+    p_search = sub.add_parser(
+        "search",
+        help="Full-text search over summaries recorded with --store.",
+    )
+    p_search.add_argument(
+        "query",
+        type=str,
+        help="Search terms; FTS5 syntax such as \"exact phrase\", OR and prefix* is supported.",
+    )
+    p_search.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of results (default: 20).",
+    )
+    p_search.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help="Only show summaries for this profile.",
+    )
+    p_search.add_argument(
+        "--layer",
+        type=str,
+        default=None,
+        help="Only show summaries for this layer.",
+    )
+    p_search.add_argument(
+        "--persona",
+        type=str,
+        default=None,
+        help="Only show summaries for this persona.",
+    )
+    p_search.add_argument(
+        "--store",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Result store to search (default: results.sqlite3 next to the cache).",
+    )
+    p_search.add_argument(
+        "--format",
+        type=str,
+        default="text",
+        choices=["text", "json"],
+        help="Output format (default: text).",
+    )
+    p_search.set_defaults(func=cmd_search)
+
+    # index
+    p_index = sub.add_parser(
+        "index",
+        help="Build memory-mappable document indexes for files summarized repeatedly.",
+    )
+    p_index.add_argument(
+        "files",
+        nargs="+",
+        help="Text files to index (indexes are rebuilt only if a file changed).",
+    )
+    p_index.add_argument(
+        "--index-dir",
+        type=str,
+        default=None,
+        help="Directory for index files (default: next to each file, as FILE.vdx).",
+    )
+    p_index.set_defaults(func=cmd_index)
+
+    # fit
+    p_fit = sub.add_parser(
+        "fit",
+        help="Find the smallest width/height or largest font that fits a text on each profile.",
+    )
+    fit_input = p_fit.add_mutually_exclusive_group(required=True)
+    fit_input.add_argument(
+        "--chars",
+        type=int,
+        default=None,
+        help="Number of characters the screen must hold.",
+    )
+    fit_input.add_argument(
+        "--file",
+        type=str,
+        default=None,
+        help="Text (e.g. a summary) whose length the screen must hold, or '-' for stdin.",
+    )
+    p_fit.add_argument(
+        "--solve",
+        choices=["width", "height", "font"],
+        required=True,
+        help="Parameter to solve; the profiles' other settings stay fixed.",
+    )
+    p_fit.add_argument(
+        "--profiles",
+        type=str,
+        default="laptop,phone,slides,tweet",
+        help="Comma-separated profile names (default: the built-in screen profiles).",
+    )
+    p_fit.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text).",
+    )
+    p_fit.set_defaults(func=cmd_fit)
+
+    # profile-pack
+    p_pack = sub.add_parser(
+        "profile-pack",
+        help="Pack many profiles into one indexed .vpk file for the profile directory.",
+    )
+    p_pack.add_argument(
+        "output",
+        help="Pack file to write (e.g. vision_ui/profiles/devices.vpk).",
+    )
+    p_pack.add_argument(
+        "sources",
+        nargs="+",
+        help="Profile JSON files, directories of them, or profile names.",
+    )
+    p_pack.set_defaults(func=cmd_profile_pack)
+
     # profile (stub)
     p_profile = sub.add_parser(
         "profile",
@@ -0,0 +1,102 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.deadline
+
+Deadlines and cancellation tokens for time-boxed summarization.
+Work checks the deadline cooperatively between steps; layers that cannot finish in time fall
+back to the cheapest available result and are marked with DEADLINE_MARKER.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+DEADLINE_MARKER = "[partial] "
+# How often a wait for results checks a CancellationToken when it has no time limit to wait on
+CANCEL_POLL_SECONDS = 0.01
+
+
+class CancellationToken:
+    """Thread-safe flag a caller sets to stop in-progress summarization early."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation; work checking this token stops at its next step."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class Deadline:
+    """
+    A point in time after which work should stop, optionally tied to a CancellationToken.
+
+    Also counts how many results fell back to a cheaper summary, for reporting.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        token: Optional[CancellationToken] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Start a deadline.
+
+        Args:
+            timeout: Seconds from now until the deadline (None for no time limit)
+            token: Optional cancellation token; a cancelled token expires the deadline
+            clock: Monotonic clock in seconds
+        """
+        self._clock = clock
+        self.expires_at = None if timeout is None else clock() + timeout
+        self.token = token
+        self.fallbacks = 0
+
+    @classmethod
+    def resolve(
+        cls,
+        deadline: Optional["Deadline"] = None,
+        timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Optional["Deadline"]:
+        """
+        Build a Deadline from the `deadline=`/`timeout=`/`cancel_token=` arguments.
+
+        Returns None when none of them is given.
+        """
+        if deadline is not None:
+            if timeout is not None or cancel_token is not None:
+                raise ValueError("Pass either deadline or timeout/cancel_token, not both")
+            return deadline
+        if timeout is None and cancel_token is None:
+            return None
+        if timeout is not None and timeout < 0:
+            raise ValueError(f"timeout must be non-negative, got {timeout}")
+        return cls(timeout, cancel_token)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (0.0 once expired or cancelled), or None with no time limit."""
+        if self.token is not None and self.token.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0.0
+
+    def format(self) -> str:
+        """Human-readable note on results that missed the deadline."""
+        return f"deadline: {self.fallbacks} results fell back to prefix summaries"
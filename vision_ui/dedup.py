@@ -0,0 +1,260 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.dedup
+
+Near-duplicate detection for summarization inputs.
+Fingerprints documents with 64-bit SimHash and indexes them in permuted tables so that
+re-sent alerts and lightly edited tickets can reuse a previously computed summary.
+"""
+
+import hashlib
+import re
+import threading
+from array import array
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+from typing import Any, Hashable, List, Optional
+
+FINGERPRINT_BITS = 64
+_MASK = (1 << FINGERPRINT_BITS) - 1
+_TOKEN_RE = re.compile(r"\w+")
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+_MAX_TABLES = 32  # cap on permuted tables; large thresholds fall back to narrower keys
+_MIN_SLOT_BITS = 6
+_EMPTY = -1
+_GOLDEN = 0x9E3779B97F4A7C15  # 2**64 / golden ratio, for multiplicative hashing
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    """Stable 64-bit hash for a feature (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint for text.
+
+    Features are lowercased word tokens weighted by frequency, so documents that differ
+    by a timestamp or a reworded line land a few bits apart.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Fingerprint as an unsigned 64-bit integer
+    """
+    counts = Counter(_TOKEN_RE.findall(text.lower()))
+    if not counts:
+        return 0
+
+    weights = [0] * FINGERPRINT_BITS
+    for feature, weight in counts.items():
+        h = _feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            if (h >> bit) & 1:
+                weights[bit] += weight
+            else:
+                weights[bit] -= weight
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin((a ^ b) & _MASK).count("1")
+
+
+def _block_masks(blocks: int) -> List[int]:
+    """Split the fingerprint into `blocks` contiguous bit blocks of near-equal width."""
+    base, extra = divmod(FINGERPRINT_BITS, blocks)
+    masks = []
+    shift = 0
+    for i in range(blocks):
+        width = base + (1 if i < extra else 0)
+        masks.append(((1 << width) - 1) << shift)
+        shift += width
+    return masks
+
+
+def _table_masks(threshold: int, max_entries: int) -> List[int]:
+    """
+    Bit masks of the permuted tables for a threshold, wide enough for `max_entries` entries.
+
+    With the fingerprint split into B blocks, a fingerprint within ``threshold`` bits of a
+    stored one agrees with it on at least ``B - threshold`` whole blocks, so one table per
+    choice of those blocks finds every near-duplicate. More blocks mean more tables but wider
+    keys: B is the smallest count whose keys have about one entry per value at capacity.
+    """
+    wanted_bits = max(16, max_entries.bit_length() + 1)
+    blocks = threshold + 1  # plain pigeonhole banding
+    while blocks < FINGERPRINT_BITS:
+        if FINGERPRINT_BITS * (blocks - threshold) // blocks >= wanted_bits:
+            break
+        if comb(blocks + 1, threshold) > _MAX_TABLES:
+            break
+        blocks += 1
+    block_masks = _block_masks(blocks)
+    masks = []
+    for kept in combinations(block_masks, blocks - threshold):
+        mask = 0
+        for block in kept:
+            mask |= block
+        masks.append(mask)
+    return masks
+
+
+class SimHashIndex:
+    """
+    Permuted-table SimHash index for near-duplicate lookup.
+
+    Each table keys entries on a subset of the fingerprint's bits chosen so that any
+    fingerprint within ``threshold`` bits of a stored one shares the full key in at least one
+    table (see `_table_masks`). A lookup probes one slot run per table and compares only the
+    few entries found there. Tables are open-addressing arrays of entry ids, and the index
+    holds at most ``max_entries`` entries, evicting the oldest first. Adds and lookups are
+    serialized by a lock, so one index can be shared between threads.
+    """
+
+    def __init__(self, threshold: int = 3, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize an empty index.
+
+        Args:
+            threshold: Maximum Hamming distance treated as a near-duplicate
+            max_entries: Entries kept before the oldest are evicted
+        """
+        if threshold < 0 or threshold >= FINGERPRINT_BITS:
+            raise ValueError(f"threshold must be between 0 and {FINGERPRINT_BITS - 1}")
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._masks = _table_masks(threshold, max_entries)
+        self._slot_bits = _MIN_SLOT_BITS
+        self._tables = [self._empty_table() for _ in self._masks]
+        self._fingerprints = array("Q")
+        self._keys: List[Hashable] = []
+        self._values: List[Any] = []
+        self._next = 0  # entry id written next; the oldest entry once the index is full
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _empty_table(self) -> array:
+        return array("i", [_EMPTY]) * (1 << self._slot_bits)
+
+    def _home(self, key: int) -> int:
+        """Home slot of a table key (multiplicative hashing of the masked fingerprint)."""
+        return ((key * _GOLDEN) & _MASK) >> (FINGERPRINT_BITS - self._slot_bits)
+
+    def _insert(self, table: array, mask: int, entry_id: int) -> None:
+        slot = self._home(self._fingerprints[entry_id] & mask)
+        last = len(table) - 1
+        while table[slot] != _EMPTY:
+            slot = (slot + 1) & last
+        table[slot] = entry_id
+
+    def _remove(self, table: array, mask: int, entry_id: int) -> None:
+        """Remove an entry, shifting later entries of its probe run back (no tombstones)."""
+        last = len(table) - 1
+        slot = self._home(self._fingerprints[entry_id] & mask)
+        while table[slot] != entry_id:
+            slot = (slot + 1) & last
+        probe = slot
+        while True:
+            probe = (probe + 1) & last
+            other = table[probe]
+            if other == _EMPTY:
+                break
+            home = self._home(self._fingerprints[other] & mask)
+            # Move `other` into the hole unless its home lies cyclically in (slot, probe]
+            if (slot < probe and (home <= slot or home > probe)) or \
+                    (slot > probe and home <= slot and home > probe):
+                table[slot] = other
+                slot = probe
+        table[slot] = _EMPTY
+
+    def _grow(self) -> None:
+        self._slot_bits += 1
+        self._tables = [self._empty_table() for _ in self._masks]
+        for table, mask in zip(self._tables, self._masks):
+            for entry_id in range(len(self._fingerprints)):
+                self._insert(table, mask, entry_id)
+
+    def add(self, fingerprint: int, key: Hashable, value: Any) -> int:
+        """
+        Store a value under a fingerprint and an exact-match key.
+
+        Args:
+            fingerprint: SimHash of the document
+            key: Hashable key that must match exactly on lookup (e.g. run configuration)
+            value: Object to return on a near-duplicate hit
+
+        Returns:
+            Entry id (ids of evicted entries are reused)
+        """
+        with self._lock:
+            entry_id = self._next
+            if len(self._fingerprints) < self.max_entries:
+                self._fingerprints.append(fingerprint & _MASK)
+                self._keys.append(key)
+                self._values.append(value)
+                if len(self._fingerprints) * 4 > 3 << self._slot_bits:
+                    self._grow()  # reinserts the new entry too
+                    self._next = len(self._fingerprints) % self.max_entries
+                    return entry_id
+            else:
+                for table, mask in zip(self._tables, self._masks):
+                    self._remove(table, mask, entry_id)
+                self._fingerprints[entry_id] = fingerprint & _MASK
+                self._keys[entry_id] = key
+                self._values[entry_id] = value
+            for table, mask in zip(self._tables, self._masks):
+                self._insert(table, mask, entry_id)
+            self._next = (entry_id + 1) % self.max_entries
+            return entry_id
+
+    def lookup(self, fingerprint: int, key: Hashable) -> Optional[Any]:
+        """
+        Return the value of the closest stored entry within the threshold, if any.
+
+        Ties are broken in favour of the most recently added entry.
+        """
+        with self._lock:
+            fingerprint &= _MASK
+            fingerprints = self._fingerprints
+            best_id = -1
+            best_distance = self.threshold
+            best_age = -1
+            for table, mask in zip(self._tables, self._masks):
+                wanted = fingerprint & mask
+                last = len(table) - 1
+                slot = self._home(wanted)
+                entry_id = table[slot]
+                while entry_id != _EMPTY:
+                    stored = fingerprints[entry_id]
+                    if stored & mask == wanted and self._keys[entry_id] == key:
+                        distance = bin(fingerprint ^ stored).count("1")
+                        if distance <= best_distance:
+                            # Ids are reused in a ring, so recency is the distance from the oldest
+                            age = (entry_id - self._next) % len(fingerprints)
+                            if distance < best_distance or age > best_age:
+                                best_id, best_distance, best_age = entry_id, distance, age
+                    slot = (slot + 1) & last
+                    entry_id = table[slot]
+
+            return self._values[best_id] if best_id >= 0 else None
@@ -0,0 +1,332 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.docindex
+
+Memory-mappable binary index for documents that are summarized repeatedly.
+An index file holds the UTF-8 text, the sentence offset/length arrays, the sentence prefix index
+and per-sentence term ids as packed little-endian blocks. Opening one maps the file instead of
+reading it, so later runs skip decoding and segmentation and worker processes share the pages.
+"""
+
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .cache import text_hash
+from .segments import SegmentedText
+
+INDEX_SUFFIX = ".vdx"
+MAGIC = b"VUDX"
+FORMAT_VERSION = 2  # 2: prefix index in display cells
+
+# magic, version, sentences, vocabulary size, text bytes, term ids, vocabulary bytes,
+# source size, source mtime (ns), digest (text_hash), content hash (deep-layer provenance)
+_HEADER = struct.Struct("<4sIIIQQQQQ16s8s")
+_TOKEN_RE = re.compile(r"\w+")
+
+# Packed block layout after the header, each block padded to 8 bytes: (name, typecode)
+_BLOCKS: Tuple[Tuple[str, str], ...] = (
+    ("starts", "Q"),         # byte offset of each stripped sentence in the text
+    ("byte_lengths", "I"),   # UTF-8 length of each sentence
+    ("char_lengths", "I"),   # character length of each sentence
+    ("prefix", "q"),         # SegmentedText.prefix_lengths (display cells)
+    ("term_starts", "Q"),    # CSR row offsets into term_ids (sentences + 1)
+    ("term_ids", "I"),       # vocabulary id of every token, sentence by sentence
+    ("vocab_starts", "Q"),   # byte offset of each term in the vocabulary blob (terms + 1)
+)
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _le(values: array) -> bytes:
+    """Little-endian bytes of a packed array."""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def index_path_for(source: Union[str, Path], index_dir: Optional[Union[str, Path]] = None) -> Path:
+    """Index file for a source document: ``<source>.vdx``, or inside `index_dir` if given."""
+    source = Path(source)
+    directory = Path(index_dir) if index_dir is not None else source.parent
+    return directory / (source.name + INDEX_SUFFIX)
+
+
+def build_index(
+    text: str,
+    path: Union[str, Path],
+    source_stat: Optional[os.stat_result] = None
+) -> Path:
+    """
+    Segment and tokenize a document once and write its index file.
+
+    Sentences follow `SegmentedText` (stripped, non-empty '.'-separated pieces); terms are
+    lowercased word tokens.
+
+    Args:
+        text: Document text
+        path: Index file to write (replaced atomically)
+        source_stat: Optional stat of the source file, stored so `load_or_build` can tell
+            when the index is stale
+
+    Returns:
+        Path of the written index
+    """
+    data = text.encode("utf-8")
+    segments = SegmentedText.from_text(text)
+
+    starts = array("Q")
+    byte_lengths = array("I")
+    char_lengths = array("I")
+    term_starts = array("Q", [0])
+    term_ids = array("I")
+    vocabulary: Dict[str, int] = {}
+
+    offset = 0
+    for piece in segments.pieces:
+        piece_bytes = len(piece.encode("utf-8"))
+        sentence = piece.strip()
+        if sentence:
+            lead = len(piece) - len(piece.lstrip())
+            starts.append(offset + len(piece[:lead].encode("utf-8")))
+            byte_lengths.append(len(sentence.encode("utf-8")))
+            char_lengths.append(len(sentence))
+            for token in _TOKEN_RE.findall(sentence.lower()):
+                term_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+            term_starts.append(len(term_ids))
+        offset += piece_bytes + 1  # the '.' separator
+
+    vocab_starts = array("Q", [0])
+    vocab_blob = bytearray()
+    for term in vocabulary:  # insertion order == id order
+        vocab_blob += term.encode("utf-8")
+        vocab_starts.append(len(vocab_blob))
+
+    blocks = {
+        "starts": starts,
+        "byte_lengths": byte_lengths,
+        "char_lengths": char_lengths,
+        "prefix": array("q", segments.prefix_lengths),
+        "term_starts": term_starts,
+        "term_ids": term_ids,
+        "vocab_starts": vocab_starts,
+    }
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(starts), len(vocabulary), len(data), len(term_ids),
+        len(vocab_blob),
+        source_stat.st_size if source_stat else 0,
+        source_stat.st_mtime_ns if source_stat else 0,
+        bytes.fromhex(text_hash(text)),
+        segments.content_hash.encode("ascii"),
+    )
+
+    path = Path(path)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(header)
+        for chunk in [data] + [_le(blocks[name]) for name, _ in _BLOCKS] + [bytes(vocab_blob)]:
+            fh.write(chunk)
+            fh.write(b"\0" * (_padded(len(chunk)) - len(chunk)))
+    os.replace(tmp, path)
+    return path
+
+
+class _MappedSentences(Sequence[str]):
+    """Sentences decoded from the mapped text on access."""
+
+    def __init__(self, doc: "MappedDocument"):
+        self._doc = doc
+
+    def __len__(self) -> int:
+        return self._doc.sentence_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._doc.sentence(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._doc.sentence(index)
+
+
+class MappedDocument(SegmentedText):
+    """
+    A document opened from its index file.
+
+    Behaves like the `SegmentedText` of the indexed text, so it can be passed straight to
+    `multi_profile_summarize`. The prefix index is read in place from the mapping and only the
+    sentences a summary uses are decoded; the full text is decoded only if a stage needs it
+    (custom summarizers, personas, screening, redaction).
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Map an index file.
+
+        Args:
+            path: Index file written by `build_index`
+
+        Raises:
+            ValueError: If the file is not a document index of a supported version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            fields = _HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(f"Not a document index: {self.path}")
+        (magic, version, self.sentence_count, self.vocabulary_size, text_bytes, term_count,
+         vocab_bytes, self.source_size, self.source_mtime_ns, digest, content_hash) = fields
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a version {FORMAT_VERSION} document index: {self.path}")
+        if sys.byteorder != "little":
+            self._mmap.close()
+            raise ValueError("Document indexes can only be mapped on little-endian hosts")
+        self.__dict__["digest"] = digest.hex()
+        self.__dict__["content_hash"] = content_hash.decode("ascii")
+
+        view = memoryview(self._mmap)
+        self._views = [view]
+        offset = _HEADER.size
+        self._text = view[offset:offset + text_bytes]
+        offset += _padded(text_bytes)
+        lengths = {
+            "starts": self.sentence_count,
+            "byte_lengths": self.sentence_count,
+            "char_lengths": self.sentence_count,
+            "prefix": self.sentence_count,
+            "term_starts": self.sentence_count + 1,
+            "term_ids": term_count,
+            "vocab_starts": self.vocabulary_size + 1,
+        }
+        for name, typecode in _BLOCKS:
+            size = lengths[name] * array(typecode).itemsize
+            block = view[offset:offset + size].cast(typecode)
+            setattr(self, "_" + name, block)
+            self._views.append(block)
+            offset += _padded(size)
+        self._vocab_blob = view[offset:offset + vocab_bytes]
+        self._views += [self._text, self._vocab_blob]
+        self.__dict__["prefix_lengths"] = self._prefix
+        self.__dict__["sentences"] = _MappedSentences(self)
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self._text) == 0
+
+    @cached_property
+    def text(self) -> str:
+        """The document text (decoded on first use)."""
+        return str(self._text, "utf-8")
+
+    @cached_property
+    def pieces(self) -> List[str]:
+        return self.text.split(".")
+
+    def sentence(self, index: int) -> str:
+        """Decode one sentence."""
+        start = self._starts[index]
+        return str(self._text[start:start + self._byte_lengths[index]], "utf-8")
+
+    @cached_property
+    def vocabulary(self) -> Dict[str, int]:
+        """Term -> id mapping (decoded on first use)."""
+        blob = bytes(self._vocab_blob)
+        starts = self._vocab_starts
+        return {
+            blob[starts[i]:starts[i + 1]].decode("utf-8"): i for i in range(self.vocabulary_size)
+        }
+
+    def term_ids(self, index: int) -> memoryview:
+        """Vocabulary ids of a sentence's tokens, in order."""
+        return self._term_ids[self._term_starts[index]:self._term_starts[index + 1]]
+
+    def find(self, *terms: str) -> List[int]:
+        """
+        Indices of sentences containing every term (case-insensitive whole words).
+
+        Args:
+            *terms: Terms to look for
+
+        Returns:
+            Sentence indices in document order
+        """
+        ids = set()
+        for term in terms:
+            term_id = self.vocabulary.get(term.lower())
+            if term_id is None:
+                return []
+            ids.add(term_id)
+        return [i for i in range(self.sentence_count) if ids.issubset(self.term_ids(i))]
+
+    def matching_sentences(self, *terms: str) -> Iterator[str]:
+        """Sentences containing every term, decoded lazily."""
+        return (self.sentence(i) for i in self.find(*terms))
+
+    def close(self) -> None:
+        """Release the mapping; the document can no longer be read afterwards."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedDocument":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_index(path: Union[str, Path]) -> MappedDocument:
+    """Map a document index file."""
+    return MappedDocument(path)
+
+
+def load_or_build(
+    source: Union[str, Path],
+    index_dir: Optional[Union[str, Path]] = None
+) -> MappedDocument:
+    """
+    Open a source file's index, (re)building it if missing or stale.
+
+    An index is stale when the source's size or modification time differs from the ones
+    recorded when it was built.
+
+    Args:
+        source: Path of the text document
+        index_dir: Optional directory for index files (default: next to the source)
+
+    Returns:
+        MappedDocument for the source
+    """
+    stat = os.stat(source)
+    path = index_path_for(source, index_dir)
+    if path.exists():
+        try:
+            doc = MappedDocument(path)
+        except ValueError:
+            doc = None
+        if doc is not None:
+            if (doc.source_size, doc.source_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                return doc
+            doc.close()
+    with open(source, "r", encoding="utf-8") as fh:
+        text = fh.read()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return MappedDocument(build_index(text, path, stat))
@@ -0,0 +1,405 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.engine
+
+Long-lived session object for library use.
+`VisionEngine` owns the state the module-level entry points rebuild on every call: loaded
+profiles, compiled personas, a tokenizer, the OCR extractor and its worker pool, and a
+result cache, so repeated calls only pay for the summarization itself.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+from UI_UX.budget import naive_summarize, token_aware_budget
+from UI_UX.token_utils import get_tokenizer
+
+from .cache import SummaryCache
+from .deadline import Deadline
+from .dedup import SimHashIndex
+from .normalize import TextNormalizer
+from .ocr import OCRResult, ScreenshotAnalyzer
+from .personas import CompiledPersona, PersonaRegistry, get_persona_registry
+from .profiles import AnyProfile, Profile, load_profile, profile_budget
+from .redaction import Redactor
+from .screening import Screener
+from .screenshot_handlers import _redact_ocr_result, analyze_for_profiles, ocr_metadata
+from .store import ResultStore
+from .summarize import _budget_key, multi_profile_summarize
+from .token_profiles import TokenProfile
+
+ProfileSpec = Union[str, AnyProfile, Sequence[Union[str, AnyProfile]]]
+
+
+class VisionEngine:
+    """
+    Reusable summarization session.
+
+    Profiles and personas are resolved once and kept, OCR runs through one extractor and a
+    bounded worker pool, and results for near-duplicate documents can be served from a
+    SimHash index. Use as a context manager, or call `close()`, to release the pool.
+
+    Calls may run concurrently from several threads: the shared normalizer keeps its stage
+    state per run, and the caches, store and OCR pool are thread-safe.
+    """
+
+    def __init__(
+        self,
+        summarizer: Optional[Callable[[str, int], str]] = None,
+        persona_registry: Optional[PersonaRegistry] = None,
+        ocr_analyzer: Optional[ScreenshotAnalyzer] = None,
+        ocr_workers: int = 2,
+        tokenizer: Any = None,
+        model_name: Optional[str] = None,
+        redactor: Optional[Redactor] = None,
+        normalizer: Optional[TextNormalizer] = None,
+        screener: Optional[Screener] = None,
+        screen_action: str = "flag",
+        dedup_threshold: Optional[int] = None,
+        cache: Optional[SummaryCache] = None,
+        store: Optional[ResultStore] = None
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            summarizer: Summarizer used for every call (default: naive_summarize)
+            persona_registry: Registry personas are resolved from (default: the shared one)
+            ocr_analyzer: ScreenshotAnalyzer to reuse (created on first image if omitted)
+            ocr_workers: Worker threads for batch OCR
+            tokenizer: Tokenizer for token-aware budgets (loaded lazily from `model_name`
+                if omitted)
+            model_name: Tokenizer model name used when `tokenizer` is not given
+            redactor: Optional Redactor applied to every input
+            normalizer: Optional TextNormalizer applied to every text input
+            screener: Optional Screener applied to every input and summary
+            screen_action: Screening action (see `multi_profile_summarize`)
+            dedup_threshold: Optional SimHash distance under which near-duplicate documents
+                reuse earlier results (None disables the result cache)
+            cache: Optional SummaryCache of per-layer summaries shared by every call (give
+                it a path to share results with other processes and later runs)
+            store: Optional ResultStore every run's summaries are recorded in
+        """
+        if ocr_workers < 1:
+            raise ValueError(f"ocr_workers must be at least 1, got {ocr_workers}")
+        self.summarizer = summarizer or naive_summarize
+        self.personas = persona_registry or get_persona_registry()
+        self.ocr_workers = ocr_workers
+        self.model_name = model_name
+        self.redactor = redactor
+        self.normalizer = normalizer
+        self.screener = screener
+        self.screen_action = screen_action
+        self.result_cache = SimHashIndex(dedup_threshold) if dedup_threshold is not None else None
+        self.cache = cache
+        self.store = store
+        self._analyzer = ocr_analyzer
+        self._tokenizer = tokenizer
+        self._tokenizer_loaded = tokenizer is not None
+        self._profiles: Dict[str, AnyProfile] = {}
+        self._budgets: Dict[Hashable, Dict[str, Any]] = {}
+        self._ocr_pool: Optional[ThreadPoolExecutor] = None
+
+    # Shared resources
+
+    @property
+    def analyzer(self) -> ScreenshotAnalyzer:
+        """The engine's ScreenshotAnalyzer, created on first use."""
+        if self._analyzer is None:
+            self._analyzer = ScreenshotAnalyzer()
+        return self._analyzer
+
+    @property
+    def ocr_pool(self) -> ThreadPoolExecutor:
+        """Worker pool batch OCR runs in, created on first use."""
+        if self._ocr_pool is None:
+            self._ocr_pool = ThreadPoolExecutor(
+                max_workers=self.ocr_workers, thread_name_prefix="vision-ocr"
+            )
+        return self._ocr_pool
+
+    @property
+    def tokenizer(self) -> Any:
+        """Tokenizer for `model_name`, loaded once; None without transformers or a model."""
+        if not self._tokenizer_loaded:
+            self._tokenizer = get_tokenizer(self.model_name) if self.model_name else None
+            self._tokenizer_loaded = True
+        return self._tokenizer
+
+    def profile(self, profile: Union[str, AnyProfile]) -> AnyProfile:
+        """Resolve a profile name (loaded once) or pass a Profile or TokenProfile through."""
+        if isinstance(profile, (Profile, TokenProfile)):
+            return profile
+        if profile not in self._profiles:
+            self._profiles[profile] = load_profile(profile)
+        return self._profiles[profile]
+
+    def profiles(self, profiles: ProfileSpec) -> List[AnyProfile]:
+        """
+        Resolve profiles.
+
+        Args:
+            profiles: Comma-separated names, a Profile, or a sequence of names/Profiles
+
+        Returns:
+            List of Profile and TokenProfile objects
+        """
+        if isinstance(profiles, str):
+            profiles = [name.strip() for name in profiles.split(",") if name.strip()]
+        elif isinstance(profiles, (Profile, TokenProfile)):
+            profiles = [profiles]
+        return [self.profile(profile) for profile in profiles]
+
+    def persona(self, persona: Optional[Union[str, CompiledPersona]]) -> Optional[CompiledPersona]:
+        """Resolve a persona name through the engine's registry."""
+        if not persona or isinstance(persona, CompiledPersona):
+            return persona or None
+        return self.personas.get(persona)
+
+    def budget(self, profile: Union[str, AnyProfile]) -> Dict[str, Any]:
+        """Budget for a profile, computed once per distinct screen or token setup."""
+        profile = self.profile(profile)
+        key = _budget_key(profile)
+        if key not in self._budgets:
+            self._budgets[key] = profile_budget(profile)
+        return dict(self._budgets[key])
+
+    def token_budget(
+        self,
+        profile: Union[str, AnyProfile],
+        samples: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Token-aware budget for a profile using the engine's tokenizer on sample texts.
+
+        Token profiles already budget in tokens; their budget is returned as it is.
+        """
+        profile = self.profile(profile)
+        if isinstance(profile, TokenProfile):
+            return self.budget(profile)
+        return token_aware_budget(self.budget(profile), samples=samples, tokenizer=self.tokenizer)
+
+    # Summarization
+
+    def summarize_text(
+        self,
+        text: str,
+        profiles: ProfileSpec,
+        layers: List[str] = ['headline', 'one_screen', 'deep'],
+        persona: Optional[str] = None,
+        doc_id: Optional[str] = None,
+        **options: Any
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Summarize text for several profiles.
+
+        Args:
+            text: Input text to summarize
+            profiles: Profile names/objects (see `profiles`)
+            layers: List of layer names to generate for each profile
+            persona: Optional persona name
+            doc_id: Optional document reference recorded in the engine's result store
+            **options: Extra `multi_profile_summarize` arguments (e.g. deadline, executor);
+                persona names in `personas` are resolved through the engine's registry
+
+        Returns:
+            Nested dictionary: {profile_name: {layer_name: summary}}
+        """
+        started = time.perf_counter()
+        summaries = multi_profile_summarize(
+            text=text,
+            profiles=self.profiles(profiles),
+            layers=layers,
+            persona=self.persona(persona),
+            summarizer=self.summarizer,
+            dedup_index=self.result_cache,
+            cache=self.cache,
+            normalizer=self.normalizer,
+            screener=self.screener,
+            screen_action=self.screen_action,
+            redactor=self.redactor,
+            **self._resolve_personas(options)
+        )
+        self._record(summaries, text, doc_id, persona, started, _is_matrix(options))
+        return summaries
+
+    def extract_text(self, image_path: str, timeout: float = 0) -> str:
+        """OCR an image with the engine's extractor (redacted if the engine redacts)."""
+        result = self.analyzer.ocr_extractor.extract_text(
+            image_path, preprocess=True, timeout=timeout
+        )
+        if self.redactor is not None:
+            _redact_ocr_result(result, self.redactor)
+        return result.full_text
+
+    def summarize_image(
+        self,
+        image_path: str,
+        profiles: ProfileSpec,
+        layers: List[str] = ['headline', 'one_screen'],
+        persona: Optional[str] = None,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Summarize a screenshot for several profiles.
+
+        Args:
+            image_path: Path to the screenshot image file
+            profiles: Profile names/objects (see `profiles`)
+            layers: List of layer names to generate
+            persona: Optional persona name
+            **options: Extra `multi_profile_summarize` arguments; a deadline/timeout also
+                bounds OCR
+
+        Returns:
+            Nested dictionary: {profile_name: {layer_name: summary}} plus '_ocr_metadata'
+        """
+        deadline = _pop_deadline(options)
+        analysis = analyze_for_profiles(
+            image_path, self.profiles(profiles), self.analyzer, self.redactor, deadline
+        )
+        started = time.perf_counter()
+        summaries = self._summarize_analysis(analysis, layers, persona, options)
+        self._record(summaries, Path(image_path), image_path, persona, started,
+                     _is_matrix(options))
+        return summaries
+
+    def summarize_texts(
+        self,
+        texts: Sequence[str],
+        profiles: ProfileSpec,
+        layers: List[str] = ['headline', 'one_screen', 'deep'],
+        persona: Optional[str] = None,
+        **options: Any
+    ) -> List[Dict[str, Dict[str, str]]]:
+        """Summarize many texts with profiles and persona resolved once; results in order."""
+        resolved = self.profiles(profiles)
+        compiled = self.persona(persona)
+        return [self.summarize_text(text, resolved, layers, compiled, **options) for text in texts]
+
+    def summarize_images(
+        self,
+        image_paths: Sequence[str],
+        profiles: ProfileSpec,
+        layers: List[str] = ['headline', 'one_screen'],
+        persona: Optional[str] = None,
+        **options: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Summarize many screenshots, running OCR concurrently in the engine's worker pool.
+
+        Results are returned in input order. A deadline/timeout in `options` bounds the whole
+        batch, OCR included.
+        """
+        resolved = self.profiles(profiles)
+        compiled = self.persona(persona)
+        deadline = _pop_deadline(options)
+        futures = [
+            self.ocr_pool.submit(
+                analyze_for_profiles, path, resolved, self.analyzer, self.redactor, deadline
+            )
+            for path in image_paths
+        ]
+        results = []
+        for path, future in zip(image_paths, futures):
+            started = time.perf_counter()
+            analysis = future.result()
+            results.append(self._summarize_analysis(analysis, layers, compiled, options))
+            self._record(results[-1], Path(path), path, compiled, started, _is_matrix(options))
+        return results
+
+    def _summarize_analysis(
+        self,
+        analysis: Tuple[OCRResult, float, List[Profile]],
+        layers: List[str],
+        persona: Optional[Union[str, CompiledPersona]],
+        options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Summarize the output of `analyze_for_profiles` and attach OCR metadata."""
+        ocr_result, text_density, adjusted_profiles = analysis
+        summaries: Dict[str, Any] = multi_profile_summarize(
+            text=ocr_result.full_text,
+            profiles=adjusted_profiles,
+            layers=layers,
+            persona=self.persona(persona),
+            summarizer=self.summarizer,
+            dedup_index=self.result_cache,
+            cache=self.cache,
+            screener=self.screener,
+            screen_action=self.screen_action,
+            **self._resolve_personas(options)
+        )
+        summaries['_ocr_metadata'] = ocr_metadata(ocr_result, text_density)
+        return summaries
+
+    def _resolve_personas(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """`options` with persona names in `personas` resolved through the engine's registry."""
+        if options.get("personas") is None:
+            return options
+        personas = [self.persona(spec) if isinstance(spec, str) and spec else spec
+                    for spec in options["personas"]]
+        return {**options, "personas": personas}
+
+    def _record(
+        self,
+        summaries: Dict[str, Any],
+        text: Union[str, Path],
+        doc_id: Optional[str],
+        persona: Optional[Union[str, CompiledPersona]],
+        started: float,
+        personas: bool = False
+    ) -> None:
+        """
+        Record a run in the result store, if the engine has one.
+
+        Images (given as a Path) are recorded by the hash of the image file, as the CLI
+        does, so a screenshot has the same doc_hash whichever way it was summarized.
+        """
+        if self.store is None:
+            return
+        if isinstance(text, Path):
+            text = text.read_bytes()
+        if isinstance(persona, CompiledPersona):
+            persona = persona.name
+        self.store.record(
+            summaries, text, doc_id=doc_id, persona=persona,
+            elapsed_ms=(time.perf_counter() - started) * 1000.0, personas=personas
+        )
+
+    # Lifecycle
+
+    def close(self) -> None:
+        """Shut down the OCR worker pool."""
+        if self._ocr_pool is not None:
+            self._ocr_pool.shutdown(wait=True)
+            self._ocr_pool = None
+
+    def __enter__(self) -> "VisionEngine":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _pop_deadline(options: Dict[str, Any]) -> Optional[Deadline]:
+    """Resolve deadline/timeout/cancel_token in `options` into one Deadline, left in `options`."""
+    deadline = Deadline.resolve(
+        options.pop("deadline", None),
+        options.pop("timeout", None),
+        options.pop("cancel_token", None)
+    )
+    if deadline is not None:
+        options["deadline"] = deadline
+    return deadline
+
+
+def _is_matrix(options: Dict[str, Any]) -> bool:
+    """Whether `options` make `multi_profile_summarize` return a persona matrix."""
+    return options.get("personas") is not None
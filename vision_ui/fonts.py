@@ -0,0 +1,261 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.fonts
+
+Font-aware text measurement from per-codepoint advance-width tables.
+A table holds the advance width of every Basic Multilingual Plane codepoint for one font file at one
+size, measured with Pillow one 256-codepoint block at a time as text first needs it and cached on
+disk, so measuring text is a table lookup (vectorized with NumPy when available) instead of a font
+rendering call.
+"""
+
+import math
+import os
+import struct
+import sys
+import threading
+from array import array
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from .cache import default_cache_path, text_hash
+
+try:
+    from PIL import ImageFont
+    _PIL_AVAILABLE = True
+except ImportError:
+    ImageFont = None  # type: ignore
+    _PIL_AVAILABLE = False
+
+try:
+    import numpy as np
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore
+    _NUMPY_AVAILABLE = False
+
+TABLE_SIZE = 0x10000  # one entry per BMP codepoint
+REPLACEMENT = 0xFFFD  # width used for codepoints outside the table
+BLOCK_BITS = 8
+BLOCK_SIZE = 1 << BLOCK_BITS
+UNMEASURED = math.nan  # width of codepoints in blocks not measured yet
+MAGIC = b"VUGW"
+FORMAT_VERSION = 2  # 2: blocks measured lazily, NaN until then
+_HEADER = struct.Struct("<4sIIf")  # magic, version, entries, font size
+_SURROGATES = range(0xD800, 0xE000)
+
+# Representative English prose (letters, spaces, digits, punctuation) for average widths
+REFERENCE_TEXT = (
+    "The quick brown fox jumps over the lazy dog. Replica lag on db-3 reached 40 seconds, "
+    "so reads moved to the primary while the team investigated; no data was lost. "
+    "Deploy 118 rolled out to all regions (canary first) and error rates stayed flat."
+)
+
+
+def default_font_cache_dir() -> Path:
+    """Where glyph width tables are cached: ``fonts/`` next to the summary cache."""
+    return default_cache_path().parent / "fonts"
+
+
+def _open_font(path: Path, size_px: float) -> "ImageFont.FreeTypeFont":
+    if not _PIL_AVAILABLE:
+        raise RuntimeError("Font-aware budgets need Pillow. Install with: pip install pillow")
+    return ImageFont.truetype(str(path), size_px)
+
+
+def _measure_block(font: "ImageFont.FreeTypeFont", index: int) -> array:
+    start = index << BLOCK_BITS
+    return array("f", (0.0 if cp in _SURROGATES else font.getlength(chr(cp))
+                       for cp in range(start, start + BLOCK_SIZE)))
+
+
+def _write_table(widths: array, cache_file: Path, size_px: float) -> None:
+    data = array("f", widths)
+    if sys.byteorder != "little":
+        data.byteswap()
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_name(cache_file.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(data), size_px))
+        fh.write(data.tobytes())
+    os.replace(tmp, cache_file)
+
+
+def _read_table(cache_file: Path) -> Optional[array]:
+    try:
+        raw = cache_file.read_bytes()
+        magic, version, entries, _ = _HEADER.unpack_from(raw, 0)
+    except (OSError, struct.error):
+        return None
+    if magic != MAGIC or version != FORMAT_VERSION or entries != TABLE_SIZE:
+        return None
+    widths = array("f")
+    widths.frombytes(raw[_HEADER.size:_HEADER.size + 4 * entries])
+    if len(widths) != TABLE_SIZE:
+        return None
+    if sys.byteorder != "little":
+        widths.byteswap()
+    return widths
+
+
+class FontMetrics:
+    """
+    Advance widths of one font at one pixel size.
+
+    Widths match Pillow's ``ImageFont.getlength`` for each character (basic layout, no
+    kerning or shaping). Characters outside the BMP are measured as U+FFFD. Blocks of the
+    table that are still `UNMEASURED` are measured from the font file when text first uses
+    them, and the table is saved back to its cache file.
+    """
+
+    def __init__(
+        self,
+        widths: array,
+        size_px: float,
+        path: Optional[Path] = None,
+        cache_file: Optional[Path] = None
+    ):
+        """
+        Wrap a width table.
+
+        Args:
+            widths: Advance width in px for every BMP codepoint (`UNMEASURED` for blocks to
+                measure on first use, which needs `path`)
+            size_px: Font size the table was measured at
+            path: Font file the table came from, if any
+            cache_file: Where to save the table after measuring new blocks, if anywhere
+        """
+        self.widths = widths
+        self.size_px = size_px
+        self.path = path
+        self.cache_file = cache_file
+        self._array = np.frombuffer(widths, dtype=np.float32) if _NUMPY_AVAILABLE else None
+        self._font = None
+        self._measure_lock = threading.Lock()
+
+    def _measure(self, text: str) -> None:
+        """Measure the table blocks `text` needs that are still unmeasured."""
+        widths = self.widths
+        with self._measure_lock:
+            missing = sorted(
+                index for index in {min(ord(c), REPLACEMENT) >> BLOCK_BITS for c in text}
+                if math.isnan(widths[index << BLOCK_BITS])
+            )
+            if not missing:
+                return
+            if self._font is None:
+                if self.path is None:
+                    raise RuntimeError("Width table has unmeasured blocks and no font file")
+                self._font = _open_font(self.path, self.size_px)
+            for index in missing:
+                start = index << BLOCK_BITS
+                widths[start:start + BLOCK_SIZE] = _measure_block(self._font, index)
+            if self.cache_file is not None:
+                try:
+                    _write_table(widths, self.cache_file, self.size_px)
+                except OSError:
+                    pass  # an unwritable cache only costs measuring again next run
+
+    def char_width(self, char: str) -> float:
+        """Advance width of one character in px."""
+        codepoint = ord(char)
+        width = self.widths[codepoint if codepoint < TABLE_SIZE else REPLACEMENT]
+        if math.isnan(width):
+            self._measure(char)
+            width = self.widths[codepoint if codepoint < TABLE_SIZE else REPLACEMENT]
+        return width
+
+    def text_width(self, text: str) -> float:
+        """
+        Width of a single line of text in px: the sum of its characters' advances.
+
+        Args:
+            text: Text to measure (newlines are measured like any other character)
+
+        Returns:
+            Width in px
+        """
+        if not text:
+            return 0.0
+        width = self._sum_widths(text)
+        if math.isnan(width):
+            self._measure(text)
+            width = self._sum_widths(text)
+        return width
+
+    def _sum_widths(self, text: str) -> float:
+        if self._array is not None and len(text) > 16:
+            try:
+                codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+            except UnicodeEncodeError:
+                pass  # lone surrogates; the loop below measures them as zero width
+            else:
+                codes = np.where(codes < TABLE_SIZE, codes, REPLACEMENT)
+                return float(self._array[codes].sum(dtype=np.float64))
+        widths = self.widths
+        return sum(widths[c if c < TABLE_SIZE else REPLACEMENT] for c in map(ord, text))
+
+    @cached_property
+    def avg_char_width_px(self) -> float:
+        """Average advance over `REFERENCE_TEXT`, for use as `compute_budget`'s avg_char_width_px."""
+        return self.text_width(REFERENCE_TEXT) / len(REFERENCE_TEXT)
+
+    @cached_property
+    def space_width_px(self) -> float:
+        return self.char_width(" ")
+
+
+_metrics: Dict[Tuple[str, float], FontMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+def load_font_metrics(
+    path: Union[str, Path],
+    size_px: float,
+    cache_dir: Optional[Union[str, Path]] = None
+) -> FontMetrics:
+    """
+    Width table of a TTF/OTF font at a size, built once and cached in memory and on disk.
+
+    Tables are keyed by a hash of the font file's contents and the size, so a font that moves
+    or is updated in place is handled correctly. Nothing is measured up front: each
+    256-codepoint block is measured the first time text uses it (a few milliseconds to a few
+    tens of milliseconds per block, depending on the font) and saved to the cached table.
+
+    Args:
+        path: Font file (anything Pillow's ``ImageFont.truetype`` opens)
+        size_px: Font size in px
+        cache_dir: Directory for cached tables (default: `default_font_cache_dir`)
+
+    Returns:
+        FontMetrics for the font at that size
+
+    Raises:
+        RuntimeError: If Pillow is not installed and the table is not cached yet (or, later,
+            when text needs a block the cached table has not measured)
+        OSError: If the font file cannot be read
+    """
+    path = Path(path).expanduser()
+    stat = os.stat(path)
+    memo_key = (f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}", float(size_px))
+    with _metrics_lock:
+        metrics = _metrics.get(memo_key)
+    if metrics is not None:
+        return metrics
+
+    directory = Path(cache_dir) if cache_dir is not None else default_font_cache_dir()
+    cache_file = directory / f"{text_hash(path.read_bytes())}-{float(size_px):g}px.gw"
+    widths = _read_table(cache_file)
+    if widths is None:
+        _open_font(path, size_px)  # fail now, not on first use, if the font cannot be loaded
+        widths = array("f", [UNMEASURED]) * TABLE_SIZE
+    metrics = FontMetrics(widths, float(size_px), path, cache_file)
+    with _metrics_lock:
+        _metrics[memo_key] = metrics
+    return metrics
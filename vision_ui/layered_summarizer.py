@@ -11,12 +11,16 @@ Layered summarization logic for multi-layer summaries across different character
 Handles headline, one_screen, and deep layer generation with persona support.
 """
 
+import json
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from UI_UX.budget import naive_summarize
 
-from .personas import Persona, _calculate_persona_overhead
+from .cache import SummaryCache, summarizer_identity
+from .personas import CompiledPersona, Persona, compile_persona
+from .segments import SegmentedText
 
 
 @dataclass
@@ -48,12 +52,170 @@ DEFAULT_LAYERS: Dict[str, LayerConfig] = {
 }
 
 
+class PreparedDocument:
+    """
+    Persona-specific views of a segmented document.
+
+    Built once per (document, persona) and shared across every profile and layer, so the
+    vocabulary rewrite and persona wrapping happen once instead of per budget.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, SegmentedText],
+        persona: Optional[Union[Persona, CompiledPersona]] = None
+    ):
+        self.source = source if isinstance(source, SegmentedText) else SegmentedText.from_text(source)
+        self.compiled = compile_persona(persona) if persona is not None else None
+        self.persona = self.compiled.persona if self.compiled else None
+
+    @cached_property
+    def vocabulary(self) -> SegmentedText:
+        """Source with only the persona vocabulary mappings applied (headline layer)."""
+        if self.compiled is None or not self.persona.vocabulary_mappings:
+            return self.source
+        # One compiled pass over the whole document, then a fresh split
+        return SegmentedText.from_text(self.compiled.apply_vocabulary(self.source.text))
+
+    @cached_property
+    def persona_text(self) -> SegmentedText:
+        """Source with the full persona transformation applied (`Persona.apply`)."""
+        if self.compiled is None:
+            return self.source
+        return self.vocabulary.with_affixes(self.compiled.prefix, self.compiled.suffix)
+
+    @property
+    def persona_overhead(self) -> int:
+        return self.compiled.overhead if self.compiled else 0
+
+
+def _run_summarizer(
+    summarizer: Callable[[str, int], str],
+    document: SegmentedText,
+    char_limit: int
+) -> str:
+    """Call the summarizer, resolving naive_summarize through the shared prefix index."""
+    if summarizer is naive_summarize:
+        return document.summarize(char_limit)
+    return summarizer(document.text, char_limit)
+
+
+@dataclass
+class LayerPlan:
+    """
+    The single summarizer call needed for one layer, plus its post-processing.
+
+    Lets callers run the summarizer themselves (in parallel, asynchronously, or once for
+    identical plans) and then finish the layer with `finish`.
+    """
+    layer_name: str
+    document: SegmentedText
+    char_limit: int
+    prefix: str = ""   # e.g. the deep layer's "[hash:xxxxxxxx] "
+    postfix: str = ""  # appended persona examples/context
+
+    @property
+    def call_key(self) -> Tuple[int, int]:
+        """Plans with equal keys make the same summarizer call and can share its result."""
+        return (id(self.document), self.char_limit)
+
+    def finish(self, summary: str) -> str:
+        """Apply the layer's post-processing to a raw summarizer result."""
+        if self.postfix:
+            summary = summary.strip() + self.postfix
+        return self.prefix + summary
+
+
+def plan_layer(prepared: PreparedDocument, char_budget: int, layer_name: str) -> LayerPlan:
+    """
+    Work out which document and character limit a layer summarizes.
+    
+    Args:
+        prepared: PreparedDocument holding the source and persona views
+        char_budget: Available character budget for the profile
+        layer_name: Name of the layer to generate
+        
+    Returns:
+        LayerPlan for the layer
+    """
+    if layer_name not in DEFAULT_LAYERS:
+        raise ValueError(f"Unknown layer: {layer_name}")
+    
+    persona = prepared.persona
+    source = prepared.source
+    
+    layer_config = DEFAULT_LAYERS[layer_name]
+    layer_budget = int(char_budget * layer_config.budget_multiplier)
+    
+    # Calculate persona overhead if persona is specified
+    persona_overhead = prepared.persona_overhead if persona else 0
+    
+    # Calculate hash overhead for deep layer
+    hash_overhead = 15 if layer_config.include_hash else 0  # "[hash:xxxxxxxx] "
+    
+    # Add hash for deep layer if requested
+    prefix = f"[hash:{source.content_hash}] " if layer_config.include_hash else ""
+    
+    # Adjust budget for overheads
+    effective_budget = layer_budget
+    if persona and layer_name == "headline":
+        # Headline layer always uses vocabulary-only persona for conciseness
+        return LayerPlan(layer_name, prepared.vocabulary, effective_budget - hash_overhead, prefix)
+    elif persona and persona.examples_location == "append":
+        # Append persona examples after generating the summary; do not make examples consume
+        # the text budget so headlines remain concise and one_screen/detailed layers can include
+        # persona material as an addendum.
+        effective_budget = layer_budget - hash_overhead
+        # Append examples/context as a postfix if present
+        examples = prepared.compiled.examples
+        context = prepared.compiled.context
+        postfix_items = []
+        if context:
+            postfix_items.append(context)
+        if examples:
+            postfix_items.append(examples)
+        postfix = "\n\n" + "\n\n".join(postfix_items) if postfix_items else ""
+        return LayerPlan(layer_name, source, effective_budget, prefix, postfix)
+    elif persona and layer_budget > persona_overhead + hash_overhead + 20:  # Keep at least 20 chars for content
+        # Other layers use full persona if budget permits
+        effective_budget = layer_budget - persona_overhead - hash_overhead
+        # Apply persona transformation for summarization (includes examples/context)
+        return LayerPlan(layer_name, prepared.persona_text, effective_budget, prefix)
+    else:
+        # No persona or insufficient budget - summarize original text
+        return LayerPlan(layer_name, source, effective_budget - hash_overhead, prefix)
+
+
+def summarize_layer(
+    prepared: PreparedDocument,
+    char_budget: int,
+    layer_name: str,
+    summarizer: Callable[[str, int], str] = naive_summarize
+) -> str:
+    """
+    Generate one layer of a layered summary.
+    
+    Args:
+        prepared: PreparedDocument holding the source and persona views
+        char_budget: Available character budget for the profile
+        layer_name: Name of the layer to generate
+        summarizer: Summarizer function
+        
+    Returns:
+        Summary string for the layer
+    """
+    plan = plan_layer(prepared, char_budget, layer_name)
+    return plan.finish(_run_summarizer(summarizer, plan.document, plan.char_limit))
+
+
 def layered_summarize(
     text: str,
     char_budget: int,
     layers: List[str],
     persona: Optional[Persona] = None,
-    summarizer: Optional[Callable[[str, int], str]] = None
+    summarizer: Optional[Callable[[str, int], str]] = None,
+    prepared: Optional[PreparedDocument] = None,
+    cache: Optional[SummaryCache] = None
 ) -> Dict[str, str]:
     """
     Generate layered summaries for a single character budget.
@@ -64,73 +226,43 @@ def layered_summarize(
         layers: List of layer names to generate
         persona: Optional persona adapter
         summarizer: Optional custom summarizer function
+        prepared: Optional PreparedDocument shared across calls; when given, its source and
+            persona take precedence over `text` and `persona`
+        cache: Optional SummaryCache consulted per layer (shared with
+            `multi_profile_summarize` for equal character budgets)
         
     Returns:
         Dictionary mapping layer names to summaries
     """
     if summarizer is None:
         summarizer = naive_summarize
+    if prepared is None:
+        prepared = PreparedDocument(text, persona)
+    
+    keys: Dict[str, str] = {}
+    summarizer_id = summarizer_identity(summarizer) if cache is not None else None
+    if summarizer_id is not None:
+        doc_hash = prepared.source.digest
+        persona_key = json.dumps(prepared.persona.to_dict(), sort_keys=True) if prepared.persona else None
+        keys = {
+            layer_name: SummaryCache.key(doc_hash, char_budget, layer_name, persona_key, summarizer_id)
+            for layer_name in layers
+        }
+    cached = cache.get_many(keys.values()) if keys else {}
     
     results = {}
+    fresh = {}
     
     for layer_name in layers:
-        if layer_name not in DEFAULT_LAYERS:
-            raise ValueError(f"Unknown layer: {layer_name}")
-        
-        layer_config = DEFAULT_LAYERS[layer_name]
-        layer_budget = int(char_budget * layer_config.budget_multiplier)
-        
-        # Calculate persona overhead if persona is specified
-        persona_overhead = 0
-        if persona:
-            persona_overhead = _calculate_persona_overhead(persona)
-        
-        # Calculate hash overhead for deep layer
-        hash_overhead = 15 if layer_config.include_hash else 0  # "[hash:xxxxxxxx] "
-        
-        # Adjust budget for overheads
-        effective_budget = layer_budget
-        if persona and layer_name == "headline":
-            # Headline layer always uses vocabulary-only persona for conciseness
-            if persona.vocabulary_mappings:
-                transformed_text = text
-                for old_word, new_word in persona.vocabulary_mappings.items():
-                    transformed_text = transformed_text.replace(old_word, new_word)
-                summary = summarizer(transformed_text, effective_budget - hash_overhead)
-            else:
-                summary = summarizer(text, effective_budget - hash_overhead)
-        elif persona and persona.examples_location == "append":
-            # Append persona examples after generating the summary; do not make examples consume
-            # the text budget so headlines remain concise and one_screen/detailed layers can include
-            # persona material as an addendum.
-            effective_budget = layer_budget - hash_overhead
-            summary = summarizer(text, effective_budget)
-            # Append examples/context as a postfix if present
-            examples = persona.examples_text()
-            context = persona.context_text()
-            postfix_items = []
-            if context:
-                postfix_items.append(context)
-            if examples:
-                postfix_items.append(examples)
-            if postfix_items:
-                summary = summary.strip() + "\n\n" + "\n\n".join(postfix_items)
-        elif persona and layer_budget > persona_overhead + hash_overhead + 20:  # Keep at least 20 chars for content
-            # Other layers use full persona if budget permits
-            effective_budget = layer_budget - persona_overhead - hash_overhead
-            # Apply persona transformation for summarization (includes examples/context)
-            persona_text = persona.apply(text)
-            summary = summarizer(persona_text, effective_budget)
-        else:
-            # No persona or insufficient budget - summarize original text
-            summary = summarizer(text, effective_budget - hash_overhead)
-        
-        # Add hash for deep layer if requested
-        if layer_config.include_hash:
-            import hashlib
-            content_hash = hashlib.sha256(text.encode()).hexdigest()[:8]
-            summary = f"[hash:{content_hash}] {summary}"
-        
-        results[layer_name] = summary
+        key = keys.get(layer_name)
+        if key in cached:
+            results[layer_name] = cached[key]
+            continue
+        results[layer_name] = summarize_layer(prepared, char_budget, layer_name, summarizer)
+        if key is not None:
+            fresh[key] = results[layer_name]
+    
+    if fresh:
+        cache.put_many(fresh)
     
     return results
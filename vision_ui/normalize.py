@@ -0,0 +1,263 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.normalize
+
+Streaming text normalization ahead of summarization.
+Strips terminal escape codes and control characters, unifies Unicode punctuation, collapses
+whitespace and drops repeated lines/sentences in a single pass, reporting bytes in and out
+per stage so the savings downstream are measurable.
+"""
+
+import copy
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Sequence, Set
+
+_ANSI_RE = re.compile(
+    r"\x1b\[[0-?]*[ -/]*[@-~]"                # CSI sequences (colors, cursor movement)
+    r"|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)"     # OSC sequences (titles, hyperlinks)
+    r"|\x1b[@-Z\\-_]"                          # two-byte escapes
+)
+_CONTROL_RE = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+_SPACE_RUN_RE = re.compile(r"[ \t\f\v]+")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+_PUNCTUATION_TABLE = str.maketrans({
+    "‘": "'", "’": "'", "‚": "'", "‛": "'", "′": "'",
+    "“": '"', "”": '"', "„": '"', "‟": '"', "″": '"',
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "−": "-",
+    "…": "...",
+    "\u00a0": " ", "\u2009": " ", "\u202f": " ", "\u200b": "",
+})
+
+
+def _utf8_len(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+class NormalizationStage:
+    """
+    A line-level normalization step. Returning None drops the line.
+
+    Each run calls a shallow copy of the stage, after `reset`, so per-document state must be
+    created in `reset` rather than mutated in place.
+    """
+
+    name = "stage"
+
+    def reset(self) -> None:
+        """Clear any per-document state before a new run."""
+
+    def __call__(self, line: str) -> Optional[str]:
+        return line
+
+
+class StripAnsiStage(NormalizationStage):
+    """Remove ANSI/VT100 escape sequences."""
+
+    name = "strip_ansi"
+
+    def __call__(self, line: str) -> Optional[str]:
+        return _ANSI_RE.sub("", line) if "\x1b" in line else line
+
+
+class StripControlStage(NormalizationStage):
+    """Remove control characters, keeping only what a carriage return left visible."""
+
+    name = "strip_control"
+
+    def __call__(self, line: str) -> Optional[str]:
+        if "\r" in line:
+            # Progress bars redraw with \r; the terminal only ever shows the last segment
+            line = line.rstrip("\r").rsplit("\r", 1)[-1]
+        return _CONTROL_RE.sub("", line)
+
+
+class UnifyPunctuationStage(NormalizationStage):
+    """Map typographic quotes, dashes, ellipses and odd spaces to ASCII."""
+
+    name = "unify_punctuation"
+
+    def __call__(self, line: str) -> Optional[str]:
+        return line if line.isascii() else line.translate(_PUNCTUATION_TABLE)
+
+
+class CollapseWhitespaceStage(NormalizationStage):
+    """Collapse space runs within a line and runs of blank lines into one."""
+
+    name = "collapse_whitespace"
+
+    def reset(self) -> None:
+        self._previous_blank = True  # also drops leading blank lines
+
+    def __call__(self, line: str) -> Optional[str]:
+        line = _SPACE_RUN_RE.sub(" ", line).strip()
+        if not line:
+            if self._previous_blank:
+                return None
+            self._previous_blank = True
+            return line
+        self._previous_blank = False
+        return line
+
+
+class DropDuplicateLinesStage(NormalizationStage):
+    """Drop non-blank lines that already appeared earlier in the document."""
+
+    name = "drop_duplicate_lines"
+
+    def reset(self) -> None:
+        self._seen: Set[str] = set()
+
+    def __call__(self, line: str) -> Optional[str]:
+        if not line.strip():
+            return line
+        if line in self._seen:
+            return None
+        self._seen.add(line)
+        return line
+
+
+class DropDuplicateSentencesStage(NormalizationStage):
+    """Drop sentences that already appeared earlier in the document."""
+
+    name = "drop_duplicate_sentences"
+
+    def reset(self) -> None:
+        self._seen: Set[str] = set()
+
+    def __call__(self, line: str) -> Optional[str]:
+        if not line.strip():
+            return line
+        kept = []
+        for sentence in _SENTENCE_SPLIT_RE.split(line):
+            if sentence in self._seen:
+                continue
+            self._seen.add(sentence)
+            kept.append(sentence)
+        return " ".join(kept) if kept else None
+
+
+# Built-in stages in their default order
+BUILTIN_STAGES = {
+    stage.name: stage
+    for stage in (
+        StripAnsiStage,
+        StripControlStage,
+        UnifyPunctuationStage,
+        CollapseWhitespaceStage,
+        DropDuplicateLinesStage,
+        DropDuplicateSentencesStage,
+    )
+}
+
+
+@dataclass
+class StageStats:
+    """Bytes seen and emitted by one normalization stage."""
+    name: str
+    bytes_in: int = 0
+    bytes_out: int = 0
+    lines_dropped: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+
+@dataclass
+class NormalizationReport:
+    """Per-stage accounting for one normalization run."""
+    stages: List[StageStats] = field(default_factory=list)
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of input bytes removed (0.0 to 1.0)."""
+        return 1.0 - self.bytes_out / self.bytes_in if self.bytes_in else 0.0
+
+    def format(self) -> str:
+        """Human-readable table of per-stage savings."""
+        lines = [f"normalize: {self.bytes_in} -> {self.bytes_out} bytes ({self.reduction:.1%} saved)"]
+        for stage in self.stages:
+            lines.append(
+                f"  {stage.name:<26} {stage.bytes_in:>10} -> {stage.bytes_out:>10}"
+                f"  (-{stage.bytes_saved}, {stage.lines_dropped} lines dropped)"
+            )
+        return "\n".join(lines)
+
+
+class TextNormalizer:
+    """
+    Composable single-pass normalizer.
+
+    Each input line flows through every stage before the next line is read, so input can be
+    streamed from a file or pipe without buffering the whole document. Every run works on its
+    own copies of the stages, so one normalizer can serve several threads at once.
+    """
+
+    def __init__(self, stages: Optional[Sequence[object]] = None):
+        """
+        Initialize the normalizer.
+
+        Args:
+            stages: Stage names from BUILTIN_STAGES and/or NormalizationStage instances,
+                in execution order. Defaults to all built-in stages.
+        """
+        if stages is None:
+            stages = list(BUILTIN_STAGES)
+        self.stages: List[NormalizationStage] = []
+        for stage in stages:
+            if isinstance(stage, str):
+                if stage not in BUILTIN_STAGES:
+                    raise ValueError(
+                        f"Unknown normalization stage: {stage}. Available: {list(BUILTIN_STAGES)}"
+                    )
+                stage = BUILTIN_STAGES[stage]()
+            self.stages.append(stage)
+        self.last_report: Optional[NormalizationReport] = None
+
+    def iter_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Normalize a stream of lines, yielding surviving lines without trailing newlines.
+
+        The report for the run is available as ``last_report`` once the iterator is exhausted
+        (with concurrent runs, the report of the run started last).
+        """
+        stages = [copy.copy(stage) for stage in self.stages]
+        report = NormalizationReport(stages=[StageStats(stage.name) for stage in stages])
+        self.last_report = report
+        for stage in stages:
+            stage.reset()
+
+        for raw in lines:
+            line = raw[:-1] if raw.endswith("\n") else raw
+            size = _utf8_len(line) + 1  # sizes include the line separator
+            report.bytes_in += size
+            for stage, stats in zip(stages, report.stages):
+                stats.bytes_in += size
+                line = stage(line)
+                if line is None:
+                    stats.lines_dropped += 1
+                    break
+                size = _utf8_len(line) + 1
+                stats.bytes_out += size
+            if line is None:
+                continue
+            report.bytes_out += size
+            yield line
+
+    def normalize(self, text: str) -> str:
+        """Normalize a whole document and return the result."""
+        return "\n".join(self.iter_lines(text.split("\n"))).rstrip("\n")
+
+
+def normalize_text(text: str) -> str:
+    """Convenience function: normalize text with all built-in stages."""
+    return TextNormalizer().normalize(text)
@@ -13,6 +13,7 @@ Supports image preprocessing, text extraction, and region-based analysis.
 
 import os
 import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -107,13 +108,15 @@ class OCRExtractor:
         if tesseract_path:
             pytesseract.pytesseract.tesseract_cmd = tesseract_path
     
-    def extract_text(self, image_path: str, preprocess: bool = True) -> OCRResult:
+    def extract_text(self, image_path: str, preprocess: bool = True, timeout: float = 0) -> OCRResult:
         """
         Extract text from an image file.
         
         Args:
             image_path: Path to the image file
             preprocess: Whether to apply preprocessing
+            timeout: Seconds Tesseract may run in total (0 for no limit); if the text pass
+                uses it up, bounding-box regions are skipped
             
         Returns:
             OCRResult with extracted text and metadata
@@ -137,15 +140,23 @@ class OCRExtractor:
         }
         
         # Extract full text
+        started = time.monotonic()
         try:
-            full_text = pytesseract.image_to_string(image, lang='eng')
+            full_text = pytesseract.image_to_string(image, lang='eng', timeout=timeout)
             full_text = full_text.strip()
         except Exception as e:
             raise RuntimeError(f"OCR extraction failed: {e}")
         
         # Extract text with bounding box data
+        regions_timeout = 0
+        if timeout:
+            regions_timeout = timeout - (time.monotonic() - started)
         try:
-            data = pytesseract.image_to_data(image, lang='eng', output_type=pytesseract.Output.DICT)
+            if timeout and regions_timeout <= 0:
+                raise TimeoutError("No time left for region extraction")
+            data = pytesseract.image_to_data(
+                image, lang='eng', output_type=pytesseract.Output.DICT, timeout=regions_timeout
+            )
             regions = self._parse_ocr_data(data)
         except Exception:
             # Fallback to empty regions if detailed extraction fails
@@ -231,17 +242,18 @@ class ScreenshotAnalyzer:
         """
         self.ocr_extractor = ocr_extractor or OCRExtractor()
     
-    def analyze_screenshot(self, image_path: str) -> OCRResult:
+    def analyze_screenshot(self, image_path: str, timeout: float = 0) -> OCRResult:
         """
         Analyze a screenshot and extract structured text.
         
         Args:
             image_path: Path to the screenshot image
+            timeout: Seconds Tesseract may run (0 for no limit)
             
         Returns:
             OCRResult with extracted text and layout information
         """
-        return self.ocr_extractor.extract_text(image_path, preprocess=True)
+        return self.ocr_extractor.extract_text(image_path, preprocess=True, timeout=timeout)
     
     def extract_ui_regions(self, ocr_result: OCRResult) -> Dict[str, List[ImageRegion]]:
         """
@@ -11,8 +11,85 @@ Persona management for text transformation and adaptation in summarization.
 Provides vocabulary mappings, example sentences, and context prefixes for different user roles.
 """
 
+import json
+import logging
+import re
+import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from UI_UX.cell_width import cell_width
+
+logger = logging.getLogger(__name__)
+
+
+class VocabularyMatcher:
+    """
+    Single-pass multi-pattern rewriter for persona vocabulary mappings.
+
+    All mappings are compiled into one regex shaped like a prefix trie, so keys sharing a
+    prefix are matched together and overlapping keys prefer the longer match. The text is
+    rewritten in a single scan instead of one full-document `str.replace` per mapping.
+    """
+
+    def __init__(self, mappings: Dict[str, str], whole_words: bool = True):
+        """
+        Compile a matcher.
+
+        Args:
+            mappings: Source term -> replacement
+            whole_words: Only replace terms that are not part of a larger word
+                (so "user" does not match inside "username")
+        """
+        self.mappings = {old: new for old, new in mappings.items() if old}
+        self.whole_words = whole_words
+        self.pattern: Optional[re.Pattern] = None
+        if self.mappings:
+            alternation = _trie_pattern(self.mappings)
+            if whole_words:
+                alternation = rf"(?<!\w)(?:{alternation})(?!\w)"
+            self.pattern = re.compile(alternation)
+
+    def sub(self, text: str) -> str:
+        """Rewrite every mapped term in text."""
+        if self.pattern is None:
+            return text
+        mappings = self.mappings
+        return self.pattern.sub(lambda match: mappings[match.group(0)], text)
+
+
+def _trie_pattern(keys) -> str:
+    """Build a regex matching any of `keys`, with shared prefixes factored out."""
+    trie: Dict[str, dict] = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end-of-key marker
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Optional continuation: greedy, so longer keys win and shorter ones are the fallback
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    return build(trie)
+
+
+@lru_cache(maxsize=256)
+def _compile_vocabulary(items: Tuple[Tuple[str, str], ...], whole_words: bool) -> VocabularyMatcher:
+    return VocabularyMatcher(dict(items), whole_words)
+
+
+def compile_vocabulary(mappings: Optional[Dict[str, str]], whole_words: bool = True) -> VocabularyMatcher:
+    """Return a (cached) compiled matcher for a vocabulary mapping."""
+    return _compile_vocabulary(tuple((mappings or {}).items()), whole_words)
 
 
 @dataclass
@@ -24,6 +101,7 @@ class Persona:
     context_prefix: Optional[str] = None
     
     examples_location: str = "append"  # one of: 'prepend', 'append', 'none'
+    whole_words: bool = True  # vocabulary mappings only match whole words
 
     def examples_text(self) -> str:
         """Return the persona example lines as a single text block."""
@@ -34,29 +112,55 @@ class Persona:
     def context_text(self) -> str:
         return self.context_prefix or ""
 
-    def apply(self, text: str, include_examples: bool = True, include_context: bool = True) -> str:
-        """Apply persona transformations to text."""
-        transformed = text
-        
-        # Apply vocabulary mappings first (before adding other content)
-        if self.vocabulary_mappings:
-            for old_word, new_word in self.vocabulary_mappings.items():
-                transformed = transformed.replace(old_word, new_word)
+    def vocabulary_matcher(self) -> VocabularyMatcher:
+        """Return the compiled matcher for this persona's vocabulary mappings."""
+        return compile_vocabulary(self.vocabulary_mappings, self.whole_words)
+
+    def apply_vocabulary(self, text: str) -> str:
+        """Apply only the vocabulary mappings to text, in a single pass."""
+        if not self.vocabulary_mappings:
+            return text
+        return self.vocabulary_matcher().sub(text)
+
+    def affixes(self, include_examples: bool = True, include_context: bool = True) -> Tuple[str, str]:
+        """Return the (prefix, suffix) that `apply` wraps around the transformed text."""
+        prefix = ""
+        suffix = ""
         
         # Add context prefix if specified
         if include_context and self.context_prefix:
-            transformed = f"{self.context_prefix}\n\n{transformed}"
+            prefix = f"{self.context_prefix}\n\n"
 
         # Add example sentences if specified
         if include_examples and self.example_sentences and self.examples_location == "prepend":
-            examples = self.examples_text()
-            transformed = f"{examples}\n\n{transformed}"
+            prefix = f"{self.examples_text()}\n\n{prefix}"
 
         if include_examples and self.example_sentences and self.examples_location == "append":
-            examples = self.examples_text()
-            transformed = f"{transformed}\n\n{examples}"
+            suffix = f"\n\n{self.examples_text()}"
         
-        return transformed
+        return prefix, suffix
+
+    def apply(self, text: str, include_examples: bool = True, include_context: bool = True) -> str:
+        """Apply persona transformations to text."""
+        # Apply vocabulary mappings first (before adding other content)
+        prefix, suffix = self.affixes(include_examples, include_context)
+        return f"{prefix}{self.apply_vocabulary(text)}{suffix}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert persona to dictionary for serialization."""
+        return {
+            "name": self.name,
+            "vocabulary_mappings": self.vocabulary_mappings,
+            "example_sentences": self.example_sentences,
+            "context_prefix": self.context_prefix,
+            "examples_location": self.examples_location,
+            "whole_words": self.whole_words,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Persona":
+        """Create persona from dictionary."""
+        return cls(**data)
 
 
 # Built-in personas
@@ -88,15 +192,187 @@ def _calculate_persona_overhead(persona: Persona) -> int:
     
     # Context prefix overhead
     if persona.context_prefix:
-        overhead += len(persona.context_prefix) + 2  # +2 for newlines
+        overhead += cell_width(persona.context_prefix) + 2  # +2 for newlines
     
     # Example sentences overhead
     if persona.example_sentences:
         for example in persona.example_sentences:
-            overhead += len(f"Example: {example}") + 1  # +1 for newline
+            overhead += cell_width(f"Example: {example}") + 1  # +1 for newline
     
     # Add separators if both exist
     if persona.context_prefix and persona.example_sentences:
         overhead += 2  # Extra newlines between sections
     
     return overhead
+
+
+@dataclass(frozen=True)
+class CompiledPersona:
+    """A persona with its matcher, overhead and text blocks computed once."""
+    persona: Persona
+    matcher: VocabularyMatcher
+    overhead: int
+    examples: str
+    context: str
+    prefix: str
+    suffix: str
+
+    @property
+    def name(self) -> str:
+        return self.persona.name
+
+    def apply_vocabulary(self, text: str) -> str:
+        """Apply the vocabulary mappings in a single pass."""
+        return self.matcher.sub(text)
+
+
+def compile_persona(persona: Union[Persona, CompiledPersona]) -> CompiledPersona:
+    """Precompute everything persona transformations need at summarization time."""
+    if isinstance(persona, CompiledPersona):
+        return persona
+    prefix, suffix = persona.affixes()
+    return CompiledPersona(
+        persona=persona,
+        matcher=persona.vocabulary_matcher(),
+        overhead=_calculate_persona_overhead(persona),
+        examples=persona.examples_text(),
+        context=persona.context_text(),
+        prefix=prefix,
+        suffix=suffix,
+    )
+
+
+def get_persona_dir() -> Path:
+    """Get the directory where user personas are stored."""
+    # Store personas in vision_ui/personas/ relative to this file, next to vision_ui/profiles/
+    return Path(__file__).parent / "personas"
+
+
+def _load_persona_file(persona_path: Path) -> Persona:
+    """Load and validate a persona JSON file."""
+    try:
+        with persona_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise TypeError("expected a JSON object")
+        data.setdefault("name", persona_path.stem)
+        return Persona.from_dict(data)
+    except (OSError, json.JSONDecodeError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid persona file {persona_path}: {e}") from e
+
+
+class PersonaRegistry:
+    """
+    Built-in plus file-backed personas, compiled once and reloaded by mtime.
+
+    Each ``*.json`` file in the persona directory defines one persona (a file persona with a
+    built-in name overrides it). The directory is re-scanned at most every
+    ``refresh_interval`` seconds and only files whose mtime changed are re-parsed and
+    re-compiled, so long-running processes can resolve personas per request cheaply.
+
+    A file that fails to load (malformed, or caught half-written) does not affect other
+    personas: its last good version stays in use, and the error is logged and kept in
+    `errors` until the file loads or is removed.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        include_builtins: bool = True,
+        refresh_interval: float = 2.0
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            directory: Persona directory (defaults to get_persona_dir())
+            include_builtins: Whether BUILTIN_PERSONAS are available
+            refresh_interval: Minimum seconds between directory scans; 0 scans on every lookup
+        """
+        self.directory = Path(directory) if directory is not None else get_persona_dir()
+        self.refresh_interval = refresh_interval
+        self._builtins: Dict[str, CompiledPersona] = (
+            {name: compile_persona(p) for name, p in BUILTIN_PERSONAS.items()} if include_builtins else {}
+        )
+        self._files: Dict[Path, Tuple[int, CompiledPersona]] = {}  # path -> (mtime_ns, persona)
+        self._by_name: Dict[str, CompiledPersona] = dict(self._builtins)
+        self._failed: Dict[Path, int] = {}  # path -> mtime_ns of the version that failed
+        self.errors: Dict[Path, str] = {}  # path -> load error of its current version
+        self._last_scan: Optional[float] = None
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-scan the persona directory, reloading only new or modified files."""
+        now = time.monotonic()
+        if not force and self._last_scan is not None and now - self._last_scan < self.refresh_interval:
+            return
+        self._last_scan = now
+
+        current: Dict[Path, int] = {}
+        if self.directory.is_dir():
+            for path in self.directory.glob("*.json"):
+                try:
+                    current[path] = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+
+        changed = current.keys() != self._files.keys()
+        for path, mtime in current.items():
+            cached = self._files.get(path)
+            if (cached is not None and cached[0] == mtime) or self._failed.get(path) == mtime:
+                continue
+            try:
+                self._files[path] = (mtime, compile_persona(_load_persona_file(path)))
+            except ValueError as e:
+                self._failed[path] = mtime
+                self.errors[path] = str(e)
+                logger.warning("%s; %s", e,
+                               "keeping its previous version" if cached else "skipping it")
+                continue
+            self._failed.pop(path, None)
+            self.errors.pop(path, None)
+            changed = True
+        for path in list(self._files):
+            if path not in current:
+                del self._files[path]
+        for path in list(self._failed):
+            if path not in current:
+                del self._failed[path]
+                self.errors.pop(path, None)
+
+        if changed:
+            by_name = dict(self._builtins)
+            for _, compiled in sorted(self._files.values(), key=lambda item: item[1].name):
+                by_name[compiled.name] = compiled
+            self._by_name = by_name
+
+    def get(self, name: str) -> CompiledPersona:
+        """Return a compiled persona by name."""
+        self.refresh()
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise ValueError(f"Unknown persona: {name}. Available: {self.names()}") from None
+
+    def names(self) -> List[str]:
+        """Names of all available personas."""
+        return sorted(self._by_name)
+
+    def __contains__(self, name: str) -> bool:
+        self.refresh()
+        return name in self._by_name
+
+
+_default_registry: Optional[PersonaRegistry] = None
+
+
+def get_persona_registry() -> PersonaRegistry:
+    """Return the process-wide persona registry."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = PersonaRegistry()
+    return _default_registry
+
+
+def resolve_persona(name: str) -> CompiledPersona:
+    """Look up a compiled persona by name in the default registry."""
+    return get_persona_registry().get(name)
@@ -0,0 +1,214 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.profile_pack
+
+Single-file packs of many device profiles.
+A pack stores each profile as a JSON record behind an open-addressing hash table of name hashes
+to record offsets, plus a tag index. Opening one maps the file; looking a profile up probes the
+table and decodes that record only, so a 5k-profile catalog costs no more per lookup than one file.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+PACK_SUFFIX = ".vpk"
+MAGIC = b"VUPK"
+FORMAT_VERSION = 1
+
+# magic, version, profiles, hash slots, tag index offset, tag index bytes
+_HEADER = struct.Struct("<4sIIIQQ")
+_SLOT = struct.Struct("<QQ")  # name hash, record offset (0: empty slot)
+_NAME_LENGTH = struct.Struct("<H")
+_DATA_LENGTH = struct.Struct("<I")
+
+
+def _name_hash(name: bytes) -> int:
+    """Stable 64-bit hash of a profile name (Python's `hash` is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(name, digest_size=8).digest(), "little")
+
+
+def _slot_count(profiles: int) -> int:
+    """Power-of-two table size at most half full."""
+    slots = 8
+    while slots < 2 * profiles:
+        slots *= 2
+    return slots
+
+
+def build_profile_pack(
+    profiles: Iterable[Union[Dict[str, Any], Any]],
+    path: Union[str, Path]
+) -> Path:
+    """
+    Write profiles into a pack file.
+
+    Args:
+        profiles: Profile dictionaries or objects with ``to_dict()`` (e.g. `Profile`); a
+            ``"tags"`` list makes a profile selectable by tag
+        path: Pack file to write (replaced atomically)
+
+    Returns:
+        Path of the written pack
+
+    Raises:
+        ValueError: If a profile has no name or two profiles share one
+    """
+    entries = [p if isinstance(p, dict) else p.to_dict() for p in profiles]
+    slots = _slot_count(len(entries))
+    table = bytearray(slots * _SLOT.size)
+    records = bytearray()
+    tag_offsets: Dict[str, List[int]] = {}
+    seen = set()
+    base = _HEADER.size + len(table)
+
+    for data in entries:
+        name = str(data.get("name") or "")
+        if not name:
+            raise ValueError("Every profile in a pack needs a name")
+        if name in seen:
+            raise ValueError(f"Duplicate profile name in pack: {name}")
+        seen.add(name)
+        encoded_name = name.encode("utf-8")
+        payload = json.dumps(data, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        offset = base + len(records)
+        records += _NAME_LENGTH.pack(len(encoded_name)) + encoded_name
+        records += _DATA_LENGTH.pack(len(payload)) + payload
+
+        digest = _name_hash(encoded_name)
+        slot = digest & (slots - 1)
+        while _SLOT.unpack_from(table, slot * _SLOT.size)[1]:
+            slot = (slot + 1) & (slots - 1)
+        _SLOT.pack_into(table, slot * _SLOT.size, digest, offset)
+        for tag in data.get("tags") or ():
+            tag_offsets.setdefault(str(tag), []).append(offset)
+
+    tag_index = json.dumps(tag_offsets, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), slots, base + len(records),
+                          len(tag_index))
+
+    path = Path(path)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        for chunk in (header, table, records, tag_index):
+            fh.write(chunk)
+    os.replace(tmp, path)
+    return path
+
+
+class ProfilePack:
+    """A memory-mapped profile pack; profiles are decoded one record at a time."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Map a pack file.
+
+        Args:
+            path: Pack written by `build_profile_pack`
+
+        Raises:
+            ValueError: If the file is not a profile pack of a supported version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            try:
+                self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ValueError(f"Not a profile pack: {self.path}") from None
+        try:
+            magic, version, self.count, self.slots, self._tags_offset, self._tags_bytes = (
+                _HEADER.unpack_from(self._mmap, 0)
+            )
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(f"Not a profile pack: {self.path}") from None
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a version {FORMAT_VERSION} profile pack: {self.path}")
+
+    def _record_name(self, offset: int) -> Tuple[bytes, int]:
+        """Name stored at a record offset and the offset of its data length."""
+        (length,) = _NAME_LENGTH.unpack_from(self._mmap, offset)
+        start = offset + _NAME_LENGTH.size
+        return self._mmap[start:start + length], start + length
+
+    def _record_data(self, offset: int) -> Dict[str, Any]:
+        _, data_offset = self._record_name(offset)
+        (length,) = _DATA_LENGTH.unpack_from(self._mmap, data_offset)
+        start = data_offset + _DATA_LENGTH.size
+        try:
+            return json.loads(self._mmap[start:start + length])
+        except ValueError as e:
+            raise ValueError(f"Invalid profile pack {self.path}: {e}") from e
+
+    def _find(self, name: str) -> Optional[int]:
+        """Record offset of a profile, by probing the hash table."""
+        encoded = name.encode("utf-8")
+        digest = _name_hash(encoded)
+        mask = self.slots - 1
+        slot = digest & mask
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(self._mmap, _HEADER.size + slot * _SLOT.size)
+            if not offset:
+                return None
+            if slot_hash == digest and self._record_name(offset)[0] == encoded:
+                return offset
+            slot = (slot + 1) & mask
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """The stored dictionary of a profile, or None if the pack does not have it."""
+        offset = self._find(name)
+        return None if offset is None else self._record_data(offset)
+
+    def __contains__(self, name: str) -> bool:
+        return self._find(name) is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _offsets(self) -> Iterator[int]:
+        offset = _HEADER.size + self.slots * _SLOT.size
+        for _ in range(self.count):
+            yield offset
+            _, data_offset = self._record_name(offset)
+            (length,) = _DATA_LENGTH.unpack_from(self._mmap, data_offset)
+            offset = data_offset + _DATA_LENGTH.size + length
+
+    @cached_property
+    def names(self) -> List[str]:
+        """Profile names in pack order (read from the record headers, no JSON decoding)."""
+        return [self._record_name(offset)[0].decode("utf-8") for offset in self._offsets()]
+
+    @cached_property
+    def tags(self) -> Dict[str, List[str]]:
+        """Tag -> names of the profiles carrying it."""
+        start = self._tags_offset
+        index = json.loads(self._mmap[start:start + self._tags_bytes] or b"{}")
+        return {
+            tag: [self._record_name(offset)[0].decode("utf-8") for offset in offsets]
+            for tag, offsets in index.items()
+        }
+
+    def tagged(self, tag: str) -> List[str]:
+        """Names of the profiles with a tag."""
+        return list(self.tags.get(tag, ()))
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._mmap.close()
+
+    def __enter__(self) -> "ProfilePack":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -8,14 +8,31 @@ This file uses keyword matching for safety, which is insufficient for production
 vision_ui.profiles
 
 Profile management for multi-device summarization.
-Supports loading named profiles (laptop, phone, slides, tweet) with screen dimensions.
+Supports loading named profiles (laptop, phone, slides, tweet) with screen dimensions, and
+token-budget profiles (prompt-8k) for LLM context windows.
+Lookups go through a `ProfileRegistry`, which caches parsed profiles and their budgets by file mtime
+and also serves profiles from `.vpk` profile packs in the profile directory.
 """
 
 import json
+import os
 import re
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, replace
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+
+from UI_UX.budget import compute_budget
+from UI_UX.budget_solver import solve_budget
+
+from .fonts import FontMetrics, load_font_metrics
+from .profile_pack import PACK_SUFFIX, ProfilePack
+from .token_profiles import TokenProfile
+
+# Profile field set by fit_profile for each solvable parameter
+_SOLVED_FIELDS = {"width": "width_px", "height": "height_px", "font": "font_size_px"}
 
 
 @dataclass
@@ -28,10 +45,25 @@ class Profile:
     editor_ruler_columns: int = 80
     buffer: float = 0.9
     image_regions: Optional[List[Dict[str, Any]]] = None  # For screenshot-aware layouts
+    font: Optional[str] = None  # TTF/OTF file; makes budgets and wrap checks font-exact
+    tags: Optional[List[str]] = None  # For selecting profiles with --profiles tag:NAME
+
+    @property
+    def font_metrics(self) -> Optional[FontMetrics]:
+        """Glyph width table of the profile's font at its font size, if it names a font."""
+        if not self.font:
+            return None
+        return load_font_metrics(self.font, self.font_size_px)
+
+    @property
+    def avg_char_width_px(self) -> Optional[float]:
+        """Measured average character width for `compute_budget` (None: use the heuristic)."""
+        metrics = self.font_metrics
+        return metrics.avg_char_width_px if metrics is not None else None
     
     def to_dict(self) -> Dict:
         """Convert profile to dictionary for serialization."""
-        return {
+        data = {
             "name": self.name,
             "width_px": self.width_px,
             "height_px": self.height_px,
@@ -39,6 +71,11 @@ class Profile:
             "editor_ruler_columns": self.editor_ruler_columns,
             "buffer": self.buffer
         }
+        if self.font:
+            data["font"] = self.font
+        if self.tags:
+            data["tags"] = list(self.tags)
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> "Profile":
@@ -46,8 +83,11 @@ class Profile:
         return cls(**data)
 
 
+# A screen profile or a token-budget profile; both are summarized side by side
+AnyProfile = Union[Profile, TokenProfile]
+
 # Default built-in profiles
-DEFAULT_PROFILES: Dict[str, Profile] = {
+DEFAULT_PROFILES: Dict[str, AnyProfile] = {
     "laptop": Profile(
         name="laptop",
         width_px=1920,
@@ -79,6 +119,13 @@ DEFAULT_PROFILES: Dict[str, Profile] = {
         font_size_px=14,
         editor_ruler_columns=40,
         buffer=0.9
+    ),
+    "prompt-8k": TokenProfile(
+        name="prompt-8k",
+        context_tokens=8192,
+        output_tokens=1024,
+        model="gpt2",
+        buffer=0.9
     )
 }
 
@@ -116,7 +163,7 @@ def _validate_profile_filename(filename: str) -> str:
     return candidate.name
 
 
-def _load_profile_file(profile_path: Path) -> Profile:
+def _load_profile_file(profile_path: Path) -> AnyProfile:
     """Load and validate a profile JSON file."""
     if profile_path.suffix.lower() != ".json":
         raise ValueError(f"Invalid profile file {profile_path}: expected a .json file")
@@ -127,12 +174,368 @@ def _load_profile_file(profile_path: Path) -> Profile:
     try:
         with profile_path.open("r", encoding="utf-8") as f:
             data = json.load(f)
-        return Profile.from_dict(data)
-    except (json.JSONDecodeError, TypeError, KeyError) as e:
+        return _profile_from_data(data, profile_path.parent)
+    except (ValueError, TypeError, KeyError) as e:
         raise ValueError(f"Invalid profile file {profile_path}: {e}") from e
 
 
-def load_profile(name_or_path: Union[str, Path]) -> Profile:
+def _profile_from_data(data: Dict[str, Any], base_dir: Path) -> AnyProfile:
+    """
+    Profile from a stored dictionary; a relative font path is relative to `base_dir`.
+
+    Dictionaries with ``context_tokens`` describe a `TokenProfile`.
+    """
+    if isinstance(data, dict) and "context_tokens" in data:
+        return TokenProfile.from_dict(data)
+    if isinstance(data, dict) and data.get("font"):
+        data["font"] = str(base_dir / Path(data["font"]).expanduser())
+    return Profile.from_dict(data)
+
+
+def _load_pack_profile(pack: ProfilePack, name: str) -> Optional[AnyProfile]:
+    """Decode one profile of a pack, or None if the pack does not have it."""
+    data = pack.get(name)
+    if data is None:
+        return None
+    try:
+        return _profile_from_data(data, pack.path.parent)
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid profile pack {pack.path}: {name}: {e}") from e
+
+
+def _read_name_list(profile_path: Path) -> List[Union[str, Path]]:
+    """Profile names from an @file: a JSON list, {"profiles": [...]}, or comma/newline text."""
+    if not profile_path.exists():
+        raise ValueError(f"Profile file not found: {profile_path}")
+    content = profile_path.read_text(encoding="utf-8").strip()
+    if not content:
+        raise ValueError(f"Profile file is empty: {profile_path}")
+    # Try JSON first
+    try:
+        data = json.loads(content)
+        if isinstance(data, list):
+            return [str(item) for item in data if str(item).strip()]
+        if isinstance(data, dict) and "profiles" in data and isinstance(data["profiles"], list):
+            return [str(item) for item in data["profiles"] if str(item).strip()]
+        # If it's a dict describing a single profile, allow direct load via path
+        if isinstance(data, dict):
+            return [profile_path]
+    except json.JSONDecodeError:
+        pass
+    # Fallback: newline or comma separated text
+    if "\n" in content:
+        return [line.strip() for line in content.splitlines() if line.strip()]
+    return [name.strip() for name in content.split(',') if name.strip()]
+
+
+def profile_budget(profile: AnyProfile) -> Dict[str, Any]:
+    """
+    `compute_budget` for a profile's screen (font-aware if it names a font), or
+    `TokenProfile.budget` for a token profile.
+    """
+    if isinstance(profile, TokenProfile):
+        return profile.budget()
+    return compute_budget(
+        width_px=profile.width_px,
+        height_px=profile.height_px,
+        font_size_px=profile.font_size_px,
+        avg_char_width_px=profile.avg_char_width_px,
+        editor_ruler_columns=profile.editor_ruler_columns,
+        buffer=profile.buffer
+    )
+
+
+class _LoadedProfile(NamedTuple):
+    mtime_ns: int
+    profile: AnyProfile
+    budget: Optional[Dict[str, Any]]  # None for token profiles until first asked for
+
+
+class ProfileRegistry:
+    """
+    Built-in plus file-backed profiles, parsed once and reloaded by mtime.
+
+    The profile directory is indexed (one ``scandir``) at most every ``refresh_interval``
+    seconds; profile files are parsed on first use and kept, with their precomputed budget,
+    until their mtime changes. A name missing from the index triggers an immediate re-scan,
+    so new files are found at once while edits to existing ones are picked up within the
+    interval. Explicit profile paths and @file name lists are cached the same way, checked
+    with a single ``stat`` per lookup.
+
+    ``*.vpk`` profile packs in the directory are mapped rather than read: a name that is not a
+    built-in or a JSON file is looked up in each pack's hash index (packs in filename order),
+    decoding only that profile. A pack replaced by a newer file, or removed, is unmapped.
+
+    A registry can be shared between threads: scans, loads and pack lookups hold a lock.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        include_builtins: bool = True,
+        refresh_interval: float = 2.0
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            directory: Profile directory (defaults to get_profile_dir())
+            include_builtins: Whether DEFAULT_PROFILES are available
+            refresh_interval: Minimum seconds between directory scans; 0 scans on every lookup
+        """
+        self.directory = Path(directory) if directory is not None else get_profile_dir()
+        self.refresh_interval = refresh_interval
+        self._builtins: Dict[str, AnyProfile] = dict(DEFAULT_PROFILES) if include_builtins else {}
+        # Computed on first use: a token profile's budget may need its tokenizer
+        self._builtin_budgets: Dict[str, Dict[str, Any]] = {}
+        self._index: Dict[str, Tuple[Path, int]] = {}  # name -> (path, mtime_ns) at last scan
+        self._pack_index: Dict[Path, int] = {}  # pack path -> mtime_ns at last scan
+        self._packs: Dict[Path, Tuple[int, ProfilePack]] = {}
+        # JSON path, or (pack path, name) -> parsed profile
+        self._loaded: Dict[Hashable, _LoadedProfile] = {}
+        self._lists: Dict[Path, Tuple[int, List[Union[str, Path]]]] = {}
+        self._last_scan: Optional[float] = None
+        # Guards the caches above; reentrant because lookups refresh and load while holding it
+        self._lock = threading.RLock()
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-index the profile directory; changed files are re-parsed on their next lookup."""
+        with self._lock:
+            now = time.monotonic()
+            if (not force and self._last_scan is not None
+                    and now - self._last_scan < self.refresh_interval):
+                return
+            self._last_scan = now
+
+            index: Dict[str, Tuple[Path, int]] = {}
+            packs: Dict[Path, int] = {}
+            try:
+                entries = sorted(os.scandir(self.directory), key=lambda entry: entry.name)
+            except OSError:
+                entries = []
+            for entry in entries:
+                stem, suffix = os.path.splitext(entry.name)
+                suffix = suffix.lower()
+                if suffix == PACK_SUFFIX:
+                    target = None
+                elif suffix == ".json" and _PROFILE_NAME_RE.fullmatch(stem):
+                    target = stem
+                else:
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    mtime_ns = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+                if target is None:
+                    packs[Path(entry.path)] = mtime_ns
+                else:
+                    index[target] = (Path(entry.path), mtime_ns)
+
+            current = {path: mtime for path, mtime in index.values()}
+            current.update(packs)
+            self._loaded = {
+                key: loaded for key, loaded in self._loaded.items()
+                if current.get(key if isinstance(key, Path) else key[0], loaded.mtime_ns)
+                == loaded.mtime_ns
+            }
+            for path, (mtime, pack) in list(self._packs.items()):
+                if packs.get(path) != mtime:
+                    del self._packs[path]
+                    pack.close()
+            self._index = index
+            self._pack_index = packs
+
+    def _load(
+        self,
+        key: Hashable,
+        mtime_ns: int,
+        read: Callable[[], Optional[AnyProfile]],
+        source: Path
+    ) -> Optional[_LoadedProfile]:
+        """Cached profile for `key`, parsed with `read` if new or modified."""
+        with self._lock:
+            loaded = self._loaded.get(key)
+            if loaded is None or loaded.mtime_ns != mtime_ns:
+                profile = read()
+                if profile is None:
+                    return None
+                budget = None
+                # Token budgets may load the profile's tokenizer: only when a run needs them
+                if not isinstance(profile, TokenProfile):
+                    try:
+                        budget = profile_budget(profile)
+                    except (OSError, RuntimeError) as e:
+                        raise ValueError(f"Invalid profile file {source}: {e}") from e
+                loaded = self._loaded[key] = _LoadedProfile(mtime_ns, profile, budget)
+            return loaded
+
+    def _load_file(self, path: Path, mtime_ns: int) -> _LoadedProfile:
+        return self._load(path, mtime_ns, lambda: _load_profile_file(path), path)
+
+    def _pack(self, path: Path, mtime_ns: int) -> ProfilePack:
+        with self._lock:
+            cached = self._packs.get(path)
+            if cached is None or cached[0] != mtime_ns:
+                if cached is not None:
+                    cached[1].close()
+                cached = self._packs[path] = (mtime_ns, ProfilePack(path))
+            return cached[1]
+
+    def _find(self, name: str) -> Optional[_LoadedProfile]:
+        entry = self._index.get(name)
+        if entry is not None:
+            return self._load_file(*entry)
+        for path, mtime_ns in self._pack_index.items():
+            pack = self._pack(path, mtime_ns)
+            loaded = self._load((path, name), mtime_ns,
+                                lambda: _load_pack_profile(pack, name), path)
+            if loaded is not None:
+                return loaded
+        return None
+
+    def _lookup(self, name: str) -> _LoadedProfile:
+        with self._lock:
+            self.refresh()
+            loaded = self._find(name)
+            if loaded is None:
+                self.refresh(force=True)
+                loaded = self._find(name)
+            if loaded is None:
+                raise ValueError(f"Profile not found: {name}")
+            return loaded
+
+    def get(self, name: str) -> AnyProfile:
+        """Return a profile by name (built-ins, then ``<directory>/<name>.json``, then packs)."""
+        if name in self._builtins:
+            return self._builtins[name]
+        return self._lookup(name).profile
+
+    def budget(self, name: str) -> Dict[str, Any]:
+        """
+        The budget of a named profile (a copy): precomputed for screen profiles, computed on
+        first use for token profiles.
+        """
+        if name in self._builtins:
+            if name not in self._builtin_budgets:
+                self._builtin_budgets[name] = profile_budget(self._builtins[name])
+            return dict(self._builtin_budgets[name])
+        loaded = self._lookup(name)
+        if loaded.budget is None:
+            return profile_budget(loaded.profile)  # the chars-per-token ratio is memoized
+        return dict(loaded.budget)
+
+    def load_path(self, path: Path) -> AnyProfile:
+        """Load a profile file outside the name index, re-parsing only when its mtime changes."""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is None or path.suffix.lower() != ".json":
+            return _load_profile_file(path)  # raises the not-found / invalid error
+        return self._load_file(path, mtime_ns).profile
+
+    def name_list(self, path: Path) -> List[Union[str, Path]]:
+        """Profile names listed in an @file, cached by mtime."""
+        with self._lock:
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                return _read_name_list(path)  # raises the not-found error
+            cached = self._lists.get(path)
+            if cached is None or cached[0] != mtime_ns:
+                cached = self._lists[path] = (mtime_ns, _read_name_list(path))
+            return list(cached[1])
+
+    def preload(self) -> List[AnyProfile]:
+        """Index the directory and parse every profile file now (e.g. at worker start-up)."""
+        with self._lock:
+            self.refresh(force=True)
+            return [self._load_file(path, mtime_ns).profile
+                    for path, mtime_ns in self._index.values()]
+
+    def _pack_names(self) -> List[str]:
+        return [name for path, mtime_ns in self._pack_index.items()
+                for name in self._pack(path, mtime_ns).names]
+
+    def names(self) -> List[str]:
+        """Names of all available profiles."""
+        with self._lock:
+            self.refresh()
+            return sorted(set(self._builtins) | set(self._index) | set(self._pack_names()))
+
+    def tagged(self, tag: str) -> List[str]:
+        """
+        Names of the profiles carrying a tag.
+
+        Packs answer from their tag index; JSON profiles are parsed (once per mtime) to read
+        their tags.
+        """
+        with self._lock:
+            self.refresh()
+            names = [name for name, (path, mtime_ns) in self._index.items()
+                     if tag in (self._load_file(path, mtime_ns).profile.tags or ())]
+            for path, mtime_ns in self._pack_index.items():
+                names += self._pack(path, mtime_ns).tagged(tag)
+            return sorted(set(names))
+
+    def select(self, selector: str) -> List[AnyProfile]:
+        """
+        Profiles matching a selector, in name order.
+
+        Args:
+            selector: ``tag:NAME`` for profiles with a tag, or a glob over profile names
+                (``pixel-*``, ``galaxy-s2?``, ``[ab]*``)
+
+        Returns:
+            Matching profiles (possibly none)
+        """
+        if selector.startswith("tag:"):
+            names = self.tagged(selector[len("tag:"):])
+        else:
+            names = [name for name in self.names() if fnmatchcase(name, selector)]
+        return [self.get(name) for name in names]
+
+    def close(self) -> None:
+        """Unmap every profile pack (they are mapped again on next use)."""
+        with self._lock:
+            for _, pack in self._packs.values():
+                pack.close()
+            self._packs = {}
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            if name in self._builtins:
+                return True
+            self.refresh()
+            return name in self._index or any(
+                name in self._pack(path, mtime_ns) for path, mtime_ns in self._pack_index.items()
+            )
+
+
+def is_profile_selector(name: str) -> bool:
+    """True for ``tag:`` selectors and name globs accepted by `ProfileRegistry.select`."""
+    return name.startswith("tag:") or any(char in name for char in "*?[")
+
+
+_default_registry: Optional[ProfileRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_profile_registry() -> ProfileRegistry:
+    """Return the process-wide profile registry for the current profile directory."""
+    global _default_registry
+    directory = get_profile_dir()
+    with _default_registry_lock:
+        if _default_registry is None or _default_registry.directory != directory:
+            if _default_registry is not None:
+                _default_registry.close()
+            _default_registry = ProfileRegistry(directory)
+        return _default_registry
+
+
+def load_profile(name_or_path: Union[str, Path]) -> AnyProfile:
     """
     Load a profile by name or from an explicit JSON file path.
     
@@ -150,30 +553,17 @@ def load_profile(name_or_path: Union[str, Path]) -> Profile:
         return DEFAULT_PROFILES[name_or_path]
 
     if isinstance(name_or_path, Path):
-        return _load_profile_file(name_or_path.expanduser())
-
-    profile_name = _validate_profile_name(name_or_path)
-    profile_path = get_profile_dir() / f"{profile_name}.json"
-    if profile_path.exists():
-        return _load_profile_file(profile_path)
+        return get_profile_registry().load_path(name_or_path.expanduser())
 
-    raise ValueError(f"Profile not found: {name_or_path}")
+    return get_profile_registry().get(_validate_profile_name(name_or_path))
 
 
 def list_profiles() -> List[str]:
     """List all available profile names (built-in + user profiles)."""
-    names = list(DEFAULT_PROFILES.keys())
-    
-    # Add user profiles
-    profile_dir = get_profile_dir()
-    if profile_dir.exists():
-        for json_file in profile_dir.glob("*.json"):
-            names.append(json_file.stem)
-    
-    return sorted(names)
+    return get_profile_registry().names()
 
 
-def save_profile(profile: Profile, filename: Optional[str] = None) -> Path:
+def save_profile(profile: AnyProfile, filename: Optional[str] = None) -> Path:
     """
     Save a profile to a JSON file.
     
@@ -195,17 +585,23 @@ def save_profile(profile: Profile, filename: Optional[str] = None) -> Path:
     profile_path = profile_dir / filename
     with open(profile_path, 'w', encoding='utf-8') as f:
         json.dump(profile.to_dict(), f, indent=2)
-    
+
+    get_profile_registry().refresh(force=True)
     return profile_path
 
 
-def parse_profiles_from_cli(profile_names: str, buffer_override: Optional[float] = None) -> List[Profile]:
+def parse_profiles_from_cli(
+    profile_names: str,
+    buffer_override: Optional[float] = None
+) -> List[AnyProfile]:
     """
     Parse profile names from CLI and return Profile objects.
     
     Supports:
     - Comma-separated names (e.g., "phone,laptop")
     - @path files containing JSON or newline/comma-separated names
+    - Selectors expanding to every matching profile, including those in profile packs:
+      ``tag:android`` (profiles tagged "android") and name globs such as ``pixel-*``
     - Optional buffer_override to apply uniformly without mutating defaults
     
     Args:
@@ -213,57 +609,73 @@ def parse_profiles_from_cli(profile_names: str, buffer_override: Optional[float]
         buffer_override: Optional buffer value to override per-profile buffer
         
     Returns:
-        List of Profile objects
+        List of Profile and TokenProfile objects
     """
     if not profile_names.strip():
         return []
 
-    def _load_names_from_file(path_str: str) -> List[Union[str, Path]]:
-        profile_path = Path(path_str)
-        if not profile_path.exists():
-            raise ValueError(f"Profile file not found: {profile_path}")
-        content = profile_path.read_text(encoding="utf-8").strip()
-        if not content:
-            raise ValueError(f"Profile file is empty: {profile_path}")
-        # Try JSON first
-        try:
-            data = json.loads(content)
-            if isinstance(data, list):
-                return [str(item) for item in data if str(item).strip()]
-            if isinstance(data, dict) and "profiles" in data and isinstance(data["profiles"], list):
-                return [str(item) for item in data["profiles"] if str(item).strip()]
-            # If it's a dict describing a single profile, allow direct load via path
-            if isinstance(data, dict):
-                return [profile_path]
-        except json.JSONDecodeError:
-            pass
-        # Fallback: newline or comma separated text
-        if "\n" in content:
-            return [line.strip() for line in content.splitlines() if line.strip()]
-        return [name.strip() for name in content.split(',') if name.strip()]
-
     names: List[Union[str, Path]]
     if profile_names.strip().startswith('@'):
-        names = _load_names_from_file(profile_names.strip()[1:])
+        names = get_profile_registry().name_list(Path(profile_names.strip()[1:]))
     else:
         names = [name.strip() for name in profile_names.split(',') if name.strip()]
 
-    profiles: List[Profile] = []
+    profiles: List[AnyProfile] = []
+    selected = set()
     for name in names:
         try:
-            loaded = load_profile(name)
-            if buffer_override is not None:
-                loaded = Profile(
-                    name=loaded.name,
-                    width_px=loaded.width_px,
-                    height_px=loaded.height_px,
-                    font_size_px=loaded.font_size_px,
-                    editor_ruler_columns=loaded.editor_ruler_columns,
-                    buffer=buffer_override,
-                    image_regions=loaded.image_regions,
-                )
-            profiles.append(loaded)
+            if isinstance(name, str) and is_profile_selector(name):
+                matches = get_profile_registry().select(name)
+                if not matches:
+                    raise ValueError(f"No profiles match '{name}'")
+                # Profiles already picked by name or another selector are not repeated
+                loaded_profiles = [p for p in matches if p.name not in selected]
+            else:
+                loaded_profiles = [load_profile(name)]
+            for loaded in loaded_profiles:
+                if buffer_override is not None:
+                    loaded = replace(loaded, buffer=buffer_override)
+                selected.add(loaded.name)
+                profiles.append(loaded)
         except ValueError as e:
             raise ValueError(f"Failed to load profile '{name}': {e}")
     
     return profiles
+
+
+def fit_profile(profile: Profile, parameter: str, target_chars: int) -> Optional[Profile]:
+    """
+    Adjust one screen parameter of a profile so its budget holds `target_chars` characters.
+
+    Width and height are lowered or raised to the smallest value that fits; the font size
+    becomes the largest that fits. Every other field is kept. Width and height use the
+    profile font's measured character width; font sizes are solved with the size-proportional
+    heuristic, since a width table is only valid at the size it was measured at.
+
+    Args:
+        profile: Base profile
+        parameter: "width", "height" or "font"
+        target_chars: Characters the screen must hold (e.g. a summary's length)
+
+    Returns:
+        A copy of the profile with the solved value, or None if no value fits
+
+    Raises:
+        ValueError: If the parameter is unknown, target_chars is below 1 or the profile is a
+            token profile
+    """
+    if isinstance(profile, TokenProfile):
+        raise ValueError(f"{profile.name} is a token profile; it has no screen to fit")
+    value = solve_budget(
+        parameter,
+        target_chars,
+        width_px=profile.width_px,
+        height_px=profile.height_px,
+        font_size_px=profile.font_size_px,
+        editor_ruler_columns=profile.editor_ruler_columns,
+        buffer=profile.buffer,
+        avg_char_width_px=profile.avg_char_width_px if parameter != "font" else None,
+    )
+    if value is None:
+        return None
+    return replace(profile, **{_SOLVED_FIELDS[parameter]: value})
@@ -0,0 +1,201 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.redaction
+
+PII redaction for text and OCR output before anything leaves the box.
+All detectors (emails, IP addresses, API tokens, card-like numbers and custom patterns) are
+combined into one regex with a named group per kind, so text is redacted in a single pass.
+Streaming input is redacted chunk by chunk with a bounded carry-over instead of buffering
+the whole document.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+_OCTET = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+_HEX = r"[0-9A-Fa-f]{1,4}"
+
+# Every built-in pattern is bounded in length so streaming redaction can use a fixed carry-over
+BUILTIN_PATTERNS: Dict[str, str] = {
+    "EMAIL": r"(?<![\w.%+-])[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63}){0,8}\.[A-Za-z]{2,24}(?![\w-])",
+    "TOKEN": (
+        r"(?<![\w-])(?:"
+        r"(?:sk|pk|rk)_(?:live|test)_[A-Za-z0-9]{16,99}"
+        r"|gh[pousr]_[A-Za-z0-9]{36,76}"
+        r"|xox[abprs]-[A-Za-z0-9-]{10,72}"
+        r"|AKIA[0-9A-Z]{16}"
+        r"|eyJ[A-Za-z0-9_-]{5,80}\.[A-Za-z0-9_-]{5,120}\.[A-Za-z0-9_-]{5,80}"
+        r"|[Bb]earer\s{1,4}[A-Za-z0-9._~+/-]{15,179}[A-Za-z0-9_~+/-]=*"
+        r")(?![\w-])"
+    ),
+    "IPV4": rf"(?<![\w.]){_OCTET}(?:\.{_OCTET}){{3}}(?!\.?\d)(?!\w)",
+    "IPV6": (
+        rf"(?<![\w:])(?:"
+        rf"(?:{_HEX}:){{7}}{_HEX}"
+        rf"|(?:{_HEX}:){{1,6}}:(?:{_HEX}:){{0,5}}{_HEX}"
+        rf"|(?:{_HEX}:){{1,7}}:"
+        rf"|::(?:{_HEX}:){{0,6}}{_HEX}"
+        rf")(?![\w:])"
+    ),
+    "CARD": r"(?<![\d-])\d(?:[ -]?\d){12,18}(?![\d-])",
+}
+
+DEFAULT_MAX_MATCH_LENGTH = 256
+
+
+def _luhn_valid(candidate: str) -> bool:
+    digits = [int(c) for c in candidate if c.isdigit()]
+    total = 0
+    for index, digit in enumerate(reversed(digits)):
+        if index % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+@dataclass(frozen=True)
+class RedactionSpan:
+    """A span of text identified as sensitive."""
+    start: int
+    end: int
+    kind: str
+
+
+@dataclass
+class RedactionReport:
+    """Counts of redacted spans by kind for one redaction run."""
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def format(self) -> str:
+        parts = ", ".join(f"{kind}={count}" for kind, count in sorted(self.counts.items()))
+        return f"redaction: {self.total} spans redacted" + (f" ({parts})" if parts else "")
+
+
+class Redactor:
+    """
+    Single-pass redactor over built-in and custom PII patterns.
+
+    Matches are replaced with ``[REDACTED:<KIND>]``. Card-like numbers are only redacted when
+    they pass a Luhn check, so order ids and timestamps survive.
+    """
+
+    def __init__(
+        self,
+        kinds: Optional[Iterable[str]] = None,
+        custom_patterns: Optional[Dict[str, str]] = None,
+        max_match_length: int = DEFAULT_MAX_MATCH_LENGTH
+    ):
+        """
+        Compile a redactor.
+
+        Args:
+            kinds: Built-in kinds to enable (default: all of BUILTIN_PATTERNS)
+            custom_patterns: Extra kind -> regex; kinds must be valid identifiers
+            max_match_length: Longest match any pattern can produce; streaming keeps this
+                many trailing characters between chunks
+        """
+        selected = list(BUILTIN_PATTERNS) if kinds is None else [kind.upper() for kind in kinds]
+        patterns: Dict[str, str] = {}
+        for kind in selected:
+            if kind not in BUILTIN_PATTERNS:
+                raise ValueError(f"Unknown redaction kind: {kind}. Available: {list(BUILTIN_PATTERNS)}")
+            patterns[kind] = BUILTIN_PATTERNS[kind]
+        for kind, pattern in (custom_patterns or {}).items():
+            kind = kind.upper()
+            if not kind.isidentifier():
+                raise ValueError(f"Invalid redaction kind name: {kind}")
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid redaction pattern for {kind}: {e}") from e
+            patterns[kind] = pattern
+        if not patterns:
+            raise ValueError("Redactor needs at least one pattern")
+
+        self.kinds = list(patterns)
+        self.max_match_length = max_match_length
+        self.pattern = re.compile("|".join(f"(?P<{kind}>{pattern})" for kind, pattern in patterns.items()))
+        self.last_report: Optional[RedactionReport] = None
+
+    def _accept(self, match: "re.Match") -> bool:
+        return match.lastgroup != "CARD" or _luhn_valid(match.group(0))
+
+    def find(self, text: str) -> List[RedactionSpan]:
+        """Return the sensitive spans in text without modifying it."""
+        return [
+            RedactionSpan(m.start(), m.end(), m.lastgroup)
+            for m in self.pattern.finditer(text)
+            if self._accept(m)
+        ]
+
+    def _redact_range(self, text: str, start: int, end: int, report: RedactionReport) -> str:
+        """Redact text[start:end]; look-arounds still see the text on either side."""
+        pieces = []
+        position = start
+        for m in self.pattern.finditer(text, start):
+            if m.start() >= end:
+                break
+            if not self._accept(m):
+                continue
+            pieces.append(text[position:m.start()])
+            pieces.append(f"[REDACTED:{m.lastgroup}]")
+            report.counts[m.lastgroup] = report.counts.get(m.lastgroup, 0) + 1
+            position = m.end()
+        pieces.append(text[position:end])
+        return "".join(pieces)
+
+    def redact(self, text: str) -> str:
+        """Redact text in a single pass; counts are left in ``last_report``."""
+        report = RedactionReport()
+        self.last_report = report
+        return self._redact_range(text, 0, len(text), report)
+
+    def iter_redact(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Redact a stream of text chunks, yielding redacted text as soon as it is final.
+
+        At most ``max_match_length`` characters (plus one of look-behind context) are held
+        back between chunks, so a match split across chunks is still redacted.
+        """
+        report = RedactionReport()
+        self.last_report = report
+        context = ""
+        carry = ""
+        for chunk in chunks:
+            window = context + carry + chunk
+            base = len(context)
+            cut = len(window) - self.max_match_length
+            if cut <= base:
+                carry = window[base:]
+                continue
+            # Never split a match: hold back any match that straddles the cut
+            for m in self.pattern.finditer(window, base):
+                if m.start() >= cut:
+                    break
+                if m.end() > cut:
+                    cut = m.start()
+                    break
+            if cut > base:
+                yield self._redact_range(window, base, cut, report)
+            context = window[cut - 1:cut] if cut > 0 else ""
+            carry = window[cut:]
+        if carry:
+            window = context + carry
+            yield self._redact_range(window, len(context), len(window), report)
+
+
+def redact_text(text: str) -> str:
+    """Convenience function: redact text with all built-in patterns."""
+    return Redactor().redact(text)
@@ -11,10 +11,14 @@ Screenshot-aware summarization handlers for OCR-based text extraction and profil
 Provides functions to process screenshots and generate multi-profile summaries.
 """
 
-from typing import Callable, Dict, List, Optional
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from .cache import SummaryCache
+from .deadline import CancellationToken, Deadline
 from .ocr import OCRExtractor, OCRResult, ScreenshotAnalyzer
 from .profiles import Profile
+from .redaction import Redactor
 
 
 def screenshot_aware_summarize(
@@ -23,7 +27,12 @@ def screenshot_aware_summarize(
     layers: List[str] = ['headline', 'one_screen'],
     persona: Optional[str] = None,
     summarizer: Optional[Callable[[str, int], str]] = None,
-    ocr_analyzer: Optional[ScreenshotAnalyzer] = None
+    ocr_analyzer: Optional[ScreenshotAnalyzer] = None,
+    redactor: Optional[Redactor] = None,
+    deadline: Optional[Deadline] = None,
+    timeout: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    cache: Optional[SummaryCache] = None
 ) -> Dict[str, Dict[str, str]]:
     """
     Generate multi-profile summaries from a screenshot using OCR.
@@ -35,23 +44,89 @@ def screenshot_aware_summarize(
         persona: Optional persona name from BUILTIN_PERSONAS
         summarizer: Optional custom summarizer function
         ocr_analyzer: Optional ScreenshotAnalyzer instance
+        redactor: Optional Redactor applied to the OCR text and regions right after extraction
+        deadline: Optional Deadline covering OCR and summarization. Tesseract is given the
+            remaining time; layers unfinished at the deadline fall back to prefix summaries
+            (see `multi_profile_summarize`)
+        timeout: Seconds until the deadline (use instead of `deadline`)
+        cancel_token: Optional CancellationToken that expires the deadline when cancelled
+        cache: Optional SummaryCache for the layer summaries of the extracted text
         
     Returns:
         Nested dictionary: {profile_name: {layer_name: summary}}
     """
+    deadline = Deadline.resolve(deadline, timeout, cancel_token)
+    ocr_result, text_density, adjusted_profiles = analyze_for_profiles(
+        image_path, profiles, ocr_analyzer, redactor, deadline
+    )
+    
+    # Import here to avoid circular import
+    from .summarize import multi_profile_summarize
+    
+    # Generate summaries using extracted text
+    summaries = multi_profile_summarize(
+        text=ocr_result.full_text,
+        profiles=adjusted_profiles,
+        layers=layers,
+        persona=persona,
+        summarizer=summarizer,
+        deadline=deadline,
+        cache=cache
+    )
+    
+    # Add OCR metadata to summaries
+    summaries['_ocr_metadata'] = ocr_metadata(ocr_result, text_density)
+    
+    return summaries
+
+
+def analyze_for_profiles(
+    image_path: str,
+    profiles: List[Profile],
+    ocr_analyzer: Optional[ScreenshotAnalyzer] = None,
+    redactor: Optional[Redactor] = None,
+    deadline: Optional[Deadline] = None
+) -> Tuple[OCRResult, float, List[Profile]]:
+    """
+    Run OCR on a screenshot and adjust profiles to its content.
+    
+    This is the blocking part of screenshot summarization (Tesseract runs here).
+    
+    Args:
+        image_path: Path to the screenshot image file
+        profiles: List of Profile objects for target devices
+        ocr_analyzer: Optional ScreenshotAnalyzer instance
+        redactor: Optional Redactor applied right after extraction
+        deadline: Optional Deadline; Tesseract is given the remaining time
+        
+    Returns:
+        Tuple of (OCR result, text density, adjusted profiles)
+    """
     # Initialize OCR analyzer
     if ocr_analyzer is None:
         ocr_analyzer = ScreenshotAnalyzer()
     
+    # Without OCR text there is nothing to fall back to
+    remaining = deadline.remaining() if deadline is not None else None
+    if deadline is not None and deadline.expired:
+        raise TimeoutError("Deadline expired before OCR could run")
+    
     # Extract text from screenshot
     try:
-        ocr_result = ocr_analyzer.analyze_screenshot(image_path)
+        if remaining is None:
+            ocr_result = ocr_analyzer.analyze_screenshot(image_path)
+        else:
+            ocr_result = ocr_analyzer.analyze_screenshot(image_path, timeout=remaining)
     except Exception as e:
         raise RuntimeError(f"Failed to analyze screenshot: {e}")
     
     if not ocr_result.full_text.strip():
         raise ValueError("No text found in screenshot")
     
+    # Redact PII before the text reaches region extraction or any summarizer
+    if redactor is not None:
+        _redact_ocr_result(ocr_result, redactor)
+    
     # Extract structured regions for layout-aware processing
     ocr_analyzer.extract_ui_regions(ocr_result)
     
@@ -61,27 +136,33 @@ def screenshot_aware_summarize(
     # Adjust profiles based on screenshot content
     adjusted_profiles = _adjust_profiles_for_screenshot(profiles, ocr_result, text_density)
     
-    # Import here to avoid circular import
-    from .summarize import multi_profile_summarize
-    
-    # Generate summaries using extracted text
-    summaries = multi_profile_summarize(
-        text=ocr_result.full_text,
-        profiles=adjusted_profiles,
-        layers=layers,
-        persona=persona,
-        summarizer=summarizer
-    )
-    
-    # Add OCR metadata to summaries
-    summaries['_ocr_metadata'] = {
+    return ocr_result, text_density, adjusted_profiles
+
+
+def ocr_metadata(ocr_result: OCRResult, text_density: float) -> Dict[str, Any]:
+    """OCR metadata attached to screenshot summaries under '_ocr_metadata'."""
+    return {
         'text_density': text_density,
         'regions_found': len(ocr_result.regions),
         'preprocessing_applied': ocr_result.preprocessing_applied,
         'image_size': ocr_result.image_info['size']
     }
+
+
+def _redact_ocr_result(ocr_result: OCRResult, redactor: Redactor) -> None:
+    """
+    Redact OCR output in place.
     
-    return summaries
+    Regions are redacted first so ``redactor.last_report`` describes the full text.
+    
+    Args:
+        ocr_result: OCR extraction result to redact
+        redactor: Redactor to apply
+    """
+    for region in ocr_result.regions:
+        if region.text:
+            region.text = redactor.redact(region.text)
+    ocr_result.full_text = redactor.redact(ocr_result.full_text)
 
 
 def _adjust_profiles_for_screenshot(
@@ -104,15 +185,7 @@ def _adjust_profiles_for_screenshot(
     
     for profile in profiles:
         # Create a copy of the profile
-        adjusted_profile = Profile(
-            name=profile.name,
-            width_px=profile.width_px,
-            height_px=profile.height_px,
-            font_size_px=profile.font_size_px,
-            editor_ruler_columns=profile.editor_ruler_columns,
-            buffer=profile.buffer,
-            image_regions=profile.image_regions
-        )
+        adjusted_profile = replace(profile)
         
         # Adjust buffer based on text density
         # Higher text density = more conservative budget
@@ -126,19 +199,26 @@ def _adjust_profiles_for_screenshot(
     return adjusted_profiles
 
 
-def extract_text_from_screenshot(image_path: str, preprocess: bool = True) -> str:
+def extract_text_from_screenshot(
+    image_path: str,
+    preprocess: bool = True,
+    redactor: Optional[Redactor] = None
+) -> str:
     """
     Convenience function to extract text from a screenshot.
     
     Args:
         image_path: Path to the screenshot image file
         preprocess: Whether to apply preprocessing
+        redactor: Optional Redactor applied to the extracted text
         
     Returns:
         Extracted text as string
     """
     extractor = OCRExtractor()
     result = extractor.extract_text(image_path, preprocess=preprocess)
+    if redactor is not None:
+        _redact_ocr_result(result, redactor)
     return result.full_text
 
 
@@ -0,0 +1,113 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.segments
+
+Sentence segmentation shared across profiles, layers and personas.
+`SegmentedText` splits a document once, the same way `UI_UX.budget.naive_summarize` does, and
+keeps a prefix-length index so any character budget resolves with a binary search instead of
+re-splitting and re-joining the whole text.
+"""
+
+import hashlib
+from bisect import bisect_right
+from functools import cached_property
+from typing import List, Optional
+
+from UI_UX.cell_width import cell_width, shorten_cells
+
+from .cache import text_hash
+
+
+class SegmentedText:
+    """Text split into raw '.'-separated pieces with a sentence prefix index."""
+
+    def __init__(self, pieces: List[str], text: Optional[str] = None):
+        """
+        Initialize from raw pieces.
+
+        Args:
+            pieces: Result of ``text.split('.')`` (unstripped, empty pieces kept)
+            text: Optional original text, to avoid re-joining the pieces
+        """
+        self.pieces = pieces
+        if text is not None:
+            self.__dict__["text"] = text
+
+    @classmethod
+    def from_text(cls, text: str) -> "SegmentedText":
+        """Segment a document."""
+        return cls(text.split("."), text)
+
+    @cached_property
+    def text(self) -> str:
+        """The document text."""
+        return ".".join(self.pieces)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Stripped, non-empty sentences in document order."""
+        return [s for s in (p.strip() for p in self.pieces) if s]
+
+    @cached_property
+    def prefix_lengths(self) -> List[int]:
+        """``prefix_lengths[k]`` is ``cell_width('. '.join(sentences[:k + 1]) + '.')``."""
+        lengths = []
+        total = -1  # k sentences cost sum(cells) + 2 * (k - 1) separators + 1 final period
+        for sentence in self.sentences:
+            total += cell_width(sentence) + 2
+            lengths.append(total)
+        return lengths
+
+    @cached_property
+    def content_hash(self) -> str:
+        """Short SHA-256 of the text, used for deep-layer provenance."""
+        return hashlib.sha256(self.text.encode()).hexdigest()[:8]
+
+    @cached_property
+    def digest(self) -> str:
+        """Full content hash of the text (`cache.text_hash`), used in cache keys."""
+        return text_hash(self.text)
+
+    @property
+    def is_empty(self) -> bool:
+        """True for the empty document."""
+        return not self.pieces or self.pieces == [""]
+
+    def fitting_sentences(self, char_limit: int) -> int:
+        """Number of leading sentences whose joined summary fits in char_limit."""
+        return bisect_right(self.prefix_lengths, char_limit)
+
+    def summarize(self, char_limit: int) -> str:
+        """
+        Equivalent of ``naive_summarize(self.text, char_limit)`` using the prefix index.
+
+        Args:
+            char_limit: Maximum characters for the summary
+
+        Returns:
+            Summary string
+        """
+        if self.is_empty:
+            return ""
+
+        max_chars = max(10, int(char_limit))
+        count = self.fitting_sentences(max_chars)
+        if count == 0:
+            return shorten_cells(self.text, width=max_chars, placeholder='...')
+        return '. '.join(self.sentences[:count]) + '.'
+
+    def with_affixes(self, prefix: str = "", suffix: str = "") -> "SegmentedText":
+        """Segmentation of ``prefix + self.text + suffix`` without re-splitting the body."""
+        pieces = self.pieces
+        if prefix:
+            head = prefix.split(".")
+            pieces = head[:-1] + [head[-1] + pieces[0]] + pieces[1:]
+        if suffix:
+            tail = suffix.split(".")
+            pieces = pieces[:-1] + [pieces[-1] + tail[0]] + tail[1:]
+        return SegmentedText(list(pieces))
@@ -0,0 +1,235 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.store
+
+Searchable history of past summaries.
+Every recorded run (document reference and hash, timing) and its summaries per persona, profile
+and layer go into a local SQLite database with an FTS5 index, so earlier summaries can be found
+by content without re-summarizing or grepping raw logs.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .cache import default_cache_path, text_hash
+from .segments import SegmentedText
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    doc_id TEXT,
+    doc_hash TEXT NOT NULL,
+    elapsed_ms REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS summaries USING fts5(
+    summary,
+    run_id UNINDEXED,
+    persona UNINDEXED,
+    profile UNINDEXED,
+    layer UNINDEXED,
+    tokenize = 'unicode61'
+);
+"""
+
+
+def default_store_path() -> Path:
+    """Default result store location, next to the summary cache."""
+    return default_cache_path().parent / "results.sqlite3"
+
+
+def _quote_terms(query: str) -> str:
+    """Turn free text into an FTS5 query of quoted terms (implicit AND)."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+@dataclass
+class SearchHit:
+    """One summary matching a search."""
+    run_id: int
+    created: float
+    doc_id: Optional[str]
+    doc_hash: str
+    persona: Optional[str]
+    profile: str
+    layer: str
+    summary: str
+    snippet: str
+
+    @property
+    def document(self) -> str:
+        """Document reference: its id if recorded, else a short content hash."""
+        return self.doc_id or self.doc_hash[:12]
+
+    def format(self) -> str:
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.created))
+        view = f"{self.profile}.{self.layer}"
+        if self.persona:
+            view = f"{self.persona}/{view}"
+        return f"{stamp}  {self.document}  {view}: {self.snippet}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "created": self.created,
+            "doc_id": self.doc_id,
+            "doc_hash": self.doc_hash,
+            "persona": self.persona,
+            "profile": self.profile,
+            "layer": self.layer,
+            "summary": self.summary,
+        }
+
+
+class ResultStore:
+    """
+    SQLite database of past runs with a full-text index over their summaries.
+
+    Runs in WAL mode, so several processes can record and search at the same time.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open (or create) a result store.
+
+        Args:
+            path: Database file (default: `default_store_path()`)
+
+        Raises:
+            RuntimeError: If Python's SQLite library was built without FTS5
+        """
+        self.path = Path(path) if path is not None else default_store_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self._conn.close()
+            raise RuntimeError(f"SQLite was built without FTS5 support: {e}") from e
+
+    def record(
+        self,
+        results: Dict[str, Any],
+        text: Union[str, bytes, SegmentedText],
+        doc_id: Optional[str] = None,
+        persona: Optional[str] = None,
+        elapsed_ms: Optional[float] = None,
+        personas: bool = False
+    ) -> int:
+        """
+        Store one run's summaries.
+
+        Args:
+            results: Output of `multi_profile_summarize`: {profile: {layer: summary}}, or
+                {persona: {profile: {layer: summary}}} with `personas=True`. Keys starting
+                with "_" (e.g. '_ocr_metadata') are skipped.
+            text: The summarized document (text, segmented or raw bytes such as an image
+                file); only its hash is stored
+            doc_id: Optional document reference, e.g. a file path
+            persona: Persona name of single-persona results
+            elapsed_ms: How long the run took
+            personas: Whether `results` is a persona matrix
+
+        Returns:
+            Id of the recorded run
+        """
+        doc_hash = text.digest if isinstance(text, SegmentedText) else text_hash(text)
+        matrix = results if personas else {persona: results}
+        rows = []
+        for persona_name, profiles in matrix.items():
+            for profile_name, layers in profiles.items():
+                if profile_name.startswith("_"):
+                    continue
+                for layer_name, summary in layers.items():
+                    rows.append((summary, persona_name, profile_name, layer_name))
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (created, doc_id, doc_hash, elapsed_ms) VALUES (?, ?, ?, ?)",
+                (time.time(), doc_id, doc_hash, elapsed_ms)
+            )
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO summaries (summary, run_id, persona, profile, layer) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(summary, run_id, persona_name, profile_name, layer_name)
+                 for summary, persona_name, profile_name, layer_name in rows]
+            )
+        return run_id
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        profile: Optional[str] = None,
+        layer: Optional[str] = None,
+        persona: Optional[str] = None
+    ) -> List[SearchHit]:
+        """
+        Find summaries matching a full-text query, best matches first.
+
+        FTS5 query syntax ("replica lag", NEAR(...), OR, prefix*) is accepted; input that is
+        not valid FTS5 syntax is searched as plain terms instead.
+
+        Args:
+            query: Search query
+            limit: Maximum number of hits
+            profile: Only return summaries for this profile
+            layer: Only return summaries for this layer
+            persona: Only return summaries for this persona
+
+        Returns:
+            List of SearchHit
+        """
+        if not query.strip():
+            return []
+        try:
+            return self._search(query, limit, profile, layer, persona)
+        except sqlite3.OperationalError:
+            return self._search(_quote_terms(query), limit, profile, layer, persona)
+
+    def _search(
+        self,
+        query: str,
+        limit: int,
+        profile: Optional[str],
+        layer: Optional[str],
+        persona: Optional[str]
+    ) -> List[SearchHit]:
+        sql = (
+            "SELECT r.id, r.created, r.doc_id, r.doc_hash, s.persona, s.profile, s.layer, "
+            "s.summary, snippet(summaries, 0, '*', '*', '...', 16) "
+            "FROM summaries s JOIN runs r ON r.id = s.run_id "
+            "WHERE summaries MATCH ?"
+        )
+        params: List[Any] = [query]
+        for column, value in (("profile", profile), ("layer", layer), ("persona", persona)):
+            if value is not None:
+                sql += f" AND s.{column} = ?"
+                params.append(value)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def __len__(self) -> int:
+        """Number of recorded runs."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
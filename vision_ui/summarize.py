@@ -11,70 +11,600 @@ Multi-profile summarization coordination and output formatting.
 Integrates layered summarization with persona adaptations across device profiles.
 """
 
-from typing import Callable, Dict, List, Optional
+import json
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
-from UI_UX.budget import compute_budget, naive_summarize
+from UI_UX.budget import naive_summarize
+from UI_UX.budget_table import BudgetTable
 
-from .layered_summarizer import layered_summarize
-from .personas import BUILTIN_PERSONAS
-from .profiles import Profile
+from .cache import SummaryCache, summarizer_identity
+from .deadline import CANCEL_POLL_SECONDS, DEADLINE_MARKER, CancellationToken, Deadline
+from .dedup import SimHashIndex, simhash
+from .layered_summarizer import (
+    DEFAULT_LAYERS,
+    LayerPlan,
+    PreparedDocument,
+    _run_summarizer,
+    plan_layer,
+)
+from .normalize import BUILTIN_STAGES, TextNormalizer
+from .personas import (  # noqa: F401 (BUILTIN_PERSONAS re-exported)
+    BUILTIN_PERSONAS,
+    CompiledPersona,
+    Persona,
+    compile_persona,
+    resolve_persona,
+)
+from .profiles import AnyProfile
+from .redaction import Redactor
+from .screening import Screener, ScreeningReport
+from .segments import SegmentedText
+from .token_profiles import TokenProfile
+from .wrap import WrapFitter, WrapReport, layer_lines
+
+# A persona name, or a persona object (e.g. from a PersonaRegistry)
+PersonaSpec = Union[str, Persona, CompiledPersona]
 
 
 def multi_profile_summarize(
-    text: str,
-    profiles: List[Profile],
+    text: Union[str, SegmentedText],
+    profiles: List[AnyProfile],
     layers: List[str] = ['headline', 'one_screen', 'deep'],
-    persona: Optional[str] = None,
-    summarizer: Optional[Callable[[str, int], str]] = None
-) -> Dict[str, Dict[str, str]]:
+    persona: Optional[PersonaSpec] = None,
+    summarizer: Optional[Callable[[str, int], str]] = None,
+    dedup_index: Optional[SimHashIndex] = None,
+    force_recompute: bool = False,
+    normalizer: Optional[TextNormalizer] = None,
+    personas: Optional[List[PersonaSpec]] = None,
+    screener: Optional[Screener] = None,
+    screen_action: str = "flag",
+    redactor: Optional[Redactor] = None,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    deadline: Optional[Deadline] = None,
+    timeout: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    cache: Optional[SummaryCache] = None,
+    wrap_fitter: Optional[WrapFitter] = None
+) -> Dict[str, Any]:
     """
     Generate multi-profile, multi-layer summaries.
     
     Args:
-        text: Input text to summarize
-        profiles: List of Profile objects
+        text: Input text to summarize, or an already segmented document such as a
+            memory-mapped `docindex.MappedDocument`
+        profiles: List of Profile objects; TokenProfile objects (LLM context budgets) can be
+            mixed in and share the segmentation and summarizer calls with screen profiles
         layers: List of layer names to generate for each profile
-        persona: Optional persona name from BUILTIN_PERSONAS
+        persona: Optional persona name (built-in or from the persona directory), or a
+            Persona/CompiledPersona object
         summarizer: Optional custom summarizer function
+        dedup_index: Optional SimHashIndex; near-duplicates of a document already summarized
+            with the same profiles, layers, persona and summarizer reuse the stored result
+        force_recompute: Skip the dedup lookup (the fresh result is still indexed)
+        normalizer: Optional TextNormalizer applied to the text first; its per-stage
+            byte counts are left in ``normalizer.last_report``
+        personas: Optional list of personas (use instead of `persona`). The text is
+            segmented and budgets are computed once, then shared by every persona.
+        screener: Optional Screener run over the input before budgets are allocated and over
+            every summary afterwards; matches are left in ``screener.last_report``
+        screen_action: What to do with input sentences containing matches: "flag", "drop"
+            or "report" (leave unchanged)
+        redactor: Optional Redactor applied to the text before any other stage, so PII never
+            reaches summaries, caches or indexes; counts are left in ``redactor.last_report``
+        executor: Optional concurrent.futures executor the summarizer calls for every
+            profile and layer are fanned out to: a thread pool for I/O-bound summarizers,
+            a process pool for CPU-bound ones (the summarizer must then be picklable).
+            Output order is unchanged. The default summarizer always runs inline.
+        max_workers: Fan out to a thread pool of this size created for the call
+            (use instead of `executor`)
+        deadline: Optional Deadline; summarizer calls stop starting once it expires (and
+            executor calls stop being waited for). Unfinished layers fall back to the
+            prefix summary for their budget, prefixed with DEADLINE_MARKER, and the count
+            is left in ``deadline.fallbacks``
+        timeout: Seconds until the deadline (use instead of `deadline`)
+        cancel_token: Optional CancellationToken that expires the deadline when cancelled
+        cache: Optional SummaryCache; layer summaries already computed for the same text,
+            budget, persona definition and summarizer are served from it, and new ones are
+            stored (summarizers without a stable identity are not cached)
+        wrap_fitter: Optional WrapFitter; every summary is word-wrapped at its profile's
+            effective columns and shortened until it fits the layer's share of the screen's
+            lines (token profiles have no screen and are left as they are); counts are left
+            in ``wrap_fitter.last_report``
         
     Returns:
-        Nested dictionary: {profile_name: {layer_name: summary}}
+        Nested dictionary: {profile_name: {layer_name: summary}}, or
+        {persona_name: {profile_name: {layer_name: summary}}} when `personas` is given
     """
     if summarizer is None:
         summarizer = naive_summarize
     
-    persona_obj = None
-    if persona:
-        if persona not in BUILTIN_PERSONAS:
-            raise ValueError(f"Unknown persona: {persona}. Available: {list(BUILTIN_PERSONAS.keys())}")
-        persona_obj = BUILTIN_PERSONAS[persona]
-    
-    results = {}
-    
-    for profile in profiles:
-        # Compute budget for this profile
-        budget = compute_budget(
-            width_px=profile.width_px,
-            height_px=profile.height_px,
-            font_size_px=profile.font_size_px,
-            editor_ruler_columns=profile.editor_ruler_columns,
-            buffer=profile.buffer
+    if personas is not None and persona:
+        raise ValueError("Pass either persona or personas, not both")
+    if executor is not None and max_workers is not None:
+        raise ValueError("Pass either executor or max_workers, not both")
+    deadline = Deadline.resolve(deadline, timeout, cancel_token)
+    
+    persona_specs = list(personas) if personas is not None else [persona]
+    persona_names = [_persona_label(spec) for spec in persona_specs]
+    persona_objs = [_resolve_persona(spec) for spec in persona_specs]
+    
+    # Persona-independent work: segmentation, content hash and per-profile budgets
+    segments = _segment_input(text, redactor, normalizer)
+    
+    if dedup_index is not None:
+        fingerprint = simhash(segments.text)
+        # Personas named by string are keyed by their current definition, so editing a
+        # persona file does not serve results summarized under the old one
+        persona_key = tuple(
+            (name, _persona_key(obj)) for name, obj in zip(persona_names, persona_objs)
         )
-        
-        target_chars = budget["target_chars"]
-        
-        # Generate layered summaries for this profile
-        profile_summaries = layered_summarize(
-            text=text,
-            char_budget=target_chars,
-            layers=layers,
-            persona=persona_obj,
-            summarizer=summarizer
+        screen_key = (screener, screen_action) if screener is not None else None
+        # The fingerprint is taken after redaction, which barely moves it; without the
+        # preparation settings in the key a redacted run could reuse an unredacted result
+        run_key = _dedup_key(
+            profiles, layers,
+            (persona_key, screen_key, wrap_fitter is not None,
+             _prepare_key(redactor, normalizer)),
+            summarizer
         )
+        if not force_recompute:
+            cached = dedup_index.lookup(fingerprint, run_key)
+            if cached is not None:
+                return _copy_results(cached)
+    
+    budgets = _target_chars_for(profiles)
+    
+    segments, report = _screen_input(segments, screener, screen_action)
+    
+    # Plan every (persona, profile, layer) summarizer call, then run them all at once
+    matrix: Dict[str, Dict[str, Dict[str, str]]] = {}
+    jobs = []
+    for persona_name, persona_obj in zip(persona_names, persona_objs):
+        prepared = PreparedDocument(segments, persona_obj)
+        matrix[persona_name] = {}
+        for profile, target_chars in zip(profiles, budgets):
+            matrix[persona_name][profile.name] = {}
+            for layer_name in layers:
+                jobs.append((persona_name, profile.name, plan_layer(prepared, target_chars, layer_name)))
+    
+    cache_keys = _cache_keys(cache, summarizer, segments, persona_objs, budgets, layers)
+    cached = cache.get_many(cache_keys) if cache_keys else {}
+    if cached:
+        pending = []
+        for index, (persona_name, profile_name, plan) in enumerate(jobs):
+            if cache_keys[index] in cached:
+                matrix[persona_name][profile_name][plan.layer_name] = cached[cache_keys[index]]
+            else:
+                pending.append(index)
+    else:
+        pending = list(range(len(jobs)))
+    
+    raw_summaries = _run_plans(
+        summarizer, [jobs[index][2] for index in pending], executor, max_workers, deadline
+    )
+    fallbacks = 0
+    fresh: Dict[str, str] = {}
+    for index, summary in zip(pending, raw_summaries):
+        persona_name, profile_name, plan = jobs[index]
+        if summary is None:
+            # Missed the deadline: the prefix summary is a binary search away
+            summary = DEADLINE_MARKER + plan.finish(plan.document.summarize(plan.char_limit))
+            fallbacks += 1
+        else:
+            summary = plan.finish(summary)
+            if cache_keys:
+                fresh[cache_keys[index]] = summary
+        matrix[persona_name][profile_name][plan.layer_name] = summary
+    if deadline is not None:
+        deadline.fallbacks += fallbacks
+    if fresh:
+        cache.put_many(fresh)
+    
+    if wrap_fitter is not None:
+        _fit_wrapped(wrap_fitter, matrix, jobs, profiles)
+    
+    if report is not None:
+        for persona_name, results in matrix.items():
+            for profile_name, profile_summaries in results.items():
+                report_key = profile_name if personas is None else f"{persona_name}.{profile_name}"
+                report.summary_matches[report_key] = {
+                    layer_name: screener.scan(summary)
+                    for layer_name, summary in profile_summaries.items()
+                }
+    
+    output: Dict[str, Any] = matrix if personas is not None else matrix[persona_names[0]]
+    
+    if dedup_index is not None and not fallbacks:
+        dedup_index.add(fingerprint, run_key, _copy_results(output))
+    
+    return output
+
+
+def iter_multi_profile_summarize(
+    text: Union[str, SegmentedText],
+    profiles: List[AnyProfile],
+    layers: List[str] = ['headline', 'one_screen', 'deep'],
+    persona: Optional[PersonaSpec] = None,
+    summarizer: Optional[Callable[[str, int], str]] = None,
+    normalizer: Optional[TextNormalizer] = None,
+    screener: Optional[Screener] = None,
+    screen_action: str = "flag",
+    redactor: Optional[Redactor] = None
+) -> Iterator[Tuple[AnyProfile, str, str]]:
+    """
+    Generate multi-profile, multi-layer summaries progressively, cheapest first.
+    
+    Results are yielded as soon as each one is computed: every headline before any
+    one_screen, every one_screen before any deep, and within a layer the smallest budgets
+    first. Collecting all results gives the same summaries as `multi_profile_summarize`.
+    
+    Args:
+        text: Input text to summarize, or an already segmented document such as a
+            memory-mapped `docindex.MappedDocument`
+        profiles: List of Profile and TokenProfile objects
+        layers: List of layer names to generate for each profile
+        persona: Optional persona name (built-in or from the persona directory)
+        summarizer: Optional custom summarizer function
+        normalizer: Optional TextNormalizer applied to the text first
+        screener: Optional Screener; see `multi_profile_summarize`
+        screen_action: What to do with input sentences containing matches
+        redactor: Optional Redactor applied to the text before any other stage
         
-        results[profile.name] = profile_summaries
+    Yields:
+        (profile, layer_name, summary) tuples
+    """
+    if summarizer is None:
+        summarizer = naive_summarize
+    
+    for layer_name in layers:
+        if layer_name not in DEFAULT_LAYERS:
+            raise ValueError(f"Unknown layer: {layer_name}")
+    
+    prepared, targets, report = prepare_input(
+        text, profiles, persona, normalizer, screener, screen_action, redactor
+    )
+    
+    # Order work by layer size first, then by the layer's character budget
+    order = []
+    for profile_index, target_chars in enumerate(targets):
+        for layer_index, layer_name in enumerate(layers):
+            multiplier = DEFAULT_LAYERS[layer_name].budget_multiplier
+            cost = int(target_chars * multiplier)
+            order.append((multiplier, cost, profile_index, layer_index, target_chars))
+    order.sort()
     
-    return results
+    # Profiles with equal effective budgets share one summarizer call
+    raw_summaries: Dict[Tuple[int, int], str] = {}
+    for _, _, profile_index, layer_index, target_chars in order:
+        profile = profiles[profile_index]
+        plan = plan_layer(prepared, target_chars, layers[layer_index])
+        if plan.call_key not in raw_summaries:
+            raw_summaries[plan.call_key] = _run_summarizer(summarizer, plan.document, plan.char_limit)
+        layer_name = plan.layer_name
+        summary = plan.finish(raw_summaries[plan.call_key])
+        if report is not None:
+            report.summary_matches.setdefault(profile.name, {})[layer_name] = screener.scan(summary)
+        yield profile, layer_name, summary
+
+
+class PreparedInput(NamedTuple):
+    """Output of `prepare_input`."""
+    document: PreparedDocument
+    target_chars: List[int]  # one per profile, in order
+    report: Optional[ScreeningReport]  # None without a screener
+
+
+def prepare_input(
+    text: Union[str, SegmentedText],
+    profiles: List[AnyProfile],
+    persona: Optional[PersonaSpec] = None,
+    normalizer: Optional[TextNormalizer] = None,
+    screener: Optional[Screener] = None,
+    screen_action: str = "flag",
+    redactor: Optional[Redactor] = None
+) -> PreparedInput:
+    """
+    Everything a single-persona run does before calling the summarizer.
+
+    Resolves the persona; redacts, normalizes, segments and screens the text (leaving the
+    screening report on the screener); and computes each profile's character target. This is
+    the CPU-bound part of a run that doesn't depend on the summarizer; layers are then
+    planned with ``plan_layer(prepared.document, target_chars, layer_name)``.
+
+    Args:
+        text: Input text, or an already segmented document
+        profiles: List of Profile and TokenProfile objects
+        persona: Optional persona name or object
+        normalizer: Optional TextNormalizer applied to the text first
+        screener: Optional Screener; see `multi_profile_summarize`
+        screen_action: What to do with input sentences containing matches
+        redactor: Optional Redactor applied to the text before any other stage
+
+    Returns:
+        PreparedInput of the prepared document, per-profile targets and screening report
+    """
+    persona_obj = _resolve_persona(persona)
+    segments, report = _screen_input(
+        _segment_input(text, redactor, normalizer), screener, screen_action
+    )
+    document = PreparedDocument(segments, persona_obj)
+    return PreparedInput(document, _target_chars_for(profiles), report)
+
+
+def _run_plans(
+    summarizer: Callable[[str, int], str],
+    plans: List[LayerPlan],
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    deadline: Optional[Deadline] = None
+) -> List[Optional[str]]:
+    """
+    Run the summarizer call of every plan, in order.
+    
+    Plans that resolve to the same document and character limit (profiles with equal
+    effective budgets) share one call. Calls go to the executor (or a thread pool of
+    max_workers) when one is given, except for naive_summarize, which resolves through the
+    shared prefix index faster than a task hop.
+    
+    With a deadline, calls start cheapest first and plans whose call has not finished when
+    the deadline expires get None.
+    """
+    unique: Dict[Tuple[int, int], int] = {}
+    calls: List[LayerPlan] = []
+    slots = []
+    for plan in plans:
+        slot = unique.setdefault(plan.call_key, len(calls))
+        if slot == len(calls):
+            calls.append(plan)
+        slots.append(slot)
+    
+    order = list(range(len(calls)))
+    if deadline is not None:
+        order.sort(key=lambda index: calls[index].char_limit)
+    
+    results: List[Optional[str]] = [None] * len(calls)
+    if summarizer is naive_summarize or (executor is None and max_workers is None):
+        for index in order:
+            if deadline is not None and deadline.expired:
+                break
+            plan = calls[index]
+            results[index] = _run_summarizer(summarizer, plan.document, plan.char_limit)
+    elif deadline is None:
+        texts = [plan.document.text for plan in calls]
+        limits = [plan.char_limit for plan in calls]
+        if executor is not None:
+            results = list(executor.map(summarizer, texts, limits))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(summarizer, texts, limits))
+    else:
+        pool = executor if executor is not None else ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            _collect_until(pool, summarizer, calls, order, deadline, results)
+        finally:
+            if executor is None:
+                # Don't wait for stragglers; _collect_until has cancelled the queued calls
+                pool.shutdown(wait=False)
+    
+    return [results[slot] for slot in slots]
+
+
+def _collect_until(
+    pool: Executor,
+    summarizer: Callable[[str, int], str],
+    calls: List[LayerPlan],
+    order: List[int],
+    deadline: Deadline,
+    results: List[Optional[str]]
+) -> None:
+    """Submit calls to the pool and collect results until they finish or the deadline hits."""
+    futures = {
+        pool.submit(summarizer, calls[index].document.text, calls[index].char_limit): index
+        for index in order
+    }
+    pending = set(futures)
+    try:
+        while pending:
+            remaining = deadline.remaining()
+            if remaining is not None and remaining <= 0.0:
+                break
+            # Poll so a cancellation token is noticed even without a time limit
+            timeout = CANCEL_POLL_SECONDS if deadline.token is not None else remaining
+            if remaining is not None:
+                timeout = min(timeout, remaining)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+    finally:
+        # Executor.shutdown(cancel_futures=True) needs Python 3.9; cancel queued calls here
+        for future in pending:
+            future.cancel()
+
+
+def _prepare_text(
+    text: str,
+    redactor: Optional[Redactor],
+    normalizer: Optional[TextNormalizer]
+) -> str:
+    """Apply redaction and normalization, in that order."""
+    if redactor is not None:
+        text = redactor.redact(text)
+    if normalizer is not None:
+        text = normalizer.normalize(text)
+    return text
+
+
+def _prepare_key(
+    redactor: Optional[Redactor],
+    normalizer: Optional[TextNormalizer]
+) -> Hashable:
+    """
+    Identity of the redaction and normalization settings for dedup keys.
+
+    Redactors are keyed by their compiled pattern, built-in normalization stages by name and
+    custom stages by object.
+    """
+    redactor_key = redactor.pattern.pattern if redactor is not None else None
+    normalizer_key = None
+    if normalizer is not None:
+        normalizer_key = tuple(
+            stage.name if BUILTIN_STAGES.get(stage.name) is type(stage) else stage
+            for stage in normalizer.stages
+        )
+    return (redactor_key, normalizer_key)
+
+
+def _segment_input(
+    text: Union[str, SegmentedText],
+    redactor: Optional[Redactor],
+    normalizer: Optional[TextNormalizer]
+) -> SegmentedText:
+    """
+    Segment the input after redaction and normalization.
+
+    Already segmented documents (e.g. a `docindex.MappedDocument`) are used as they are
+    unless a stage has to rewrite their text.
+    """
+    if isinstance(text, SegmentedText):
+        if redactor is None and normalizer is None:
+            return text
+        text = text.text
+    return SegmentedText.from_text(_prepare_text(text, redactor, normalizer))
+
+
+def _screen_input(
+    segments: SegmentedText,
+    screener: Optional[Screener],
+    screen_action: str
+) -> Tuple[SegmentedText, Optional[ScreeningReport]]:
+    """Screen the segmented input, leaving a fresh report on the screener."""
+    if screener is None:
+        return segments, None
+    segments, matches, affected = screener.screen_segments(segments, screen_action)
+    report = ScreeningReport(input_matches=matches, sentences_affected=affected)
+    screener.last_report = report
+    return segments, report
+
+
+def _resolve_persona(spec: Optional[PersonaSpec]) -> Optional[CompiledPersona]:
+    """Look up a compiled persona by name or compile an object; None or empty means none."""
+    if not spec:
+        return None
+    if isinstance(spec, str):
+        return resolve_persona(spec)
+    return compile_persona(spec)
+
+
+def _persona_label(spec: Optional[PersonaSpec]) -> Optional[str]:
+    """Name a persona is reported under."""
+    if spec is None or isinstance(spec, str):
+        return spec
+    return spec.name
+
+
+def _persona_key(spec: Optional[Union[Persona, CompiledPersona]]) -> Hashable:
+    """Hashable identity of a resolved persona for cache and dedup keys: its definition."""
+    if not spec:
+        return None
+    persona = spec.persona if isinstance(spec, CompiledPersona) else spec
+    return json.dumps(persona.to_dict(), sort_keys=True)
+
+
+def _budget_key(profile: AnyProfile) -> Tuple[Any, ...]:
+    """The profile fields that determine its character budget."""
+    if isinstance(profile, TokenProfile):
+        return ("tokens", profile.model, profile.context_tokens, profile.output_tokens,
+                profile.buffer, profile.chars_per_token)
+    return (profile.width_px, profile.height_px, profile.font_size_px,
+            profile.editor_ruler_columns, profile.buffer, profile.font)
+
+
+def _target_chars_for(profiles: List[AnyProfile]) -> List[int]:
+    """
+    Character targets for profiles: screens from the memoized vectorized budget table, token
+    profiles from their model's calibrated chars-per-token ratio.
+    """
+    screens = [p for p in profiles if not isinstance(p, TokenProfile)]
+    targets = iter(BudgetTable.for_profiles(screens).target_chars)
+    return [
+        profile.target_chars if isinstance(profile, TokenProfile) else int(next(targets))
+        for profile in profiles
+    ]
+
+
+def _fit_wrapped(
+    wrap_fitter: WrapFitter,
+    matrix: Dict[str, Dict[str, Dict[str, str]]],
+    jobs: List[Tuple[str, str, LayerPlan]],
+    profiles: List[AnyProfile]
+) -> None:
+    """Shorten every summary in the matrix until it fits its profile's screen when wrapped."""
+    profiles = [p for p in profiles if not isinstance(p, TokenProfile)]
+    table = BudgetTable.for_profiles(profiles)
+    screens = {
+        profile.name: (int(columns), int(lines), profile.font_metrics)
+        for profile, columns, lines in zip(profiles, table.effective_columns, table.lines)
+    }
+    wrap_fitter.last_report = WrapReport()
+    for persona_name, profile_name, plan in jobs:
+        if profile_name not in screens:
+            continue  # token profiles have no screen to wrap on
+        columns, lines, font = screens[profile_name]
+        summaries = matrix[persona_name][profile_name]
+        summary = summaries[plan.layer_name]
+        lead = plan.prefix
+        if summary.startswith(DEADLINE_MARKER):
+            lead = DEADLINE_MARKER + lead
+        summaries[plan.layer_name] = wrap_fitter.fit(
+            summary, columns, layer_lines(lines, plan.layer_name), lead=lead, tail=plan.postfix,
+            font=font
+        )
+
+
+def _cache_keys(
+    cache: Optional[SummaryCache],
+    summarizer: Callable[[str, int], str],
+    segments: SegmentedText,
+    persona_objs: List[Optional[CompiledPersona]],
+    budgets: List[int],
+    layers: List[str]
+) -> List[str]:
+    """Cache keys for every (persona, profile, layer) job, in job order; empty if uncached."""
+    if cache is None:
+        return []
+    summarizer_id = summarizer_identity(summarizer)
+    if summarizer_id is None:
+        return []
+    doc_hash = segments.digest
+    return [
+        SummaryCache.key(doc_hash, target_chars, layer_name, _persona_key(persona_obj), summarizer_id)
+        for persona_obj in persona_objs
+        for target_chars in budgets
+        for layer_name in layers
+    ]
+
+
+def _copy_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy nested result dictionaries so callers can't mutate stored results."""
+    return {k: _copy_results(v) if isinstance(v, dict) else v for k, v in results.items()}
+
+
+def _dedup_key(
+    profiles: List[AnyProfile],
+    layers: List[str],
+    persona: Hashable,
+    summarizer: Callable[[str, int], str]
+) -> Hashable:
+    """Exact-match part of a dedup lookup: everything except the text itself."""
+    profile_key = tuple((p.name,) + _budget_key(p) for p in profiles)
+    try:
+        hash(summarizer)
+        summarizer_key: Hashable = summarizer
+    except TypeError:
+        summarizer_key = repr(summarizer)
+    return (profile_key, tuple(layers), persona, summarizer_key)
 
 
 def format_multi_profile_output(
@@ -112,3 +642,36 @@ def format_multi_profile_output(
                 lines.append("")  # Empty line between layers
             lines.append("")  # Empty line between profiles
         return "\n".join(lines).strip()
+
+
+def format_persona_matrix_output(
+    matrix: Dict[str, Dict[str, Dict[str, str]]],
+    format_type: str = "stacked"
+) -> str:
+    """
+    Format persona-matrix summaries for display.
+    
+    Args:
+        matrix: Output from multi_profile_summarize(..., personas=[...])
+        format_type: "stacked", "json", or "compact"
+        
+    Returns:
+        Formatted string
+    """
+    if format_type == "json":
+        import json
+        return json.dumps(matrix, indent=2)
+    
+    if format_type == "compact":
+        lines = []
+        for persona_name, summaries in matrix.items():
+            for line in format_multi_profile_output(summaries, "compact").splitlines():
+                lines.append(f"{persona_name}.{line}")
+        return "\n".join(lines)
+    
+    sections = []
+    for persona_name, summaries in matrix.items():
+        sections.append(f"##### {persona_name.upper()} #####")
+        sections.append(format_multi_profile_output(summaries, "stacked"))
+        sections.append("")
+    return "\n".join(sections).strip()
@@ -0,0 +1,340 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.sweep
+
+Budget sweeps over grids of screen configurations.
+The grid is the cartesian product of the swept axes; it is computed in fixed-size chunks with
+`BudgetTable` and streamed as CSV, JSON lines or a `.npy` matrix without building per-row dicts.
+"""
+
+import ast
+import math
+import struct
+import sys
+from array import array
+from itertools import chain
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from UI_UX.budget_table import _FLOAT_COLUMNS, BUDGET_COLUMNS, BudgetTable, _number
+
+try:
+    import numpy as np
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore
+    _NUMPY_AVAILABLE = False
+
+# Sweepable parameter -> BudgetTable argument / output column
+SWEEP_PARAMETERS = {
+    "width": "width_px",
+    "height": "height_px",
+    "font": "font_size_px",
+    "ruler": "editor_ruler_columns",
+    "buffer": "buffer",
+}
+SWEEP_FORMATS = ("csv", "jsonl", "npy")
+DEFAULT_CHUNK_ROWS = 65536
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+Number = Union[int, float]
+
+
+class SweepAxis:
+    """One swept parameter and its values."""
+
+    def __init__(self, name: str, values: Sequence[Number]):
+        if name not in SWEEP_PARAMETERS:
+            raise ValueError(
+                f"Unknown sweep parameter '{name}'; expected one of {', '.join(SWEEP_PARAMETERS)}"
+            )
+        if not values:
+            raise ValueError(f"Sweep axis '{name}' has no values")
+        self.name = name
+        self.column = SWEEP_PARAMETERS[name]
+        self.values = list(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"SweepAxis({self.name!r}, {len(self.values)} values)"
+
+
+def _parse_number(text: str) -> Number:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_sweep_axis(spec: str) -> SweepAxis:
+    """
+    Parse ``name=start:stop[:step]`` (inclusive range, step 1 by default) or ``name=a,b,c``.
+
+    Args:
+        spec: Axis specification, e.g. ``width=320:3840:16`` or ``font=12,14,16``
+
+    Returns:
+        SweepAxis
+
+    Raises:
+        ValueError: If the specification is malformed
+    """
+    name, sep, values = spec.partition("=")
+    name = name.strip()
+    if not sep or not values.strip():
+        raise ValueError(f"Sweep axis must look like name=start:stop[:step], got '{spec}'")
+    try:
+        if ":" not in values:
+            return SweepAxis(name, [_parse_number(v) for v in values.split(",")])
+        parts = [_parse_number(v) for v in values.split(":")]
+    except ValueError:
+        raise ValueError(f"Sweep axis '{spec}' contains a non-numeric value")
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Sweep axis must look like name=start:stop[:step], got '{spec}'")
+    start, stop = parts[0], parts[1]
+    step = parts[2] if len(parts) == 3 else 1
+    if step <= 0:
+        raise ValueError(f"Sweep step must be positive, got {step} in '{spec}'")
+    if stop < start:
+        raise ValueError(f"Sweep stop must not be below start in '{spec}'")
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    if all(isinstance(p, int) for p in (start, step)):
+        return SweepAxis(name, range(start, start + count * step, step))
+    return SweepAxis(name, [round(start + i * step, 10) for i in range(count)])
+
+
+def parse_sweep(specs: Sequence[str]) -> List[SweepAxis]:
+    """Parse several axis specifications, rejecting repeated parameters."""
+    axes = [parse_sweep_axis(spec) for spec in specs]
+    names = [axis.name for axis in axes]
+    for name in names:
+        if names.count(name) > 1:
+            raise ValueError(f"Sweep parameter '{name}' given more than once")
+    return axes
+
+
+def default_sweep_columns(axes: Sequence[SweepAxis], floats: bool = True) -> List[str]:
+    """
+    Default output columns: the swept parameters, then the `compute_budget` fields.
+
+    Args:
+        axes: Sweep axes
+        floats: Include the floating-point font metric columns (left out of compact
+            binary output)
+    """
+    columns = [axis.column for axis in axes]
+    return columns + [
+        c for c in BUDGET_COLUMNS if c not in columns and (floats or c not in _FLOAT_COLUMNS)
+    ]
+
+
+class BudgetSweep:
+    """
+    Budgets for the cartesian product of sweep axes, computed chunk by chunk.
+
+    Rows are in C order over the axes as given (the last axis varies fastest). Parameters
+    that are not swept take their fixed value from `fixed`.
+    """
+
+    def __init__(
+        self,
+        axes: Sequence[SweepAxis],
+        fixed: Optional[Dict[str, Any]] = None,
+        columns: Optional[Sequence[str]] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ):
+        """
+        Set up a sweep.
+
+        Args:
+            axes: Swept parameters, outermost first
+            fixed: Values for parameters that are not swept, keyed by sweep parameter name
+                (``width``, ``height``, ``font``, ``ruler``, ``buffer``); ``ruler=None``
+                means no ruler
+            columns: Output columns (default: `default_sweep_columns`)
+            chunk_rows: Rows computed per `BudgetTable`
+
+        Raises:
+            ValueError: If width or height is neither swept nor fixed, or a column is unknown
+        """
+        self.axes = list(axes)
+        self.fixed = {"font": 14, "ruler": 80, "buffer": 0.9}
+        self.fixed.update(fixed or {})
+        swept = {axis.name for axis in self.axes}
+        for name in ("width", "height"):
+            if name not in swept and self.fixed.get(name) is None:
+                raise ValueError(f"Sweep needs a {name}: sweep it or give a fixed value")
+
+        if columns is None:
+            columns = default_sweep_columns(self.axes)
+        known = set(BUDGET_COLUMNS) | set(SWEEP_PARAMETERS.values())
+        unknown = [c for c in columns if c not in known]
+        if unknown:
+            raise ValueError(f"Unknown sweep column(s): {', '.join(unknown)}")
+        self.columns = list(columns)
+        self.shape = tuple(len(axis) for axis in self.axes)
+        self.chunk_rows = max(1, chunk_rows)
+
+    def __len__(self) -> int:
+        return math.prod(self.shape)
+
+    def _axis_values(self, start: int, stop: int) -> Dict[str, Any]:
+        """Per-row values of every swept parameter for rows [start, stop)."""
+        values = {}
+        stride = len(self)
+        if _NUMPY_AVAILABLE:
+            index = np.arange(start, stop, dtype=np.int64)
+        for axis in self.axes:
+            stride //= len(axis)
+            if _NUMPY_AVAILABLE:
+                values[axis.name] = np.asarray(axis.values)[(index // stride) % len(axis)]
+            else:
+                n = len(axis)
+                values[axis.name] = [axis.values[(i // stride) % n] for i in range(start, stop)]
+        return values
+
+    def tables(self) -> Iterator[BudgetTable]:
+        """Yield one `BudgetTable` per chunk of rows, in row order."""
+        for start in range(0, len(self), self.chunk_rows):
+            params = dict(self.fixed)
+            params.update(self._axis_values(start, min(start + self.chunk_rows, len(self))))
+            yield BudgetTable(
+                params["width"], params["height"], params["font"], params["ruler"],
+                params["buffer"]
+            )
+
+    def column_chunks(self) -> Iterator[List[List[Number]]]:
+        """Yield the selected columns of each chunk as lists of plain Python numbers."""
+        for table in self.tables():
+            yield [_plain_column(table, name) for name in self.columns]
+
+    def write_csv(self, out: TextIO, header: bool = True) -> int:
+        """Stream the sweep as CSV; returns the number of rows written."""
+        if header:
+            out.write(",".join(self.columns) + "\n")
+        row_format = ",".join(["%s"] * len(self.columns)) + "\n"
+        return self._write_rows(out, row_format)
+
+    def write_jsonl(self, out: TextIO) -> int:
+        """Stream the sweep as JSON lines; returns the number of rows written."""
+        row_format = "{" + ", ".join(f'"{c}": %s' for c in self.columns) + "}\n"
+        return self._write_rows(out, row_format)
+
+    def _write_rows(self, out: TextIO, row_format: str) -> int:
+        rows = 0
+        for chunk in self.column_chunks():
+            out.writelines(row_format % row for row in zip(*chunk))
+            rows += len(chunk[0]) if chunk else 0
+        return rows
+
+    def _values(self, name: str) -> List[Number]:
+        """Every value a sweep parameter takes, leaving out None (no ruler)."""
+        for axis in self.axes:
+            if axis.name == name:
+                return [value for value in axis.values if value is not None]
+        value = self.fixed.get(name)
+        return [] if value is None else [value]
+
+    def npy_dtype(self) -> str:
+        """
+        Element type of the `.npy` matrix.
+
+        ``<f8`` when a floating-point column (or a swept parameter with fractional values) is
+        selected, else ``<i4``, or ``<i8`` if values could exceed 32 bits.
+        """
+        selected = set(self.columns)
+        if selected & set(_FLOAT_COLUMNS):
+            return "<f8"
+        for name, column in SWEEP_PARAMETERS.items():
+            if column in selected and any(float(v) != int(v) for v in self._values(name)):
+                return "<f8"
+        widths, heights = self._values("width"), self._values("height")
+        # char_budget is at most (width / 4) * (height / 12); other columns are inputs or smaller
+        largest = max(widths + heights + self._values("ruler") + [max(widths) / 4 * max(heights) / 12])
+        return "<i4" if largest < 2 ** 31 else "<i8"
+
+    def write_npy(self, out: BinaryIO) -> int:
+        """
+        Stream the sweep as a `.npy` matrix of shape ``(*axis lengths, columns)``.
+
+        Load it with ``numpy.load``; ``matrix[i, j, ..., k]`` is column `k` of the
+        configuration at index ``(i, j, ...)`` on the sweep axes.
+
+        Returns:
+            Number of rows written
+        """
+        dtype = self.npy_dtype()
+        shape = self.shape + (len(self.columns),)
+        header = repr({"descr": dtype, "fortran_order": False, "shape": shape})
+        # Pad so the data starts on a 64-byte boundary, as numpy.save does
+        padding = -(len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+        header = (header + " " * padding + "\n").encode("latin1")
+        out.write(_NPY_MAGIC + struct.pack("<H", len(header)) + header)
+
+        typecode = {"<i4": "i", "<i8": "q", "<f8": "d"}[dtype]
+        rows = 0
+        for table in self.tables():
+            if _NUMPY_AVAILABLE:
+                matrix = np.column_stack(
+                    [getattr(table, name) for name in self.columns]
+                ).astype(dtype, copy=False)
+                out.write(matrix.tobytes())
+            else:
+                chunk = [_plain_column(table, name) for name in self.columns]
+                values = array(typecode, chain.from_iterable(zip(*chunk)))
+                if sys.byteorder != "little":
+                    values.byteswap()
+                out.write(values.tobytes())
+            rows += len(table)
+        return rows
+
+    def write(self, out: Union[TextIO, BinaryIO], fmt: str = "csv") -> int:
+        """
+        Stream the sweep in one of `SWEEP_FORMATS`.
+
+        Args:
+            out: Text stream for csv/jsonl, binary stream for npy
+            fmt: Output format
+
+        Returns:
+            Number of rows written
+        """
+        if fmt == "csv":
+            return self.write_csv(out)
+        if fmt == "jsonl":
+            return self.write_jsonl(out)
+        if fmt == "npy":
+            return self.write_npy(out)
+        raise ValueError(f"Unknown sweep format '{fmt}'; expected one of {', '.join(SWEEP_FORMATS)}")
+
+
+def _plain_column(table: BudgetTable, name: str) -> List[Number]:
+    """A table column as Python numbers, typed like `compute_budget` values."""
+    values = getattr(table, name).tolist()
+    if name not in _FLOAT_COLUMNS and values and isinstance(values[0], float):
+        return [_number(v) for v in values]
+    return values
+
+
+def load_npy_header(data: bytes) -> Tuple[str, Tuple[int, ...], int]:
+    """
+    Parse the header of a `.npy` file written by `BudgetSweep.write_npy`.
+
+    Args:
+        data: File contents (at least the header)
+
+    Returns:
+        (dtype, shape, data offset)
+    """
+    if not data.startswith(_NPY_MAGIC):
+        raise ValueError("Not a version 1.0 .npy file")
+    (length,) = struct.unpack_from("<H", data, len(_NPY_MAGIC))
+    start = len(_NPY_MAGIC) + 2
+    header = ast.literal_eval(data[start:start + length].decode("latin1"))
+    return header["descr"], tuple(header["shape"]), start + length
@@ -0,0 +1,237 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.token_profiles
+
+Token-budget profiles: targets measured in an LLM's context window instead of a screen.
+A `TokenProfile` names a model and its context/output token limits and is summarized alongside
+screen profiles. Its character target comes from the model's chars-per-token ratio, measured
+once with the model's tokenizer and kept in a calibration table on disk. Budgets only use
+tokenizers already on disk unless downloads are enabled, so computing them never reaches the
+network by surprise.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from UI_UX.cell_width import cell_width
+from UI_UX.token_utils import get_tokenizer, tokens_to_chars
+
+from .cache import default_cache_path
+from .fonts import REFERENCE_TEXT
+
+# Ratio used when a model has no calibration and no tokenizer can be loaded (as token_utils)
+DEFAULT_CHARS_PER_TOKEN = 4.0
+# Set to 1 to let budgets download the tokenizers of uncalibrated models
+DOWNLOAD_ENV = "VISION_UI_TOKENIZER_DOWNLOAD"
+
+
+@dataclass
+class TokenProfile:
+    """LLM context profile: the summary must fit a prompt for `model`."""
+    name: str
+    context_tokens: int
+    output_tokens: int = 0  # Reserved for the model's reply
+    model: str = "gpt2"  # Tokenizer used to calibrate chars per token
+    buffer: float = 0.9
+    chars_per_token: Optional[float] = None  # Fixed ratio; None uses the calibration table
+    tags: Optional[List[str]] = None  # For selecting profiles with --profiles tag:NAME
+
+    @property
+    def token_budget(self) -> int:
+        """Tokens available to the summary: the context window minus the reserved output."""
+        return self.context_tokens - self.output_tokens
+
+    @property
+    def target_tokens(self) -> int:
+        return int(self.token_budget * self.buffer)
+
+    @property
+    def resolved_chars_per_token(self) -> float:
+        """The profile's fixed ratio, or the model's calibrated one."""
+        if self.chars_per_token:
+            return float(self.chars_per_token)
+        return chars_per_token(self.model)
+
+    @property
+    def target_chars(self) -> int:
+        """Summary character target (display cells, like screen budgets)."""
+        return tokens_to_chars(self.target_tokens, self.resolved_chars_per_token)
+
+    def budget(self) -> Dict[str, Any]:
+        """Token budget in the shape of `compute_budget`'s result where the fields apply."""
+        ratio = self.resolved_chars_per_token
+        return {
+            "model": self.model,
+            "context_tokens": self.context_tokens,
+            "output_tokens": self.output_tokens,
+            "token_budget": self.token_budget,
+            "target_tokens": self.target_tokens,
+            "chars_per_token": ratio,
+            "char_budget": tokens_to_chars(self.token_budget, ratio),
+            "target_chars": tokens_to_chars(self.target_tokens, ratio),
+        }
+
+    def to_dict(self) -> Dict:
+        """Convert profile to dictionary for serialization."""
+        data = {
+            "name": self.name,
+            "context_tokens": self.context_tokens,
+            "output_tokens": self.output_tokens,
+            "model": self.model,
+            "buffer": self.buffer
+        }
+        if self.chars_per_token:
+            data["chars_per_token"] = self.chars_per_token
+        if self.tags:
+            data["tags"] = list(self.tags)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TokenProfile":
+        """Create profile from dictionary."""
+        profile = cls(**data)
+        if profile.token_budget <= 0:
+            raise ValueError(
+                f"output_tokens ({profile.output_tokens}) must be below "
+                f"context_tokens ({profile.context_tokens})"
+            )
+        return profile
+
+
+def default_calibration_path() -> Path:
+    """Where measured chars-per-token ratios are kept: next to the summary cache."""
+    return default_cache_path().parent / "token_calibration.json"
+
+
+# (model, calibration table path) -> ratio
+_ratios: Dict[Tuple[str, str], float] = {}
+_ratios_lock = threading.Lock()
+
+
+def _table_path(path: Optional[Union[str, Path]]) -> Path:
+    return Path(path) if path is not None else default_calibration_path()
+
+
+def downloads_enabled() -> bool:
+    """Whether budgets may download tokenizers: the `DOWNLOAD_ENV` environment variable."""
+    return os.environ.get(DOWNLOAD_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def _count_tokens(tokenizer: Any, text: str) -> int:
+    try:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+    except TypeError:  # tokenizers without the Hugging Face keyword (e.g. tiktoken)
+        return len(tokenizer.encode(text))
+
+
+def _read_table(path: Path) -> Dict[str, float]:
+    try:
+        table = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(table, dict):
+        return {}
+    return {str(k): float(v) for k, v in table.items() if isinstance(v, (int, float)) and v > 0}
+
+
+def _write_table(path: Path, model: str, ratio: float) -> None:
+    table = _read_table(path)
+    table[model] = ratio
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(table, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def calibrate_chars_per_token(
+    model: str,
+    tokenizer: Any = None,
+    samples: Optional[Sequence[str]] = None,
+    path: Optional[Union[str, Path]] = None,
+    download: bool = True
+) -> float:
+    """
+    Measure a model's chars-per-token ratio and record it in the calibration table.
+
+    Characters are counted in display cells, so CJK text (about one token per wide character)
+    calibrates to the same units budgets are counted in.
+
+    Args:
+        model: Model name the ratio is stored under
+        tokenizer: Tokenizer with ``encode`` (default: `get_tokenizer(model)`, without remote
+            code)
+        samples: Representative texts (default: a paragraph of English prose)
+        path: Calibration table file (default: `default_calibration_path`)
+        download: Whether the default tokenizer may be downloaded (False uses only a
+            tokenizer already on disk)
+
+    Returns:
+        Chars per token; `DEFAULT_CHARS_PER_TOKEN` (kept in memory only, so a later run with a
+        tokenizer available still calibrates) if no tokenizer could be loaded
+    """
+    table_path = _table_path(path)
+    if tokenizer is None:
+        # Model names come from profile files: never run a repository's tokenizer code
+        tokenizer = get_tokenizer(model, trust_remote_code=False, local_files_only=not download)
+    ratio = None
+    if tokenizer is not None:
+        texts = [s for s in (samples or [REFERENCE_TEXT]) if s]
+        tokens = sum(_count_tokens(tokenizer, s) for s in texts)
+        if tokens:
+            ratio = sum(cell_width(s) for s in texts) / tokens
+    if ratio is None:
+        ratio = DEFAULT_CHARS_PER_TOKEN
+    else:
+        try:
+            _write_table(table_path, model, ratio)
+        except OSError:
+            pass  # an unwritable table only costs a recalibration next run
+    with _ratios_lock:
+        _ratios[(model, str(table_path))] = ratio
+    return ratio
+
+
+def chars_per_token(
+    model: str,
+    path: Optional[Union[str, Path]] = None,
+    download: Optional[bool] = None
+) -> float:
+    """
+    A model's chars-per-token ratio: memoized, then from the calibration table, then measured.
+
+    Unlike `token_aware_budget`, which re-estimates the ratio on every call, the tokenizer is
+    loaded at most once per model, table and process, and not at all once a ratio is on disk.
+    An uncalibrated model whose tokenizer is not on disk gets `DEFAULT_CHARS_PER_TOKEN`
+    unless downloads are allowed; call `calibrate_chars_per_token` to measure it explicitly.
+
+    Args:
+        model: Model name
+        path: Calibration table file (default: `default_calibration_path`)
+        download: Whether measuring may download the tokenizer (default: `downloads_enabled`)
+
+    Returns:
+        Chars per token
+    """
+    table_path = _table_path(path)
+    key = (model, str(table_path))
+    with _ratios_lock:
+        ratio = _ratios.get(key)
+    if ratio is not None:
+        return ratio
+    ratio = _read_table(table_path).get(model)
+    if ratio is None:
+        if download is None:
+            download = downloads_enabled()
+        return calibrate_chars_per_token(model, path=table_path, download=download)
+    with _ratios_lock:
+        _ratios[key] = ratio
+    return ratio
@@ -5,7 +5,7 @@ Rich formatting and triage board functionality for multi-profile summarization.
 Provides side-by-side comparison, colored output, and enhanced display options.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from rich import box
 from rich.align import Align
@@ -13,8 +13,12 @@ from rich.console import Console
 from rich.table import Table
 from rich.text import Text
 
+from UI_UX.cell_width import cell_width, truncate_cells
+
 from .layered_summarizer import DEFAULT_LAYERS
-from .profiles import Profile
+from .profiles import AnyProfile
+from .summarize import _target_chars_for
+from .token_profiles import TokenProfile
 
 
 class TriageBoard:
@@ -27,7 +31,7 @@ class TriageBoard:
     def display_comparison(
         self, 
         summaries: Dict[str, Dict[str, str]], 
-        profiles: List[Profile],
+        profiles: List[AnyProfile],
         show_metadata: bool = False,
         ocr_metadata: Optional[Dict[str, Any]] = None
     ) -> None:
@@ -65,10 +69,43 @@ class TriageBoard:
             self._display_layer_comparison(display_summaries, profiles, layer)
             self.console.print()
     
+    def display_progressive(
+        self,
+        results: Iterable[Tuple[AnyProfile, str, str]],
+        profiles: List[AnyProfile]
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Print results as they arrive, then the full comparison once all are done.
+        
+        Args:
+            results: (profile, layer_name, summary) tuples, e.g. from
+                `iter_multi_profile_summarize`
+            profiles: List of profile objects used
+            
+        Returns:
+            Collected summaries: {profile_name: {layer_name: summary}}
+        """
+        summaries: Dict[str, Dict[str, str]] = {profile.name: {} for profile in profiles}
+        for profile, layer, summary in results:
+            summaries.setdefault(profile.name, {})[layer] = summary
+            width = cell_width(summary)
+            length_style = self._get_length_style(width)
+            preview = truncate_cells(summary, 100)
+            line = Text.assemble(
+                (f"{profile.name.upper():<12}", "bold"),
+                (f"{layer:<12}", "cyan"),
+                (f"{width:>6} ", length_style),
+                preview.replace("\n", " ")
+            )
+            self.console.print(line)
+        self.console.print()
+        self.display_comparison(summaries, profiles)
+        return summaries
+    
     def _display_layer_comparison(
         self, 
         summaries: Dict[str, Dict[str, str]], 
-        profiles: List[Profile], 
+        profiles: List[AnyProfile], 
         layer: str
     ) -> None:
         """Display comparison for a specific layer."""
@@ -97,21 +134,20 @@ class TriageBoard:
             profile_summary = summaries.get(profile_name, {})
             summary = profile_summary.get(layer, "N/A")
             
-            # Truncate very long summaries for display
-            if len(summary) > 200:
-                display_summary = summary[:197] + "..."
-            else:
-                display_summary = summary
+            # Truncate very long summaries for display (in screen cells, so CJK text is not
+            # allowed twice the room)
+            display_summary = truncate_cells(summary, 200)
             
             # Color code based on summary length
-            length_style = self._get_length_style(len(summary))
+            width = cell_width(summary)
+            length_style = self._get_length_style(width)
             
             table.add_row(
                 profile_name.upper(),
                 self._get_device_type(profile),
-                f"{profile.width_px}×{profile.height_px}",
+                self._get_resolution(profile),
                 display_summary,
-                f"[{length_style}]{len(summary)}[/{length_style}]"
+                f"[{length_style}]{width}[/{length_style}]"
             )
         
         self.console.print(table)
@@ -153,7 +189,7 @@ class TriageBoard:
         self.console.print(metadata_table)
         self.console.print()
     
-    def display_profile_info(self, profiles: List[Profile]) -> None:
+    def display_profile_info(self, profiles: List[AnyProfile]) -> None:
         """Display detailed profile information."""
         table = Table(
             title="📊 Device Profile Information",
@@ -169,24 +205,18 @@ class TriageBoard:
         table.add_column("Buffer", style="white", width=8)
         table.add_column("Budget", style="green", width=12)
         
-        for profile in profiles:
-            # Calculate budget for this profile
-            from UI_UX.budget import compute_budget
-            budget = compute_budget(
-                width_px=profile.width_px,
-                height_px=profile.height_px,
-                font_size_px=profile.font_size_px,
-                editor_ruler_columns=profile.editor_ruler_columns,
-                buffer=profile.buffer
-            )
-            
+        for profile, target_chars in zip(profiles, _target_chars_for(profiles)):
+            if isinstance(profile, TokenProfile):
+                font_size, columns = profile.model, "-"
+            else:
+                font_size, columns = f"{profile.font_size_px}px", str(profile.editor_ruler_columns)
             table.add_row(
                 profile.name.upper(),
-                f"{profile.width_px}×{profile.height_px}",
-                f"{profile.font_size_px}px",
-                str(profile.editor_ruler_columns),
+                self._get_resolution(profile),
+                font_size,
+                columns,
                 f"{profile.buffer:.1%}",
-                f"{budget['target_chars']:,} chars"
+                f"{int(target_chars):,} chars"
             )
         
         self.console.print(table)
@@ -200,10 +230,12 @@ class TriageBoard:
         except ValueError:
             return 999
     
-    def _get_device_type(self, profile: Profile) -> str:
+    def _get_device_type(self, profile: AnyProfile) -> str:
         """Get human-readable device type from profile."""
         name = profile.name.lower()
-        if name == "phone":
+        if isinstance(profile, TokenProfile):
+            return "🤖 Prompt"
+        elif name == "phone":
             return "📱 Mobile"
         elif name == "laptop":
             return "💻 Laptop"
@@ -214,6 +246,12 @@ class TriageBoard:
         else:
             return "🖥️ Display"
     
+    def _get_resolution(self, profile: AnyProfile) -> str:
+        """Screen size, or context window size for token profiles."""
+        if isinstance(profile, TokenProfile):
+            return f"{profile.context_tokens:,} tok"
+        return f"{profile.width_px}×{profile.height_px}"
+    
     def _get_length_style(self, length: int) -> str:
         """Get color style based on summary length."""
         if length < 50:
@@ -228,7 +266,7 @@ class TriageBoard:
 
 def format_triage_output(
     summaries: Dict[str, Dict[str, str]], 
-    profiles: List[Profile],
+    profiles: List[AnyProfile],
     show_profile_info: bool = False,
     show_metadata: bool = False,
     ocr_metadata: Optional[Dict[str, Any]] = None
@@ -268,7 +306,7 @@ def format_triage_output(
 
 def display_triage_board(
     summaries: Dict[str, Dict[str, str]], 
-    profiles: List[Profile],
+    profiles: List[AnyProfile],
     show_profile_info: bool = False,
     show_metadata: bool = False,
     ocr_metadata: Optional[Dict[str, Any]] = None
@@ -0,0 +1,227 @@
+"""
+LIMITATIONS:
+
+This file uses keyword matching for safety, which is insufficient for production without classifier context.
+"""
+
+"""
+vision_ui.wrap
+
+Wrap-accurate verification of summaries against a profile's screen.
+`compute_budget` assumes every column of every line is used; word wrapping wastes line ends, so a
+summary within its character budget can still need more lines than the screen has. `WrapFitter`
+wraps summaries greedily over precomputed word lengths and drops trailing sentences until they fit.
+Words are measured in display cells (wide CJK characters take two), or in pixels given a profile
+font's `FontMetrics`.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterable, Optional, Sequence, Tuple
+
+from UI_UX.cell_width import cell_width
+
+from .fonts import FontMetrics
+from .layered_summarizer import DEFAULT_LAYERS
+from .segments import SegmentedText
+
+ELLIPSIS = "..."
+
+# A text as hard lines ('\n'-separated) of word lengths (display cells, or px with a font)
+WordLengths = Tuple[Tuple[float, ...], ...]
+
+
+def word_lengths(text: str, measure: Callable[[str], float] = cell_width) -> WordLengths:
+    """Lengths of the whitespace-separated words of each hard line of `text`."""
+    return tuple(tuple(measure(word) for word in line.split()) for line in text.split("\n"))
+
+
+def _advance(
+    state: Tuple[int, float],
+    hard_lines: Iterable[Sequence[float]],
+    width: float,
+    space: float = 1
+) -> Tuple[int, float]:
+    """
+    Continue a greedy wrap.
+
+    Args:
+        state: (lines used, column reached on the last line; 0 for an empty line)
+        hard_lines: Word lengths per hard line; the first continues the current line
+        width: Line width (cells, or px when words are measured in px)
+        space: Width of the space between words
+
+    Returns:
+        The state after placing every word
+    """
+    lines, col = state
+    first = True
+    for words in hard_lines:
+        if not first:
+            lines += 1
+            col = 0
+        first = False
+        for n in words:
+            if col:
+                if col + space + n <= width:
+                    col += space + n
+                    continue
+                if n > width:
+                    # Words longer than a line start in the rest of the current one, as in textwrap
+                    n -= max(0, width - col - space)
+                lines += 1
+            if n <= width:
+                col = n
+            else:
+                extra, col = divmod(n, width)
+                if col == 0:
+                    extra, col = extra - 1, width
+                lines += extra
+    return lines, col
+
+
+def wrapped_line_count(text: str, width: int, font: Optional[FontMetrics] = None) -> int:
+    """
+    Lines `text` takes when greedily word-wrapped at `width` columns (display cells).
+
+    With a font, lines are `width` average characters wide in px and words are measured with
+    the font's advance widths (words longer than a line are split by width, not by glyph).
+    """
+    line_width, measure, space = _metrics(width, font)
+    return _advance((1, 0), word_lengths(text, measure), line_width, space)[0]
+
+
+def _metrics(
+    columns: int,
+    font: Optional[FontMetrics]
+) -> Tuple[float, Callable[[str], float], float]:
+    """Line width, word measure and space width for wrapping at `columns` (in px with a font)."""
+    columns = max(1, columns)
+    if font is None:
+        return columns, cell_width, 1
+    return columns * font.avg_char_width_px, font.text_width, font.space_width_px
+
+
+@lru_cache(maxsize=1024)
+def _sentence_word_lengths(
+    text: str,
+    measure: Callable[[str], float] = cell_width
+) -> Tuple[Tuple[str, ...], Tuple[WordLengths, ...]]:
+    """Sentences of a summary with their word lengths, each ending in its '.'."""
+    sentences = tuple(SegmentedText.from_text(text).sentences)
+    period = measure(".")
+    lengths = []
+    for sentence in sentences:
+        hard_lines = [list(line) for line in word_lengths(sentence, measure)]
+        if hard_lines[-1]:
+            hard_lines[-1][-1] += period  # the period joined to the last word
+        else:
+            hard_lines[-1].append(period)
+        lengths.append(tuple(tuple(line) for line in hard_lines))
+    return sentences, tuple(lengths)
+
+
+def layer_lines(lines: int, layer_name: str) -> int:
+    """Lines available to a layer: its share of the screen (the layer's budget multiplier)."""
+    return max(1, int(lines * DEFAULT_LAYERS[layer_name].budget_multiplier))
+
+
+@dataclass
+class WrapReport:
+    """Summaries checked and shrunk by one fitting run."""
+    checked: int = 0
+    shrunk: int = 0
+    chars_removed: int = 0
+
+    def format(self) -> str:
+        return (f"wrap: {self.shrunk} of {self.checked} summaries shortened to fit their screens "
+                f"(-{self.chars_removed} chars)")
+
+
+class WrapFitter:
+    """
+    Shortens summaries until they fit a screen when word-wrapped.
+
+    A summary that already fits is returned unchanged. Otherwise it is cut back to its longest
+    leading run of sentences that fits (the same sentence prefixes `SegmentedText` indexes);
+    if not even the first sentence fits, its whitespace is collapsed and it is cut at a word
+    boundary, ending with an ellipsis. Word lengths are computed once per distinct summary (and
+    font), so profiles that share a summary only pay for the wrap itself.
+    """
+
+    def __init__(self):
+        self.last_report: Optional[WrapReport] = None
+
+    def fits(
+        self,
+        text: str,
+        columns: int,
+        lines: int,
+        font: Optional[FontMetrics] = None
+    ) -> bool:
+        """True if `text` wraps into at most `lines` lines of `columns` characters."""
+        return wrapped_line_count(text, columns, font) <= lines
+
+    def fit(
+        self,
+        summary: str,
+        columns: int,
+        lines: int,
+        lead: str = "",
+        tail: str = "",
+        font: Optional[FontMetrics] = None
+    ) -> str:
+        """
+        Shorten a summary to fit `lines` lines of `columns` characters.
+
+        Args:
+            summary: Summary text
+            columns: Line width in cells (a profile's effective columns)
+            lines: Lines available
+            lead: Leading tag kept verbatim and counted (e.g. the deep layer's hash)
+            tail: Trailing addendum kept verbatim and not counted (e.g. appended persona
+                examples, which are outside the text budget)
+            font: The profile font's metrics, to wrap by measured glyph widths
+
+        Returns:
+            The summary, shortened if it did not fit
+        """
+        width, measure, space = _metrics(columns, font)
+        report = self.last_report
+        if report is not None:
+            report.checked += 1
+        body = summary[:-len(tail)] if tail and summary.endswith(tail) else summary
+        suffix = summary[len(body):]
+        if _advance((1, 0), word_lengths(body, measure), width, space)[0] <= lines:
+            return summary
+        if not body.startswith(lead):
+            lead = ""
+
+        state = _advance((1, 0), word_lengths(lead, measure), width, space)
+        sentences, lengths = _sentence_word_lengths(body[len(lead):], measure)
+        count = 0
+        for hard_lines in lengths:
+            after = _advance(state, hard_lines, width, space)
+            if after[0] > lines:
+                break
+            state, count = after, count + 1
+
+        if count:
+            fitted = lead + ". ".join(sentences[:count]) + "."
+        else:
+            words = sentences[0].split() if sentences else []
+            ellipsis = measure(ELLIPSIS)
+            kept = 0
+            for word in words:
+                n = measure(word)
+                if _advance(state, [[n + ellipsis]], width, space)[0] > lines:
+                    break
+                state, kept = _advance(state, [[n]], width, space), kept + 1
+            # Newlines inside the sentence are flattened, as textwrap.shorten does
+            ending = "." if words and kept == len(words) else ELLIPSIS
+            fitted = (lead + " ".join(words[:kept]) + ending).strip()
+
+        if report is not None:
+            report.shrunk += 1
+            report.chars_removed += len(body) - len(fitted)
+        return fitted + suffix